@@ -1,3 +1,18 @@
+"""
+Django admin configuration for Admin Panel app.
+"""
+
 from django.contrib import admin
 
-# Register your models here.
+from .models import ReportExport
+
+
+@admin.register(ReportExport)
+class ReportExportAdmin(admin.ModelAdmin):
+    """Admin interface for ReportExport model."""
+    
+    list_display = ['report_type', 'tenant', 'requested_by', 'status', 'created_at', 'completed_at']
+    list_filter = ['report_type', 'status']
+    search_fields = ['tenant__name', 'requested_by__username']
+    ordering = ['-created_at']
+    readonly_fields = ['cache_key', 'watermark', 'created_at', 'updated_at', 'completed_at']
@@ -0,0 +1,81 @@
+"""
+Report aggregation helpers for Admin Panel.
+
+Totals are computed in the database with conditional aggregation over the
+daily production rollup, so a report over N employees costs one grouped
+query instead of N+1 and does not scan raw work records.
+"""
+
+from decimal import Decimal
+
+from django.db.models import DecimalField, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.employees.models import Employee
+from apps.tasks.models import WorkRecord
+
+SUMMARY_FIELDS = (
+    'record_count', 'total_quantity', 'total_payment', 'approved_count', 'approved_payment',
+    'pending_count', 'completed_count', 'rejected_count',
+)
+
+
+def _sum_count(condition):
+    return Coalesce(Sum('production_rollups__record_count', filter=condition), Value(0), output_field=IntegerField())
+
+
+def _sum_quantity(condition):
+    return Coalesce(Sum('production_rollups__total_quantity', filter=condition), Value(0), output_field=IntegerField())
+
+
+def _sum_payment(condition):
+    return Coalesce(
+        Sum('production_rollups__total_payment', filter=condition),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def employee_period_totals(tenant, start_date, end_date, active_only=True):
+    """
+    Per-employee work record totals for a period, in a single grouped query.
+    
+    Employees without records in the period are included with zero totals.
+    
+    Returns:
+        QuerySet of dicts ordered by full name with keys: id, full_name,
+        record_count, total_quantity, total_payment, approved_count,
+        approved_payment, pending_count, completed_count, rejected_count
+    """
+    in_period = Q(
+        production_rollups__work_date__gte=start_date,
+        production_rollups__work_date__lte=end_date,
+    )
+    
+    def with_status(status):
+        return in_period & Q(production_rollups__status=status)
+    
+    employees = Employee.objects.filter(tenant=tenant)
+    if active_only:
+        employees = employees.filter(is_active=True)
+    
+    return employees.values('id', 'full_name').annotate(
+        record_count=_sum_count(in_period),
+        total_quantity=_sum_quantity(in_period),
+        total_payment=_sum_payment(in_period),
+        approved_count=_sum_count(with_status(WorkRecord.Status.APPROVED)),
+        approved_payment=_sum_payment(with_status(WorkRecord.Status.APPROVED)),
+        pending_count=_sum_count(with_status(WorkRecord.Status.PENDING)),
+        completed_count=_sum_count(with_status(WorkRecord.Status.COMPLETED)),
+        rejected_count=_sum_count(with_status(WorkRecord.Status.REJECTED)),
+    ).order_by('full_name')
+
+
+def grand_totals(rows):
+    """Sum per-employee rows (as returned by employee_period_totals)."""
+    totals = dict.fromkeys(SUMMARY_FIELDS, 0)
+    for row in rows:
+        for field in SUMMARY_FIELDS:
+            totals[field] += row[field]
+    return totals
+
@@ -5,3 +5,6 @@ class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.admin_panel'
     verbose_name = 'Admin Panel (Owner/Tenant Admin)'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
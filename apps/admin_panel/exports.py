@@ -0,0 +1,217 @@
+"""
+Background report export service for Admin Panel.
+
+Views call request_report_export() which either returns a cached export
+or creates a new ReportExport and queues the Celery task that fills it.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, Max, Subquery
+from django.utils import timezone
+
+from apps.employees.models import Employee
+from apps.products.models import Product
+from apps.tasks.models import Task, WorkRecord
+from apps.tenants.models import Tenant
+
+from . import reports
+from .models import ReportExport
+
+logger = logging.getLogger(__name__)
+
+# Report types that print product and task names next to each record
+RECORD_REPORT_TYPES = [
+    ReportExport.ReportType.DAILY,
+    ReportExport.ReportType.EMPLOYEE,
+    ReportExport.ReportType.DETAILED_DATE_RANGE,
+]
+
+
+def _parse_date(value):
+    return date.fromisoformat(value)
+
+
+def _month_bounds(year, month):
+    first_day = date(year, month, 1)
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first_day, next_month - timedelta(days=1)
+
+
+def _report_scope(report_type, parameters):
+    """Return (start_date, end_date, employee_id) covered by a report."""
+    if report_type == ReportExport.ReportType.DAILY:
+        report_date = _parse_date(parameters['date'])
+        return report_date, report_date, None
+    if report_type == ReportExport.ReportType.MONTHLY:
+        first_day, last_day = _month_bounds(int(parameters['year']), int(parameters['month']))
+        return first_day, last_day, None
+    return (
+        _parse_date(parameters['start_date']),
+        _parse_date(parameters['end_date']),
+        parameters.get('employee_id'),
+    )
+
+
+def build_cache_key(tenant, report_type, parameters):
+    """Stable hash of tenant, report type and parameters."""
+    payload = json.dumps(
+        {'tenant': str(tenant.id), 'type': report_type, 'params': parameters},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _latest_update(queryset):
+    return Subquery(queryset.order_by('-updated_at').values('updated_at')[:1])
+
+
+def compute_watermark(tenant, report_type, parameters):
+    """
+    Describe the current state of the data a report is built from.
+    
+    Uses the row count and latest updated_at of the work records in scope,
+    so inserts, edits and deletes all change the watermark. Reports also
+    print employee names (and, per record, product and task names), so
+    the latest updated_at of those rows is part of it too.
+    """
+    start_date, end_date, employee_id = _report_scope(report_type, parameters)
+    
+    records = WorkRecord.objects.filter(tenant=tenant, work_date__gte=start_date, work_date__lte=end_date)
+    if employee_id:
+        records = records.filter(employee_id=employee_id)
+    state = records.aggregate(count=Count('id'), last_update=Max('updated_at'))
+    
+    # Latest name changes, in one query
+    employees = Employee.objects.filter(tenant=tenant)
+    if employee_id:
+        employees = employees.filter(id=employee_id)
+    names = {'employee_update': _latest_update(employees)}
+    if report_type in RECORD_REPORT_TYPES:
+        names['product_update'] = _latest_update(Product.objects.filter(tenant=tenant))
+        names['task_update'] = _latest_update(Task.objects.filter(tenant=tenant))
+    name_updates = Tenant.objects.filter(pk=tenant.pk).values(**names).get()
+    
+    parts = [str(state['count']), tenant.updated_at.isoformat()]
+    parts += [
+        value.isoformat() if value else '-'
+        for value in [state['last_update'], *(name_updates[name] for name in names)]
+    ]
+    return '|'.join(parts)
+
+
+def stale_before():
+    """Exports pending or running since before this have stopped (crashed worker, lost task)."""
+    return timezone.now() - timedelta(minutes=settings.REPORT_EXPORT_STALE_MINUTES)
+
+
+def fail_stale_exports(exports):
+    """Mark the stopped exports among the given ones as failed. Returns the count."""
+    now = timezone.now()
+    return exports.filter(
+        status__in=[ReportExport.Status.PENDING, ReportExport.Status.RUNNING],
+        updated_at__lt=stale_before(),
+    ).update(
+        status=ReportExport.Status.FAILED,
+        error='Eksport tugallanmadi, qaytadan so\'rang',
+        completed_at=now,
+        updated_at=now,
+    )
+
+
+def request_report_export(tenant, user, report_type, parameters):
+    """
+    Return an export for the given report, queueing generation if needed.
+    
+    An existing export is reused when it has the same cache key and
+    watermark and is either ready or still being generated. One pending
+    or running for longer than REPORT_EXPORT_STALE_MINUTES is marked
+    failed and replaced.
+    """
+    cache_key = build_cache_key(tenant, report_type, parameters)
+    watermark = compute_watermark(tenant, report_type, parameters)
+    
+    existing = ReportExport.objects.filter(
+        tenant=tenant,
+        cache_key=cache_key,
+        watermark=watermark,
+        status__in=[ReportExport.Status.PENDING, ReportExport.Status.RUNNING, ReportExport.Status.READY],
+    ).order_by('-created_at').first()
+    
+    if existing and existing.status != ReportExport.Status.READY and existing.updated_at < stale_before():
+        fail_stale_exports(ReportExport.objects.filter(id=existing.id))
+    elif existing and (existing.status != ReportExport.Status.READY or existing.file):
+        return existing
+    
+    export = ReportExport.objects.create(
+        tenant=tenant,
+        requested_by=user,
+        report_type=report_type,
+        parameters=parameters,
+        cache_key=cache_key,
+        watermark=watermark,
+    )
+    
+    from .tasks import generate_report_export_task
+    
+    transaction.on_commit(lambda: generate_report_export_task.delay(str(export.id)))
+    return export
+
+
+def _build_report(export):
+    """Call the report builder for an export. Returns (writer, filename)."""
+    tenant = export.tenant
+    params = export.parameters
+    report_type = export.report_type
+    
+    if report_type == ReportExport.ReportType.DAILY:
+        return reports.build_daily_report(tenant, _parse_date(params['date']))
+    if report_type == ReportExport.ReportType.EMPLOYEE:
+        employee = Employee.objects.get(id=params['employee_id'], tenant=tenant)
+        return reports.build_employee_report(
+            employee, _parse_date(params['start_date']), _parse_date(params['end_date'])
+        )
+    if report_type == ReportExport.ReportType.MONTHLY:
+        return reports.build_monthly_summary(tenant, int(params['year']), int(params['month']))
+    if report_type == ReportExport.ReportType.DATE_RANGE:
+        return reports.build_date_range_summary(
+            tenant, _parse_date(params['start_date']), _parse_date(params['end_date'])
+        )
+    if report_type == ReportExport.ReportType.DETAILED_DATE_RANGE:
+        return reports.build_detailed_date_range(
+            tenant, _parse_date(params['start_date']), _parse_date(params['end_date'])
+        )
+    raise ValueError(f'Unknown report type: {report_type}')
+
+
+def generate_report_export(export):
+    """Build the report file for an export and store it in MEDIA storage."""
+    export.status = ReportExport.Status.RUNNING
+    export.save(update_fields=['status', 'updated_at'])
+    
+    try:
+        writer, filename = _build_report(export)
+        with tempfile.TemporaryFile() as output:
+            writer.save(output)
+            output.seek(0)
+            export.file.save(f'{export.id}.xlsx', File(output), save=False)
+    except Exception as exc:
+        logger.exception('Report export %s failed', export.id)
+        export.status = ReportExport.Status.FAILED
+        export.error = str(exc)
+        export.completed_at = timezone.now()
+        export.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        return export
+    
+    export.status = ReportExport.Status.READY
+    export.filename = filename
+    export.completed_at = timezone.now()
+    export.save(update_fields=['status', 'file', 'filename', 'completed_at', 'updated_at'])
+    return export
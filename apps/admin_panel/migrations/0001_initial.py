@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:36
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tenants', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportExport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('report_type', models.CharField(choices=[('daily', 'Daily Report'), ('employee', 'Employee Report'), ('monthly', 'Monthly Summary'), ('date_range', 'Date Range Summary'), ('detailed_date_range', 'Detailed Date Range Report')], max_length=30, verbose_name='Report Type')),
+                ('parameters', models.JSONField(blank=True, default=dict, help_text='Report parameters (dates, employee, etc.)', verbose_name='Parameters')),
+                ('cache_key', models.CharField(help_text='Hash of tenant, report type and parameters', max_length=64, verbose_name='Cache Key')),
+                ('watermark', models.CharField(help_text='Snapshot of the source data state when the export was requested', max_length=200, verbose_name='Data Watermark')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20, verbose_name='Status')),
+                ('file', models.FileField(blank=True, upload_to='reports/%Y/%m/', verbose_name='File')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='Download Filename')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed At')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_exports', to=settings.AUTH_USER_MODEL, verbose_name='Requested By')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_exports', to='tenants.tenant', verbose_name='Tenant')),
+            ],
+            options={
+                'verbose_name': 'Report Export',
+                'verbose_name_plural': 'Report Exports',
+                'db_table': 'report_exports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['tenant', 'cache_key'], name='report_expo_tenant__10d130_idx'), models.Index(fields=['tenant', 'created_at'], name='report_expo_tenant__5424e8_idx')],
+            },
+        ),
+    ]
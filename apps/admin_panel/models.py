@@ -1,3 +1,110 @@
+"""
+Admin Panel models for SEW-TRACK.
+"""
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from core.models import TimeStampedModel
+
+
+class ReportExport(TimeStampedModel):
+    """
+    ReportExport model - an Excel report generated in the background.
+    
+    Exports are generated by a Celery task and stored in MEDIA storage.
+    A finished export is reused for identical requests (same tenant,
+    report type and parameters) as long as its data watermark still
+    matches the current data.
+    """
+    
+    class ReportType(models.TextChoices):
+        DAILY = 'daily', 'Daily Report'
+        EMPLOYEE = 'employee', 'Employee Report'
+        MONTHLY = 'monthly', 'Monthly Summary'
+        DATE_RANGE = 'date_range', 'Date Range Summary'
+        DETAILED_DATE_RANGE = 'detailed_date_range', 'Detailed Date Range Report'
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        READY = 'ready', 'Ready'
+        FAILED = 'failed', 'Failed'
+    
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='report_exports',
+        verbose_name='Tenant'
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_exports',
+        verbose_name='Requested By'
+    )
+    report_type = models.CharField(
+        max_length=30,
+        choices=ReportType.choices,
+        verbose_name='Report Type'
+    )
+    parameters = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Parameters',
+        help_text='Report parameters (dates, employee, etc.)'
+    )
+    cache_key = models.CharField(
+        max_length=64,
+        verbose_name='Cache Key',
+        help_text='Hash of tenant, report type and parameters'
+    )
+    watermark = models.CharField(
+        max_length=200,
+        verbose_name='Data Watermark',
+        help_text='Snapshot of the source data state when the export was requested'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Status'
+    )
+    file = models.FileField(
+        upload_to='reports/%Y/%m/',
+        blank=True,
+        verbose_name='File'
+    )
+    filename = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Download Filename'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Error'
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Completed At'
+    )
+    
+    class Meta:
+        db_table = 'report_exports'
+        verbose_name = 'Report Export'
+        verbose_name_plural = 'Report Exports'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'cache_key']),
+            models.Index(fields=['tenant', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f'{self.get_report_type_display()} ({self.get_status_display()})'
+    
+    @property
+    def is_finished(self):
+        return self.status in [self.Status.READY, self.Status.FAILED]
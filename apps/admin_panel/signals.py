@@ -0,0 +1,35 @@
+"""
+Signal handlers for Admin Panel app.
+
+Invalidate the tenant snapshot (see apps.admin_panel.snapshots) when work
+records change or after the transaction that changed an employee,
+product or task commits.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.employees.models import Employee
+from apps.products.models import Product
+from apps.tasks.models import Task
+from apps.tasks.rollups import production_changed
+
+from .snapshots import invalidate_tenant_snapshot
+
+
+@receiver(production_changed)
+def drop_tenant_snapshots(sender, changed, **kwargs):
+    """Drop cached snapshots of the tenants whose work records changed."""
+    for tenant_id in {tenant_id for tenant_id, _ in changed}:
+        invalidate_tenant_snapshot(tenant_id)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Task)
+def tenant_counts_changed(sender, instance, **kwargs):
+    if instance.tenant_id:
+        transaction.on_commit(partial(invalidate_tenant_snapshot, instance.tenant_id))
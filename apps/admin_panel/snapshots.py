@@ -0,0 +1,95 @@
+"""
+Cached tenant snapshot for the admin and reports dashboards.
+
+Both dashboards show the same tenant counts (employees, products, tasks,
+work records) and today's totals. They are computed in two queries, one
+over the daily production rollup and one counting the catalog and staff,
+and cached per tenant and day.
+
+Cache keys carry a per-tenant version number. Work record changes
+(production_changed) and Employee, Product and Task changes bump it
+(apps.admin_panel.signals), so a refresh after a change never sees
+stale numbers while an idle dashboard is served from the cache.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.employees.models import Employee
+from apps.products.models import Product
+from apps.tasks.models import DailyProductionRollup, Task, WorkRecord
+from apps.tenants.models import Tenant
+from core.cache import bump_version, get_version
+
+
+def snapshot_version_key(tenant_id):
+    return f'tenant-snapshot:version:{tenant_id}'
+
+
+def snapshot_cache_key(tenant_id, version, day):
+    return f'tenant-snapshot:{tenant_id}:{version}:{day.isoformat()}'
+
+
+def invalidate_tenant_snapshot(tenant_id):
+    """Make all cached snapshots of a tenant stale."""
+    bump_version(snapshot_version_key(tenant_id))
+
+
+def _sum_count(condition=None):
+    return Coalesce(Sum('record_count', filter=condition), Value(0), output_field=IntegerField())
+
+
+def _count(queryset):
+    """Scalar subquery counting a queryset of the outer tenant's rows."""
+    counts = queryset.filter(tenant=OuterRef('pk')).order_by().values('tenant').annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count')), Value(0), output_field=IntegerField())
+
+
+def compute_tenant_snapshot(tenant, day):
+    """
+    Tenant counts and the day's totals (uncached), in two queries.
+    
+    Returns:
+        dict with employees_count (active), products_count (active),
+        all_products_count, tasks_count (active), total_records,
+        pending_records, today_records, today_approved, today_production
+        and today_payment
+    """
+    today = Q(work_date=day)
+    snapshot = DailyProductionRollup.objects.filter(tenant=tenant).aggregate(
+        total_records=_sum_count(),
+        pending_records=_sum_count(Q(status=WorkRecord.Status.PENDING)),
+        today_records=_sum_count(today),
+        today_approved=_sum_count(today & Q(status=WorkRecord.Status.APPROVED)),
+        today_production=Coalesce(
+            Sum('total_quantity', filter=today), Value(0), output_field=IntegerField()
+        ),
+        today_payment=Coalesce(
+            Sum('total_payment', filter=today),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+    snapshot.update(Tenant.objects.filter(pk=tenant.pk).values(
+        employees_count=_count(Employee.objects.filter(is_active=True)),
+        products_count=_count(Product.objects.filter(is_active=True)),
+        all_products_count=_count(Product.objects.all()),
+        tasks_count=_count(Task.objects.filter(is_active=True)),
+    ).get())
+    return snapshot
+
+
+def get_tenant_snapshot(tenant, day=None):
+    """Return the cached snapshot of a tenant, computing it if needed."""
+    day = day or date.today()
+    key = snapshot_cache_key(tenant.id, get_version(snapshot_version_key(tenant.id)), day)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = compute_tenant_snapshot(tenant, day)
+        cache.set(key, snapshot, timeout=settings.TENANT_SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -0,0 +1,60 @@
+"""
+Celery tasks for Admin Panel.
+"""
+
+from datetime import timedelta
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.utils import timezone
+
+from .exports import fail_stale_exports, generate_report_export
+from .models import ReportExport
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(name='apps.admin_panel.tasks.generate_report_export')
+def generate_report_export_task(export_id: str) -> dict:
+    """
+    Generate a queued report export.
+    
+    Args:
+        export_id: ReportExport ID
+    
+    Returns:
+        Dictionary with task results
+    """
+    try:
+        export = ReportExport.objects.select_related('tenant').get(id=export_id)
+    except ReportExport.DoesNotExist:
+        logger.warning(f'Report export {export_id} not found')
+        return {'status': 'missing', 'export_id': export_id}
+    
+    if export.status == ReportExport.Status.READY:
+        return {'status': export.status, 'export_id': export_id}
+    
+    logger.info(f'Generating {export.report_type} report export {export_id}')
+    export = generate_report_export(export)
+    return {'status': export.status, 'export_id': export_id}
+
+
+@shared_task(name='apps.admin_panel.tasks.cleanup_report_exports')
+def cleanup_report_exports() -> dict:
+    """
+    Periodic task (Celery beat, hourly) deleting old report exports and
+    their files, and failing exports whose generation stopped.
+    """
+    stale_count = fail_stale_exports(ReportExport.objects.all())
+    cutoff = timezone.now() - timedelta(days=settings.REPORT_EXPORT_RETENTION_DAYS)
+    
+    deleted_count = 0
+    for export in ReportExport.objects.filter(created_at__lt=cutoff).iterator():
+        if export.file:
+            export.file.delete(save=False)
+        export.delete()
+        deleted_count += 1
+    
+    logger.info(f'Deleted {deleted_count} old and failed {stale_count} stale report exports')
+    return {'status': 'success', 'deleted_count': deleted_count, 'stale_count': stale_count}
@@ -46,6 +46,9 @@ urlpatterns = [
     path('reports/monthly/', views.export_monthly_summary, name='export_monthly'),
     path('reports/date-range/', views.export_date_range_summary, name='export_date_range'),
     path('reports/detailed-date-range/', views.export_detailed_date_range, name='export_detailed_date_range'),
+    path('reports/exports/', views.report_exports, name='report_exports'),
+    path('reports/exports/<uuid:export_id>/', views.report_export_status, name='report_export_status'),
+    path('reports/exports/<uuid:export_id>/download/', views.report_export_download, name='report_export_download'),
     
     # Work Records Management
     path('work-records/', views.work_records_list, name='work_records_list'),
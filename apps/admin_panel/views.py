@@ -16,9 +16,9 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.contrib import messages
-from django.db.models import Sum, Count, Q
+from django.db.models import Count, Q
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse
 from datetime import date, timedelta, datetime
 import re
 
@@ -36,8 +36,15 @@ from apps.tenants.models import Tenant, TenantMembership
 from apps.employees.models import Employee
 from apps.products.models import Product, ProductTask
 from apps.tasks.models import Task, WorkRecord
+from core.pagination import keyset_paginate, next_page_query
 from django.contrib.auth import get_user_model
 
+from .aggregates import employee_period_totals, grand_totals
+from .excel import XLSX_CONTENT_TYPE
+from .exports import request_report_export
+from .models import ReportExport
+from .snapshots import get_tenant_snapshot
+
 User = get_user_model()
 
 
@@ -113,15 +120,18 @@ def admin_dashboard(request):
     if not tenant:
         return render(request, 'admin_panel/no_tenant.html')
     
+    # Counts and today's totals, shared with the reports dashboard
+    snapshot = get_tenant_snapshot(tenant, today)
+    
     # Statistics for current tenant
     stats = {
-        'employees_count': Employee.objects.filter(tenant=tenant, is_active=True).count(),
-        'products_count': Product.objects.filter(tenant=tenant, is_active=True).count(),
-        'tasks_count': Task.objects.filter(tenant=tenant, is_active=True).count(),
-        'pending_records': WorkRecord.objects.filter(tenant=tenant, status=WorkRecord.Status.PENDING).count(),
-        'today_approved': WorkRecord.objects.filter(tenant=tenant, work_date=today, status=WorkRecord.Status.APPROVED).count(),
-        'today_production': WorkRecord.objects.filter(tenant=tenant, work_date=today).aggregate(Sum('quantity'))['quantity__sum'] or 0,
-        'today_payment': WorkRecord.objects.filter(tenant=tenant, work_date=today).aggregate(Sum('total_payment'))['total_payment__sum'] or 0,
+        'employees_count': snapshot['employees_count'],
+        'products_count': snapshot['products_count'],
+        'tasks_count': snapshot['tasks_count'],
+        'pending_records': snapshot['pending_records'],
+        'today_approved': snapshot['today_approved'],
+        'today_production': snapshot['today_production'],
+        'today_payment': snapshot['today_payment'],
     }
     
     # Recent activity
@@ -353,7 +363,7 @@ def employee_create(request):
             
             messages.success(request, f'"{full_name}" muvaffaqiyatli qo\'shildi!')
             return redirect('admin_panel:employee_list')
-            
+        
         except Exception as e:
             messages.error(request, f'Xatolik: {str(e)}')
             return render(request, 'admin_panel/employee_form.html', {
@@ -807,26 +817,36 @@ def reports_dashboard(request):
     today = date.today()
     
     # Quick stats
+    snapshot = get_tenant_snapshot(tenant, today)
     stats = {
-        'total_records': WorkRecord.objects.filter(tenant=tenant).count(),
-        'total_employees': Employee.objects.filter(tenant=tenant, is_active=True).count(),
-        'total_products': Product.objects.filter(tenant=tenant).count(),
-        'today_records': WorkRecord.objects.filter(tenant=tenant, work_date=today).count(),
+        'total_records': snapshot['total_records'],
+        'total_employees': snapshot['employees_count'],
+        'total_products': snapshot['all_products_count'],
+        'today_records': snapshot['today_records'],
     }
     
+    # Current month per-employee summary (same data as the monthly export)
+    month_summary = list(employee_period_totals(tenant, today.replace(day=1), today))
+    
     return render(request, 'admin_panel/reports.html', {
         'tenant': tenant,
         'stats': stats,
         'today': today,
+        'month_summary': month_summary,
+        'month_totals': grand_totals(month_summary),
     })
 
 
+def _queue_report_export(request, report_type, parameters):
+    """Request a background export and send the user to its status page."""
+    export = request_report_export(request.tenant, request.user, report_type, parameters)
+    return redirect('admin_panel:report_export_status', export_id=export.id)
+
+
 @login_required
 @user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
 def export_daily_report(request):
-    """Export daily report to Excel."""
-    from .reports import export_daily_report_excel
-    
+    """Export daily report to Excel (generated in the background)."""
     tenant = request.tenant
     if not tenant:
         return HttpResponse('No tenant selected', status=400)
@@ -837,15 +857,15 @@ def export_daily_report(request):
     else:
         report_date = date.today()
     
-    return export_daily_report_excel(tenant, report_date)
+    return _queue_report_export(request, ReportExport.ReportType.DAILY, {
+        'date': report_date.isoformat(),
+    })
 
 
 @login_required
 @user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
 def export_employee_report(request, employee_id):
-    """Export employee report to Excel."""
-    from .reports import export_employee_report_excel
-    
+    """Export employee report to Excel (generated in the background)."""
     tenant = request.tenant
     if not tenant:
         return HttpResponse('No tenant selected', status=400)
@@ -863,15 +883,17 @@ def export_employee_report(request, employee_id):
         start_date = today.replace(day=1)
         end_date = today
     
-    return export_employee_report_excel(employee, start_date, end_date)
+    return _queue_report_export(request, ReportExport.ReportType.EMPLOYEE, {
+        'employee_id': str(employee.id),
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+    })
 
 
 @login_required
 @user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
 def export_monthly_summary(request):
-    """Export monthly summary to Excel."""
-    from .reports import export_monthly_summary_excel
-    
+    """Export monthly summary to Excel (generated in the background)."""
     tenant = request.tenant
     if not tenant:
         return HttpResponse('No tenant selected', status=400)
@@ -879,15 +901,16 @@ def export_monthly_summary(request):
     year = int(request.GET.get('year', date.today().year))
     month = int(request.GET.get('month', date.today().month))
     
-    return export_monthly_summary_excel(tenant, year, month)
+    return _queue_report_export(request, ReportExport.ReportType.MONTHLY, {
+        'year': year,
+        'month': month,
+    })
 
 
 @login_required
 @user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
 def export_date_range_summary(request):
-    """Export date range summary to Excel."""
-    from .reports import export_date_range_summary_excel
-    
+    """Export date range summary to Excel (generated in the background)."""
     tenant = request.tenant
     if not tenant:
         return HttpResponse('No tenant selected', status=400)
@@ -904,7 +927,77 @@ def export_date_range_summary(request):
         start_date = today.replace(day=1)
         end_date = today
     
-    return export_date_range_summary_excel(tenant, start_date, end_date)
+    return _queue_report_export(request, ReportExport.ReportType.DATE_RANGE, {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+    })
+
+
+@login_required
+@user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
+def report_exports(request):
+    """Download center - recent report exports for current tenant."""
+    tenant = request.tenant
+    
+    if not tenant:
+        return render(request, 'admin_panel/no_tenant.html')
+    
+    exports = ReportExport.objects.filter(
+        tenant=tenant
+    ).select_related('requested_by').order_by('-created_at')[:50]
+    
+    return render(request, 'admin_panel/report_exports.html', {
+        'tenant': tenant,
+        'exports': exports,
+    })
+
+
+@login_required
+@user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
+def report_export_status(request, export_id):
+    """
+    Export status page.
+    
+    HTMX requests get only the status fragment, which keeps polling
+    itself until the export is finished.
+    """
+    export = get_object_or_404(ReportExport, id=export_id, tenant=request.tenant)
+    
+    if request.headers.get('HX-Request'):
+        return render(request, 'admin_panel/_report_export_status.html', {
+            'export': export,
+        })
+    
+    return render(request, 'admin_panel/report_export_status.html', {
+        'tenant': request.tenant,
+        'export': export,
+    })
+
+
+@login_required
+@user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
+def report_export_download(request, export_id):
+    """Download a finished report export."""
+    export = get_object_or_404(
+        ReportExport,
+        id=export_id,
+        tenant=request.tenant,
+        status=ReportExport.Status.READY
+    )
+    
+    if not export.file:
+        raise Http404('Export file not found')
+    
+    return FileResponse(
+        export.file.open('rb'),
+        as_attachment=True,
+        filename=export.filename,
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+# Partials rendered for HTMX "load more" requests on the work records list
+WORK_RECORD_FRAGMENTS = ('cards', 'rows')
 
 
 # ============================================================================
@@ -958,21 +1051,29 @@ def work_records_list(request):
     if employee_filter:
         records = records.filter(employee_id=employee_filter)
     
-    # Statistics
-    stats = {
-        'total': records.count(),
-        'pending': records.filter(status=WorkRecord.Status.PENDING).count(),
-        'approved': records.filter(status=WorkRecord.Status.APPROVED).count(),
-        'rejected': records.filter(status=WorkRecord.Status.REJECTED).count(),
-        'completed': records.filter(status=WorkRecord.Status.COMPLETED).count(),
-    }
+    # One keyset page; "load more" requests only render the next rows
+    try:
+        page = keyset_paginate(records, request.GET.get('cursor'))
+    except ValueError:
+        page = keyset_paginate(records)
+    
+    fragment = request.GET.get('fragment')
+    if request.headers.get('HX-Request') and fragment in WORK_RECORD_FRAGMENTS:
+        return render(request, f'admin_panel/_work_record_{fragment}.html', {
+            'records': page,
+            'next_query': next_page_query(request, page),
+        })
+    
+    # Statistics (one conditional-aggregation query)
+    stats = records.facet_counts()
     
     # Get employees for filter dropdown
     employees = Employee.objects.filter(tenant=tenant, is_active=True).order_by('full_name')
     
     return render(request, 'admin_panel/work_records_list.html', {
         'tenant': tenant,
-        'records': records,
+        'records': page,
+        'next_query': next_page_query(request, page),
         'stats': stats,
         'employees': employees,
         'date_filter': date_filter,
@@ -1030,9 +1131,7 @@ def reset_work_record_status(request, record_id):
 @login_required
 @user_passes_test(is_owner_or_tenant_admin, login_url='/dashboard/')
 def export_detailed_date_range(request):
-    """Export detailed date range report with all individual records."""
-    from .reports import export_detailed_date_range_excel
-    
+    """Export detailed date range report with all individual records (generated in the background)."""
     tenant = request.tenant
     if not tenant:
         return HttpResponse('No tenant selected', status=400)
@@ -1049,4 +1148,7 @@ def export_detailed_date_range(request):
         start_date = today.replace(day=1)
         end_date = today
     
-    return export_detailed_date_range_excel(tenant, start_date, end_date)
+    return _queue_report_export(request, ReportExport.ReportType.DETAILED_DATE_RANGE, {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+    })
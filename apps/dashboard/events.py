@@ -0,0 +1,138 @@
+"""
+Live event pub/sub for dashboard Server-Sent Events.
+
+Publishers (signal handlers, any thread or process) call publish().
+SSE streams (async views under ASGI) subscribe to a channel and receive
+messages on an asyncio.Queue. A subscription that breaks (e.g. Redis
+restarted) receives SUBSCRIPTION_LOST and no further messages; the
+stream should then end so the client reconnects.
+
+LIVE_EVENTS_BROKER_URL selects the backend:
+    memory://          in-process broker (single process, development)
+    redis://host/db    Redis pub/sub (web, ASGI and Celery processes)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager, suppress
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Last item on the queue of a broken subscription
+SUBSCRIPTION_LOST = object()
+
+
+def tenant_channel(tenant_id):
+    return f'tv:{tenant_id}'
+
+
+def sse_message(event, data):
+    """Format one Server-Sent Events message (multi-line data allowed)."""
+    lines = ''.join(f'data: {line}\n' for line in data.splitlines())
+    return f'event: {event}\n{lines}\n'
+
+
+class InProcessBroker:
+    """
+    Pub/sub inside one process.
+    
+    Subscribers are asyncio queues bound to their event loop; publish()
+    is thread-safe and can be called from sync code.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+    
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            # RuntimeError: event loop already closed
+            with suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+    
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                channel_subscribers = self._subscribers.get(channel, set())
+                channel_subscribers.discard(subscriber)
+                if not channel_subscribers:
+                    self._subscribers.pop(channel, None)
+
+
+class RedisBroker:
+    """Pub/sub over Redis, shared by all processes."""
+    
+    def __init__(self, url):
+        import redis
+        
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+    
+    def publish(self, channel, message):
+        self._client.publish(channel, json.dumps(message))
+    
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        import redis.asyncio as aioredis
+        
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        queue = asyncio.Queue()
+        
+        async def reader():
+            try:
+                async for item in pubsub.listen():
+                    if item['type'] == 'message':
+                        queue.put_nowait(json.loads(item['data']))
+            except Exception:
+                logger.exception('Live event subscription to %s failed', channel)
+            queue.put_nowait(SUBSCRIPTION_LOST)
+        
+        reader_task = asyncio.create_task(reader())
+        try:
+            yield queue
+        finally:
+            reader_task.cancel()
+            # Closing the pub/sub connection also unsubscribes; it may
+            # already be broken
+            try:
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception:
+                logger.warning('Closing live event subscription to %s failed', channel, exc_info=True)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the configured broker (created once per process)."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                url = settings.LIVE_EVENTS_BROKER_URL
+                _broker = RedisBroker(url) if url.startswith('redis') else InProcessBroker()
+    return _broker
+
+
+def publish(channel, message):
+    """Publish a message; failures are logged, never raised to the writer."""
+    try:
+        get_broker().publish(channel, message)
+    except Exception:
+        logger.exception('Publishing live event to %s failed', channel)
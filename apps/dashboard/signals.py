@@ -0,0 +1,24 @@
+"""
+Signal handlers for Dashboard app.
+"""
+
+from django.dispatch import receiver
+
+from apps.tasks.rollups import production_changed
+
+from .events import publish, tenant_channel
+from .snapshots import invalidate_tv_snapshot
+
+
+@receiver(production_changed)
+def drop_tv_snapshots(sender, changed, **kwargs):
+    """Drop cached TV snapshots of the tenant days that changed."""
+    for tenant_id, work_date in changed:
+        invalidate_tv_snapshot(tenant_id, work_date)
+
+
+@receiver(production_changed)
+def publish_production_change(sender, changed, **kwargs):
+    """Notify live TV screens of the tenant days that changed."""
+    for tenant_id, work_date in changed:
+        publish(tenant_channel(tenant_id), {'work_date': work_date.isoformat()})
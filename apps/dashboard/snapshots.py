@@ -0,0 +1,104 @@
+"""
+Cached TV dashboard snapshot.
+
+All TV screens of a tenant share one snapshot of today's KPIs and top
+performers. It is computed at most once per TV_SNAPSHOT_TIMEOUT and
+dropped as soon as today's production changes (production_changed).
+"""
+
+import hashlib
+import json
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum
+
+from apps.tasks.models import DailyProductionRollup
+from apps.tasks.rollups import rollup_summary
+
+# Wait for another process computing the same snapshot (seconds)
+SNAPSHOT_LOCK_TIMEOUT = 10
+SNAPSHOT_WAIT_STEP = 0.05
+SNAPSHOT_WAIT_STEPS = 20
+
+
+def snapshot_cache_key(tenant_id, day):
+    return f'tv-snapshot:{tenant_id}:{day.isoformat()}'
+
+
+def invalidate_tv_snapshot(tenant_id, day):
+    cache.delete(snapshot_cache_key(tenant_id, day))
+
+
+def compute_tv_snapshot(tenant, day):
+    """Today's KPIs and top 10 performers (unpaid records) for a tenant."""
+    rollups = DailyProductionRollup.objects.filter(
+        tenant=tenant,
+        work_date=day,
+        is_paid=False  # Exclude paid records
+    )
+    summary = rollup_summary(rollups)
+    
+    stats = {
+        'total_production': summary['total_quantity'],
+        'active_workers': summary['employee_count'],
+        'completed_tasks': summary['done_count'],
+        'total_payment': summary['total_payment'],
+    }
+    performers = list(
+        rollups.values(
+            'employee__full_name'
+        ).annotate(
+            total_quantity=Sum('total_quantity'),
+            total_payment=Sum('total_payment')
+        ).order_by('-total_quantity')[:10]
+    )
+    
+    payload = json.dumps({'stats': stats, 'performers': performers}, cls=DjangoJSONEncoder, sort_keys=True)
+    return {
+        'stats': stats,
+        'performers': performers,
+        'etag': hashlib.md5(payload.encode()).hexdigest(),
+    }
+
+
+def get_tv_snapshot(tenant, day=None):
+    """
+    Return the cached TV snapshot for a tenant, computing it if needed.
+    
+    Only one process computes a missing snapshot; concurrent requests
+    wait briefly for its result instead of running the same queries.
+    """
+    day = day or date.today()
+    tenant_id = tenant.id if tenant else None
+    key = snapshot_cache_key(tenant_id, day)
+    
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+    
+    lock_key = f'{key}:lock'
+    acquired = cache.add(lock_key, 1, timeout=SNAPSHOT_LOCK_TIMEOUT)
+    if not acquired:
+        for _ in range(SNAPSHOT_WAIT_STEPS):
+            time.sleep(SNAPSHOT_WAIT_STEP)
+            snapshot = cache.get(key)
+            if snapshot is not None:
+                return snapshot
+    
+    try:
+        snapshot = compute_tv_snapshot(tenant, day)
+        cache.set(key, snapshot, timeout=settings.TV_SNAPSHOT_TIMEOUT)
+    finally:
+        # A waiter that gave up must not release the computing process's lock
+        if acquired:
+            cache.delete(lock_key)
+    return snapshot
+
+
+def tv_snapshot_etag(request, *args, **kwargs):
+    """ETag function for django.views.decorators.http.condition."""
+    return get_tv_snapshot(request.tenant)['etag']
@@ -0,0 +1,138 @@
+"""
+Time series helpers for dashboard charts.
+
+Each series is computed with one grouped query and returned as chart-ready
+labels and values.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncHour
+from django.utils import timezone
+
+from apps.tasks.models import DailyProductionRollup, WorkRecord
+from apps.tasks.rollups import DONE_STATUSES
+
+# Work day shown on the hourly chart (tenant settings can override)
+DEFAULT_WORK_START_HOUR = 8
+DEFAULT_WORK_END_HOUR = 18
+
+# Chart metric -> aggregate over work records
+SERIES_METRICS = {
+    'quantity': Sum('quantity'),
+    'payment': Sum('total_payment'),
+    'records': Count('id'),
+}
+
+
+# Days on the worker statistics chart, ending today
+EMPLOYEE_CHART_DAYS = 7
+
+# Totals of one day of an employee's rollup rows
+PERIOD_TOTALS = {
+    'tasks': Sum('record_count'),
+    'done': Coalesce(Sum('record_count', filter=Q(status__in=DONE_STATUSES)), Value(0), output_field=IntegerField()),
+    'pending': Coalesce(
+        Sum('record_count', filter=Q(status=WorkRecord.Status.PENDING)), Value(0), output_field=IntegerField()
+    ),
+    'earnings': Sum('total_payment'),
+    'quantity': Sum('total_quantity'),
+}
+
+
+def _empty_period():
+    return {'tasks': 0, 'done': 0, 'pending': 0, 'earnings': Decimal('0'), 'quantity': 0}
+
+
+def _chart_value(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def hourly_production(tenant, day=None, metric='quantity', now=None):
+    """
+    Hourly production for a work day, bucketed in the tenant's timezone.
+    
+    Covers unpaid records of the day from the start of the work day up to
+    the current hour (or the end of the work day for past days).
+    
+    Returns:
+        dict with 'labels' (['08:00', ...]) and 'data' (values per hour)
+    """
+    tz = tenant.get_timezone() if tenant else timezone.get_current_timezone()
+    now = (now or timezone.now()).astimezone(tz)
+    day = day or now.date()
+    work_settings = tenant.settings if tenant else {}
+    start_hour = int(work_settings.get('work_start_hour', DEFAULT_WORK_START_HOUR))
+    end_hour = int(work_settings.get('work_end_hour', DEFAULT_WORK_END_HOUR))
+    last_hour = min(now.hour, end_hour) if day == now.date() else end_hour
+    
+    rows = WorkRecord.objects.filter(
+        tenant=tenant,
+        work_date=day,
+        is_paid=False  # Exclude paid records
+    ).annotate(
+        hour=TruncHour('created_at', tzinfo=tz)
+    ).order_by().values('hour').annotate(
+        value=SERIES_METRICS[metric]
+    )
+    
+    # Records entered on another day for this work date share the hour slot
+    buckets = defaultdict(int)
+    for row in rows:
+        buckets[row['hour'].astimezone(tz).hour] += row['value'] or 0
+    
+    hours = range(start_hour, last_hour + 1)
+    return {
+        'labels': [f'{hour:02d}:00' for hour in hours],
+        'data': [_chart_value(buckets[hour]) for hour in hours],
+    }
+
+
+def employee_periods(employee, today=None, chart_days=EMPLOYEE_CHART_DAYS):
+    """
+    Unpaid work of an employee by period, in one grouped query.
+    
+    Reads the employee's daily rollup rows from the earliest period start
+    to today over the (employee, work_date) index and buckets them in
+    Python.
+    
+    Returns:
+        dict with 'daily' (today), 'weekly' (since Monday) and 'monthly'
+        totals, each with tasks, done, pending, earnings and quantity,
+        and 'days': labels ('dd.mm') and quantities of the last
+        chart_days days
+    """
+    today = today or date.today()
+    starts = {
+        'daily': today,
+        'weekly': today - timedelta(days=today.weekday()),
+        'monthly': today.replace(day=1),
+    }
+    chart_start = today - timedelta(days=chart_days - 1)
+    
+    daily_totals = {
+        row['work_date']: row
+        for row in DailyProductionRollup.objects.filter(
+            employee=employee,
+            work_date__gte=min(chart_start, *starts.values()),
+            work_date__lte=today,
+            is_paid=False  # Exclude paid records
+        ).order_by().values('work_date').annotate(**PERIOD_TOTALS)
+    }
+    
+    periods = {name: _empty_period() for name in starts}
+    for day, row in daily_totals.items():
+        for name, start in starts.items():
+            if day >= start:
+                for total, value in periods[name].items():
+                    periods[name][total] = value + (row[total] or 0)
+    
+    days = [chart_start + timedelta(days=offset) for offset in range(chart_days)]
+    periods['days'] = {
+        'labels': [day.strftime('%d.%m') for day in days],
+        'data': [_chart_value(daily_totals[day]['quantity'] if day in daily_totals else 0) for day in days],
+    }
+    return periods
@@ -18,5 +18,7 @@ urlpatterns = [
     path('tv/', views.tv_dashboard, name='tv'),
     path('tv/kpi-stats/', views.tv_kpi_stats, name='tv-kpi-stats'),
     path('tv/top-performers/', views.tv_top_performers, name='tv-top-performers'),
+    path('tv/production-series/', views.tv_production_series, name='tv-production-series'),
+    path('tv/events/', views.tv_events, name='tv-events'),
 ]
 
@@ -3,17 +3,28 @@ Dashboard views with mobile-first design.
 """
 
 from django.shortcuts import render, redirect
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Count, Q
+from django.db.models import Count, Q
 from django.urls import reverse
 from django.utils import timezone
-from datetime import date, timedelta
+from datetime import date
+from asgiref.sync import sync_to_async
+import asyncio
 import json
 
 from apps.accounts.models import User
 from apps.tasks.models import Task, WorkRecord
 from apps.employees.models import Employee
 
+from .events import SUBSCRIPTION_LOST, get_broker, sse_message, tenant_channel
+from .snapshots import get_tv_snapshot, tv_snapshot_etag
+from .timeseries import SERIES_METRICS, employee_periods, hourly_production
+
 
 @login_required
 def dashboard(request):
@@ -47,23 +58,13 @@ def dashboard(request):
         employee = user.employee
         
         # Today's statistics - exclude paid records
-        today_records = WorkRecord.objects.filter(
-            employee=employee,
-            work_date=today,
-            is_paid=False  # Exclude paid records
-        )
+        today_stats = employee_periods(employee, today)['daily']
         
         stats = {
-            'today_tasks': today_records.count(),
-            'completed': today_records.filter(
-                status__in=[WorkRecord.Status.COMPLETED, WorkRecord.Status.APPROVED]
-            ).count(),
-            'in_progress': today_records.filter(
-                status=WorkRecord.Status.PENDING
-            ).count(),
-            'earnings': today_records.aggregate(
-                total=Sum('total_payment')
-            )['total'] or 0,
+            'today_tasks': today_stats['tasks'],
+            'completed': today_stats['done'],
+            'in_progress': today_stats['pending'],
+            'earnings': today_stats['earnings'],
         }
     
     return render(request, 'dashboard.html', {
@@ -111,8 +112,6 @@ def statistics(request):
         return redirect('master:dashboard')
     
     today = date.today()
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
     
     # Default stats
     stats = {
@@ -126,59 +125,15 @@ def statistics(request):
     if hasattr(user, 'employee'):
         employee = user.employee
         
-        # Daily stats - exclude paid records
-        daily_records = WorkRecord.objects.filter(
-            employee=employee,
-            work_date=today,
-            is_paid=False  # Exclude paid records
-        )
-        stats['daily'] = {
-            'tasks': daily_records.count(),
-            'earnings': daily_records.aggregate(Sum('total_payment'))['total_payment__sum'] or 0,
-        }
-        
-        # Weekly stats - exclude paid records
-        weekly_records = WorkRecord.objects.filter(
-            employee=employee,
-            work_date__gte=week_start,
-            work_date__lte=today,
-            is_paid=False  # Exclude paid records
-        )
-        stats['weekly'] = {
-            'tasks': weekly_records.count(),
-            'earnings': weekly_records.aggregate(Sum('total_payment'))['total_payment__sum'] or 0,
-        }
-        
-        # Monthly stats - exclude paid records
-        monthly_records = WorkRecord.objects.filter(
-            employee=employee,
-            work_date__year=today.year,
-            work_date__month=today.month,
-            is_paid=False  # Exclude paid records
-        )
-        stats['monthly'] = {
-            'tasks': monthly_records.count(),
-            'earnings': monthly_records.aggregate(Sum('total_payment'))['total_payment__sum'] or 0,
-        }
-        
-        # Chart data - last 7 days
-        chart_labels = []
-        chart_data = []
-        for i in range(6, -1, -1):
-            day = today - timedelta(days=i)
-            chart_labels.append(day.strftime('%d.%m'))
-            
-            day_count = WorkRecord.objects.filter(
-                employee=employee,
-                work_date=day,
-                is_paid=False  # Exclude paid records
-            ).aggregate(Sum('quantity'))['quantity__sum'] or 0
-            
-            chart_data.append(day_count)
+        # Month, week, today and the last 7 days in one query - exclude paid records
+        periods = employee_periods(employee, today)
         
+        stats['daily'] = periods['daily']
+        stats['weekly'] = periods['weekly']
+        stats['monthly'] = periods['monthly']
         stats['chart_data'] = {
-            'labels': json.dumps(chart_labels),
-            'data': json.dumps(chart_data),
+            'labels': json.dumps(periods['days']['labels']),
+            'data': json.dumps(periods['days']['data']),
         }
     
     return render(request, 'statistics.html', {
@@ -199,6 +154,11 @@ def profile(request):
 
 # TV Dashboard Views (for big screen analytics)
 
+# Server-Sent Events timing (seconds / milliseconds)
+TV_EVENTS_KEEPALIVE = 15
+TV_EVENTS_RETRY_MS = 5000
+
+
 def tv_dashboard(request):
     """
     Full-screen dashboard for TV displays.
@@ -213,108 +173,126 @@ def tv_dashboard(request):
     current_time = now.strftime('%H:%M:%S')
     current_date = now.strftime('%d.%m.%Y, %A')
     
-    # Company-wide statistics for today (current tenant only) - exclude paid records
-    today_records = WorkRecord.objects.filter(
-        tenant=request.tenant,
-        work_date=today,
-        is_paid=False  # Exclude paid records
-    )
-    
-    stats = {
-        'total_production': today_records.aggregate(
-            Sum('quantity')
-        )['quantity__sum'] or 0,
-        'active_workers': today_records.values('employee').distinct().count(),
-        'completed_tasks': today_records.filter(
-            status__in=[WorkRecord.Status.COMPLETED, WorkRecord.Status.APPROVED]
-        ).count(),
-        'total_payment': today_records.aggregate(
-            Sum('total_payment')
-        )['total_payment__sum'] or 0,
-    }
+    # Company-wide statistics for today (current tenant only, shared snapshot)
+    snapshot = get_tv_snapshot(request.tenant, today)
     
-    # Chart data - hourly production for today
-    chart_labels = []
-    chart_data = []
-    
-    # Get hourly data (8:00 to current hour)
-    current_hour = now.hour
-    start_hour = 8  # Work starts at 8:00
-    
-    for hour in range(start_hour, min(current_hour + 1, 19)):  # Until 18:00
-        chart_labels.append(f'{hour:02d}:00')
-        
-        # Get production for this hour (current tenant only) - exclude paid records
-        hour_production = WorkRecord.objects.filter(
-            tenant=request.tenant,
-            work_date=today,
-            created_at__hour=hour,
-            is_paid=False  # Exclude paid records
-        ).aggregate(Sum('quantity'))['quantity__sum'] or 0
-        
-        chart_data.append(hour_production)
+    # Chart data - hourly production for today (one grouped query)
+    chart_data = hourly_production(request.tenant)
     
     return render(request, 'dashboard/tv.html', {
-        'stats': stats,
+        'stats': snapshot['stats'],
+        'performers': snapshot['performers'],
         'chart_data': {
-            'labels': json.dumps(chart_labels),
-            'data': json.dumps(chart_data),
+            'labels': json.dumps(chart_data['labels']),
+            'data': json.dumps(chart_data['data']),
         },
         'current_time': current_time,
         'current_date': current_date,
     })
 
 
+@condition(etag_func=tv_snapshot_etag)
+@cache_control(private=True, no_cache=True)
 def tv_kpi_stats(request):
     """
     HTMX partial for KPI cards on TV dashboard.
     Auto-refreshes to show real-time data.
-    """
-    today = date.today()
-    
-    # Company-wide statistics (current tenant only) - exclude paid records
-    today_records = WorkRecord.objects.filter(
-        tenant=request.tenant,
-        work_date=today,
-        is_paid=False  # Exclude paid records
-    )
     
-    stats = {
-        'total_production': today_records.aggregate(
-            Sum('quantity')
-        )['quantity__sum'] or 0,
-        'active_workers': today_records.values('employee').distinct().count(),
-        'completed_tasks': today_records.filter(
-            status__in=[WorkRecord.Status.COMPLETED, WorkRecord.Status.APPROVED]
-        ).count(),
-        'total_payment': today_records.aggregate(
-            Sum('total_payment')
-        )['total_payment__sum'] or 0,
-    }
-    
-    return render(request, 'dashboard/_tv_kpi_cards.html', stats)
+    Served from the shared TV snapshot; unchanged data returns 304.
+    """
+    snapshot = get_tv_snapshot(request.tenant)
+    return render(request, 'dashboard/_tv_kpi_cards.html', {
+        'stats': snapshot['stats'],
+    })
 
 
+@condition(etag_func=tv_snapshot_etag)
+@cache_control(private=True, no_cache=True)
 def tv_top_performers(request):
     """
     HTMX partial for top performers list.
     Shows top 10 employees by production today.
-    """
-    today = date.today()
-    
-    # Get top performers for today (current tenant only) - exclude paid records
-    top_performers = WorkRecord.objects.filter(
-        tenant=request.tenant,
-        work_date=today,
-        is_paid=False  # Exclude paid records
-    ).values(
-        'employee__full_name'
-    ).annotate(
-        total_quantity=Sum('quantity'),
-        total_payment=Sum('total_payment')
-    ).order_by('-total_quantity')[:10]
     
+    Served from the shared TV snapshot; unchanged data returns 304.
+    """
+    snapshot = get_tv_snapshot(request.tenant)
     return render(request, 'dashboard/_tv_top_performers.html', {
-        'performers': top_performers,
+        'performers': snapshot['performers'],
     })
 
+
+def tv_production_series(request):
+    """
+    JSON time series for the TV production chart.
+    
+    Query params:
+        metric: quantity (default), payment or records
+    """
+    metric = request.GET.get('metric', 'quantity')
+    if metric not in SERIES_METRICS:
+        return JsonResponse({'error': f'Unknown metric: {metric}'}, status=400)
+    
+    return JsonResponse(hourly_production(request.tenant, metric=metric))
+
+
+async def tv_events(request):
+    """
+    Server-Sent Events stream for the TV dashboard (ASGI only).
+    
+    Sends the KPI cards and top performers when the stream opens and then
+    only the parts that changed, whenever today's production changes.
+    Idle streams only send a keep-alive comment. If the subscription
+    breaks the stream ends, and EventSource reconnects and resubscribes.
+    
+    Under WSGI a stream would hold a worker thread forever, so it answers
+    204, which tells EventSource to stop and the page keeps HTMX polling.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    
+    tenant = request.tenant
+    channel = tenant_channel(tenant.id if tenant else None)
+    
+    async def render_parts():
+        snapshot = await sync_to_async(get_tv_snapshot)(tenant)
+        return {
+            'kpi': await sync_to_async(render_to_string)(
+                'dashboard/_tv_kpi_cards.html', {'stats': snapshot['stats']}
+            ),
+            'performers': await sync_to_async(render_to_string)(
+                'dashboard/_tv_top_performers.html', {'performers': snapshot['performers']}
+            ),
+        }
+    
+    async def stream():
+        async with get_broker().subscribe(channel) as queue:
+            yield f'retry: {TV_EVENTS_RETRY_MS}\n\n'
+            
+            sent = await render_parts()
+            for event, html in sent.items():
+                yield sse_message(event, html)
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=TV_EVENTS_KEEPALIVE)
+                except TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                
+                if message is SUBSCRIPTION_LOST:
+                    # End the stream; EventSource reconnects after the retry delay
+                    return
+                
+                if message.get('work_date') != date.today().isoformat():
+                    continue
+                
+                parts = await render_parts()
+                for event, html in parts.items():
+                    if html != sent.get(event):
+                        yield sse_message(event, html)
+                sent = parts
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable nginx buffering
+    return response
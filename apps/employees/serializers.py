@@ -62,6 +62,7 @@ class EmployeeStatisticsSerializer(serializers.Serializer):
     
     total_work_records = serializers.IntegerField()
     total_earnings = serializers.DecimalField(max_digits=12, decimal_places=2)
+    unpaid_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
     average_daily_earnings = serializers.DecimalField(max_digits=10, decimal_places=2)
     working_days = serializers.IntegerField()
     current_month_earnings = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -16,6 +16,7 @@ from .serializers import (
     EmployeeCreateSerializer,
     EmployeeStatisticsSerializer,
 )
+from apps.tasks.earnings import employee_statistics
 from core.permissions import IsStaffUser
 
 
@@ -103,17 +104,9 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def statistics(self, request, pk=None):
-        """Get employee statistics."""
+        """Get employee statistics from the employee's earnings ledger."""
         employee = self.get_object()
-        
-        # This is a placeholder - will be implemented when work_records app is ready
-        statistics = {
-            'total_work_records': 0,
-            'total_earnings': 0,
-            'average_daily_earnings': 0,
-            'working_days': 0,
-            'current_month_earnings': 0,
-        }
+        statistics = employee_statistics(employee)
         
         serializer = EmployeeStatisticsSerializer(statistics)
         return Response(serializer.data)
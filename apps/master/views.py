@@ -5,15 +5,24 @@ Master/Admin views for work record approval workflow.
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.http import JsonResponse, HttpResponse
-from django.db.models import Q, Sum, Count
+from django.db.models import Q
 from django.utils import timezone
 from django.contrib import messages
+from django.db import transaction
 from datetime import date, timedelta, datetime
 
-from apps.tasks.models import WorkRecord
+import structlog
+
+from apps.tasks.models import WorkRecord, PayoutBatch, DailyProductionRollup
+from apps.tasks.rollups import rollup_summary
+from apps.tasks.payroll import PAYROLL_SYNC_LIMIT, start_payout_batch, close_payout_batch
+from apps.tasks.tasks import close_payout_batch_task
 from apps.employees.models import Employee
 from apps.products.models import Product
 from apps.tasks.models import Task
+from core.pagination import keyset_paginate, next_page_query
+
+logger = structlog.get_logger(__name__)
 
 
 def is_master_or_admin(user):
@@ -33,21 +42,17 @@ def master_dashboard(request):
     today = date.today()
     
     # Statistics - filter by current tenant, exclude paid records
-    pending_count = WorkRecord.objects.filter(
+    pending_count = rollup_summary(DailyProductionRollup.objects.filter(
         tenant=request.tenant,
         status=WorkRecord.Status.PENDING,
         is_paid=False  # Exclude already paid records
-    ).count()
-    today_approved = WorkRecord.objects.filter(
-        tenant=request.tenant,
-        work_date=today,
-        status=WorkRecord.Status.APPROVED
-    ).count()
-    today_rejected = WorkRecord.objects.filter(
+    ))['record_count']
+    today_summary = rollup_summary(DailyProductionRollup.objects.filter(
         tenant=request.tenant,
-        work_date=today,
-        status=WorkRecord.Status.REJECTED
-    ).count()
+        work_date=today
+    ))
+    today_approved = today_summary['approved_count']
+    today_rejected = today_summary['rejected_count']
     
     # Recent activity (last 10 approved/rejected)
     recent_activity = WorkRecord.objects.filter(
@@ -112,11 +117,7 @@ def pending_approvals(request):
         records = records.filter(product_id=product_filter)
     
     # Statistics for filtered records
-    stats = records.aggregate(
-        total_quantity=Sum('quantity'),
-        total_payment=Sum('total_payment'),
-        count=Count('id')
-    )
+    stats = records.facet_counts()
     
     # Order by date (newest first)
     records = records.order_by('-work_date', '-created_at')
@@ -149,9 +150,6 @@ def approve_record(request, record_id):
     Approve single work record.
     """
     if request.method == 'POST':
-        print(f"🔍 [SINGLE APPROVE] Received request from user: {request.user}")
-        print(f"📊 [SINGLE APPROVE] Record ID: {record_id}")
-        
         record = get_object_or_404(
             WorkRecord,
             id=record_id,
@@ -161,16 +159,15 @@ def approve_record(request, record_id):
         )
         
         # Get approver (current user's employee)
-        approver = None
-        if hasattr(request.user, 'employee'):
-            approver = request.user.employee
-            print(f"✅ [SINGLE APPROVE] Approver: {approver.full_name}")
-        else:
-            print("⚠️ [SINGLE APPROVE] User has no employee profile!")
+        approver = getattr(request.user, 'employee', None)
         
         # Approve record
         record.approve(approver)
-        print(f"✅ [SINGLE APPROVE] Successfully approved record {record_id}")
+        logger.info(
+            'work_record.approved',
+            record_id=str(record.id),
+            approver_id=str(approver.id) if approver else None,
+        )
         
         # HTMX response
         if request.headers.get('HX-Request'):
@@ -192,9 +189,6 @@ def reject_record(request, record_id):
     Reject single work record.
     """
     if request.method == 'POST':
-        print(f"🔍 [SINGLE REJECT] Received request from user: {request.user}")
-        print(f"📊 [SINGLE REJECT] Record ID: {record_id}")
-        
         record = get_object_or_404(
             WorkRecord,
             id=record_id,
@@ -205,14 +199,13 @@ def reject_record(request, record_id):
         
         # Get reject reason (optional)
         reason = request.POST.get('reason', '')
-        print(f"📝 [SINGLE REJECT] Reason: {reason if reason else '(none)'}")
         
         if reason:
             record.notes = f"Rad etildi: {reason}"
         
         # Reject record
         record.reject()
-        print(f"✅ [SINGLE REJECT] Successfully rejected record {record_id}")
+        logger.info('work_record.rejected', record_id=str(record.id), reason=reason)
         
         # HTMX response
         if request.headers.get('HX-Request'):
@@ -236,41 +229,25 @@ def bulk_approve(request):
     if request.method == 'POST':
         record_ids = request.POST.getlist('record_ids')
         
-        print(f"🔍 [BULK APPROVE] Received request from user: {request.user}")
-        print(f"📊 [BULK APPROVE] Record IDs received: {record_ids}")
-        print(f"📊 [BULK APPROVE] Total count: {len(record_ids)}")
-        
         if not record_ids:
-            print("❌ [BULK APPROVE] No records selected!")
             messages.warning(request, 'Hech qanday yozuv tanlanmadi!')
             return redirect('master:pending_approvals')
         
         # Get approver
-        approver = None
-        if hasattr(request.user, 'employee'):
-            approver = request.user.employee
-            print(f"✅ [BULK APPROVE] Approver: {approver.full_name}")
-        else:
-            print("⚠️ [BULK APPROVE] User has no employee profile!")
-        
-        # Approve all selected records (only from current tenant)
-        count = 0
-        for record_id in record_ids:
-            try:
-                record = WorkRecord.objects.get(
-                    id=record_id,
-                    tenant=request.tenant,
-                    status=WorkRecord.Status.PENDING,
-                    is_paid=False  # Cannot approve already paid records
-                )
-                record.approve(approver)
-                count += 1
-                print(f"✅ [BULK APPROVE] Approved record {record_id} (#{count})")
-            except WorkRecord.DoesNotExist:
-                print(f"❌ [BULK APPROVE] Record {record_id} not found or not pending!")
-                continue
-        
-        print(f"🎉 [BULK APPROVE] Successfully approved {count} records!")
+        approver = getattr(request.user, 'employee', None)
+        
+        # Approve all eligible records in one UPDATE (only from current tenant)
+        result = WorkRecord.objects.filter(tenant=request.tenant).bulk_approve(record_ids, approver)
+        count = len(result['accepted'])
+        # One audit event per request, not per record
+        logger.info(
+            'work_records.bulk_approved',
+            requested=len(record_ids),
+            approved=count,
+            record_ids=result['accepted'],
+            skipped_ids=result['rejected'],
+            approver_id=str(approver.id) if approver else None,
+        )
         messages.success(request, f'{count} ta yozuv tasdiqlandi!')
         return redirect('master:pending_approvals')
     
@@ -287,36 +264,21 @@ def bulk_reject(request):
         record_ids = request.POST.getlist('record_ids')
         reason = request.POST.get('reason', '')
         
-        print(f"🔍 [BULK REJECT] Received request from user: {request.user}")
-        print(f"📊 [BULK REJECT] Record IDs received: {record_ids}")
-        print(f"📊 [BULK REJECT] Total count: {len(record_ids)}")
-        print(f"📝 [BULK REJECT] Reason: {reason if reason else '(none)'}")
-        
         if not record_ids:
-            print("❌ [BULK REJECT] No records selected!")
             messages.warning(request, 'Hech qanday yozuv tanlanmadi!')
             return redirect('master:pending_approvals')
         
-        # Reject all selected records (only from current tenant)
-        count = 0
-        for record_id in record_ids:
-            try:
-                record = WorkRecord.objects.get(
-                    id=record_id,
-                    tenant=request.tenant,
-                    status=WorkRecord.Status.PENDING,
-                    is_paid=False  # Cannot reject already paid records
-                )
-                if reason:
-                    record.notes = f"Rad etildi: {reason}"
-                record.reject()
-                count += 1
-                print(f"✅ [BULK REJECT] Rejected record {record_id} (#{count})")
-            except WorkRecord.DoesNotExist:
-                print(f"❌ [BULK REJECT] Record {record_id} not found or not pending!")
-                continue
-        
-        print(f"🎉 [BULK REJECT] Successfully rejected {count} records!")
+        # Reject all eligible records in one UPDATE (only from current tenant)
+        result = WorkRecord.objects.filter(tenant=request.tenant).bulk_reject(record_ids, reason)
+        count = len(result['accepted'])
+        logger.info(
+            'work_records.bulk_rejected',
+            requested=len(record_ids),
+            rejected=count,
+            record_ids=result['accepted'],
+            skipped_ids=result['rejected'],
+            reason=reason,
+        )
         messages.warning(request, f'{count} ta yozuv rad etildi.')
         return redirect('master:pending_approvals')
     
@@ -336,6 +298,10 @@ def work_record_detail_master(request, record_id):
     })
 
 
+# Partials rendered for HTMX "load more" requests on the work records list
+WORK_RECORD_FRAGMENTS = ('cards', 'rows')
+
+
 @login_required
 @user_passes_test(is_master_or_admin, login_url='/dashboard/')
 def work_records_list(request):
@@ -385,21 +351,29 @@ def work_records_list(request):
     if employee_filter:
         records = records.filter(employee_id=employee_filter)
     
-    # Statistics
-    stats = {
-        'total': records.count(),
-        'pending': records.filter(status=WorkRecord.Status.PENDING).count(),
-        'approved': records.filter(status=WorkRecord.Status.APPROVED).count(),
-        'rejected': records.filter(status=WorkRecord.Status.REJECTED).count(),
-        'completed': records.filter(status=WorkRecord.Status.COMPLETED).count(),
-    }
+    # One keyset page; "load more" requests only render the next rows
+    try:
+        page = keyset_paginate(records, request.GET.get('cursor'))
+    except ValueError:
+        page = keyset_paginate(records)
+    
+    fragment = request.GET.get('fragment')
+    if request.headers.get('HX-Request') and fragment in WORK_RECORD_FRAGMENTS:
+        return render(request, f'master/_work_record_{fragment}.html', {
+            'records': page,
+            'next_query': next_page_query(request, page),
+        })
+    
+    # Statistics (one conditional-aggregation query)
+    stats = records.facet_counts()
     
     # Get employees for filter dropdown
     employees = Employee.objects.filter(tenant=tenant, is_active=True).order_by('full_name')
     
     return render(request, 'master/work_records_list.html', {
         'tenant': tenant,
-        'records': records,
+        'records': page,
+        'next_query': next_page_query(request, page),
         'stats': stats,
         'employees': employees,
         'date_filter': date_filter,
@@ -461,6 +435,8 @@ def mark_records_paid_by_date(request):
     
     This allows Master/Owner to mark all work up to a certain date as paid,
     effectively archiving them so they don't mix with current work.
+    Records are closed through a PayoutBatch; large batches are closed
+    by a Celery task with a progress page.
     """
     tenant = request.tenant
     
@@ -490,25 +466,24 @@ def mark_records_paid_by_date(request):
             messages.error(request, 'Siz employee sifatida ro\'yxatdan o\'tmagansiz!')
             return redirect('master:work_records_list')
         
-        # Build query: records before cutoff_date that are not yet paid
-        records_query = WorkRecord.objects.filter(
-            tenant=tenant,
-            work_date__lte=cutoff_date,  # Before or on cutoff date
-            is_paid=False  # Not already paid
-        )
-        
-        # Optional: filter by specific employee
+        employee = None
         if employee_id:
-            records_query = records_query.filter(employee_id=employee_id)
+            employee = get_object_or_404(Employee, id=employee_id, tenant=tenant)
         
-        # Mark as paid
-        count = 0
-        for record in records_query:
-            record.mark_as_paid(paid_by)
-            count += 1
+        # Records before cutoff_date that are not yet paid, closed in chunks
+        batch = start_payout_batch(tenant, paid_by, cutoff_date, employee)
         
-        if employee_id:
-            employee = Employee.objects.get(id=employee_id)
+        # Large batches run in the background with a progress page
+        if batch.expected_count > PAYROLL_SYNC_LIMIT:
+            transaction.on_commit(lambda: close_payout_batch_task.delay(str(batch.id)))
+            return redirect('master:payout_batch_status', batch_id=batch.id)
+        
+        batch = close_payout_batch(batch)
+        count = batch.processed_count
+        
+        if batch.status == PayoutBatch.Status.FAILED:
+            messages.error(request, f'Xatolik yuz berdi! {count} ta yozuv belgilandi, qolganlarini qayta belgilang.')
+        elif employee:
             messages.success(
                 request,
                 f'{count} ta yozuv "{cutoff_date}" sanasigacha "{employee.full_name}" uchun to\'langan deb belgilandi!'
@@ -523,9 +498,39 @@ def mark_records_paid_by_date(request):
     
     # GET request - show form
     employees = Employee.objects.filter(tenant=tenant, is_active=True).order_by('full_name')
+    recent_batches = PayoutBatch.objects.filter(tenant=tenant).select_related('employee', 'paid_by')[:5]
     return render(request, 'master/mark_paid_by_date.html', {
         'tenant': tenant,
         'employees': employees,
+        'recent_batches': recent_batches,
         'today': date.today(),
     })
 
+
+@login_required
+@user_passes_test(is_master_or_admin, login_url='/dashboard/')
+def payout_batch_status(request, batch_id):
+    """
+    Progress page for a payout batch closed in the background.
+    
+    HTMX polling requests get only the progress fragment.
+    """
+    tenant = request.tenant
+    
+    if not tenant:
+        return HttpResponse('No tenant selected', status=400)
+    
+    batch = get_object_or_404(
+        PayoutBatch.objects.select_related('employee', 'paid_by'),
+        id=batch_id,
+        tenant=tenant
+    )
+    
+    if request.headers.get('HX-Request'):
+        return render(request, 'master/_payout_batch_progress.html', {'batch': batch})
+    
+    return render(request, 'master/payout_batch_status.html', {
+        'tenant': tenant,
+        'batch': batch,
+    })
+
@@ -0,0 +1,152 @@
+"""
+Per-tenant price catalog.
+
+The work record form asks for a product's tasks on every product change
+and for a price preview on every quantity keystroke. Both are answered
+from a catalog of the tenant's active products, each with its tasks and
+prices in sequence order, instead of querying ProductTask every time.
+
+The catalog lives in Django's cache (shared by all processes) and in a
+per-process copy. Both are keyed by a per-tenant version number in the
+shared cache; Product, Task and ProductTask changes bump the version
+(apps.products.signals), which makes every older copy unreachable.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_version, get_version
+
+from .models import ProductTask
+
+# tenant_id -> (version, catalog) of catalogs used by this process
+_local_catalogs = {}
+
+
+def catalog_version_key(tenant_id):
+    return f'price-catalog:version:{tenant_id}'
+
+
+def catalog_cache_key(tenant_id, version):
+    return f'price-catalog:{tenant_id}:{version}'
+
+
+def _catalog_version(tenant_id):
+    return get_version(catalog_version_key(tenant_id))
+
+
+def invalidate_price_catalog(tenant_id):
+    """Make all cached catalogs of a tenant stale."""
+    bump_version(catalog_version_key(tenant_id))
+
+
+def build_price_catalog(tenant_id):
+    """
+    Load the catalog of a tenant (uncached).
+    
+    Returns:
+        dict of product ID (str) -> {'id', 'article_code', 'name',
+        'tasks': [...]}; each task is a dict with id, product_task_id,
+        code, name_uz, name_ru, category, category_display, price
+        (Decimal) and sequence_order
+    """
+    product_tasks = ProductTask.objects.filter(
+        product__tenant_id=tenant_id,
+        product__is_active=True,
+        task__tenant_id=tenant_id,
+    ).select_related('product', 'task').order_by('task__sequence_order', 'task__code')
+    
+    catalog = {}
+    for product_task in product_tasks:
+        product = product_task.product
+        task = product_task.task
+        entry = catalog.setdefault(str(product.id), {
+            'id': str(product.id),
+            'article_code': product.article_code,
+            'name': product.name,
+            'tasks': [],
+        })
+        entry['tasks'].append({
+            'id': str(task.id),
+            'product_task_id': str(product_task.id),
+            'code': task.code,
+            'name_uz': task.name_uz,
+            'name_ru': task.name_ru,
+            'category': task.category,
+            'category_display': task.get_category_display(),
+            'price': product_task.get_price(),
+            'sequence_order': task.sequence_order,
+        })
+    return catalog
+
+
+def _versioned_catalog(tenant_id):
+    version = _catalog_version(tenant_id)
+    local = _local_catalogs.get(tenant_id)
+    if local is not None and local[0] == version:
+        return local
+    
+    key = catalog_cache_key(tenant_id, version)
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = build_price_catalog(tenant_id)
+        cache.set(key, catalog, timeout=settings.PRICE_CATALOG_TIMEOUT)
+    _local_catalogs[tenant_id] = (version, catalog)
+    return version, catalog
+
+
+def get_price_catalog(tenant_id):
+    """
+    Return the catalog of a tenant, from this process, the shared cache
+    or the database (in that order).
+    """
+    return _versioned_catalog(tenant_id)[1]
+
+
+def price_table_version(tenant_id):
+    return f'{tenant_id}-{_catalog_version(tenant_id)}'
+
+
+def get_price_table(tenant_id):
+    """
+    Compact price table for computing totals in the browser.
+    
+    Returns:
+        {'version': ..., 'prices': {product_id: {task_id: price}},
+        'tasks': {task_id: name}}; tasks of a product are in sequence
+        order and version is the table's ETag
+    """
+    version, catalog = _versioned_catalog(tenant_id)
+    prices = {}
+    names = {}
+    for product_id, product in catalog.items():
+        prices[product_id] = {task['id']: float(task['price']) for task in product['tasks']}
+        for task in product['tasks']:
+            names[task['id']] = task['name_uz'] or task['name_ru']
+    return {
+        'version': f'{tenant_id}-{version}',
+        'prices': prices,
+        'tasks': names,
+    }
+
+
+def price_table_etag(request, *args, **kwargs):
+    """ETag function for django.views.decorators.http.condition."""
+    return price_table_version(request.tenant.id if request.tenant else None)
+
+
+def get_product_catalog(tenant_id, product_id):
+    """Catalog entry of one active product, or None."""
+    return get_price_catalog(tenant_id).get(str(product_id))
+
+
+def get_catalog_task(tenant_id, product_id, task_id):
+    """Catalog task (with its price) of a product, or None."""
+    product = get_product_catalog(tenant_id, product_id)
+    if product is None:
+        return None
+    task_id = str(task_id)
+    for task in product['tasks']:
+        if task['id'] == task_id:
+            return task
+    return None
@@ -0,0 +1,38 @@
+"""
+Signal handlers for Products app.
+
+Invalidate the tenant's price catalog (see apps.products.catalog) after
+the transaction that changed a product, task or price commits.
+"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.tasks.models import Task
+
+from .catalog import invalidate_price_catalog
+from .models import Product, ProductTask
+
+
+def _invalidate_on_commit(tenant_id):
+    if tenant_id:
+        transaction.on_commit(partial(invalidate_price_catalog, tenant_id))
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Task)
+def catalog_owner_changed(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.tenant_id)
+
+
+@receiver([post_save, post_delete], sender=ProductTask)
+def product_task_changed(sender, instance, **kwargs):
+    try:
+        tenant_id = instance.product.tenant_id
+    except Product.DoesNotExist:
+        # Deleted along with its product, whose own signal invalidates
+        return
+    _invalidate_on_commit(tenant_id)
@@ -4,7 +4,7 @@ Django admin configuration for Tasks app.
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Task, WorkRecord
+from .models import Task, WorkRecord, PayoutBatch, DailyProductionRollup, EmployeeEarnings
 
 
 @admin.register(Task)
@@ -132,21 +132,20 @@ class WorkRecordAdmin(admin.ModelAdmin):
     def approve_records(self, request, queryset):
         """Bulk approve work records."""
         count = 0
-        for record in queryset.filter(status=WorkRecord.Status.PENDING):
-            # Use request.user's employee if exists
-            approved_by = getattr(request.user, 'employee', None)
-            if approved_by:
-                record.approve(approved_by)
-                count += 1
+        # Use request.user's employee if exists
+        approved_by = getattr(request.user, 'employee', None)
+        if approved_by:
+            record_ids = queryset.values_list('id', flat=True)
+            result = WorkRecord.objects.bulk_approve(record_ids, approved_by)
+            count = len(result['accepted'])
         
         self.message_user(request, f'{count} work records approved.')
     approve_records.short_description = 'Approve selected work records'
     
     def reject_records(self, request, queryset):
         """Bulk reject work records."""
-        count = queryset.filter(status=WorkRecord.Status.PENDING).update(
-            status=WorkRecord.Status.REJECTED
-        )
+        result = WorkRecord.objects.bulk_reject(queryset.values_list('id', flat=True))
+        count = len(result['accepted'])
         self.message_user(request, f'{count} work records rejected.')
     reject_records.short_description = 'Reject selected work records'
     
@@ -174,3 +173,67 @@ class WorkRecordAdmin(admin.ModelAdmin):
         
         self.message_user(request, f'{count} work records unmarked as paid.')
     unmark_as_paid.short_description = 'Unmark selected as paid'
+
+
+@admin.register(PayoutBatch)
+class PayoutBatchAdmin(admin.ModelAdmin):
+    """Admin interface for PayoutBatch model."""
+    
+    list_display = [
+        'cutoff_date', 'tenant', 'employee', 'paid_by', 'status',
+        'processed_count', 'total_payment', 'created_at'
+    ]
+    list_filter = ['status', 'cutoff_date']
+    search_fields = ['tenant__name', 'employee__full_name', 'paid_by__full_name']
+    ordering = ['-created_at']
+    readonly_fields = [
+        'expected_count', 'processed_count', 'total_quantity', 'total_payment',
+        'created_at', 'updated_at', 'completed_at'
+    ]
+
+
+@admin.register(DailyProductionRollup)
+class DailyProductionRollupAdmin(admin.ModelAdmin):
+    """Admin interface for DailyProductionRollup model (read-only)."""
+    
+    list_display = [
+        'work_date', 'tenant', 'employee', 'product', 'task', 'status',
+        'is_paid', 'record_count', 'total_quantity', 'total_payment'
+    ]
+    list_filter = ['status', 'is_paid', 'work_date']
+    search_fields = ['tenant__name', 'employee__full_name']
+    ordering = ['-work_date']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        # Deleting rows would leave the incremental totals wrong; repair
+        # them with the rebuild_production_rollups command
+        return False
+
+
+@admin.register(EmployeeEarnings)
+class EmployeeEarningsAdmin(admin.ModelAdmin):
+    """Admin interface for EmployeeEarnings model (read-only)."""
+    
+    list_display = [
+        'employee', 'tenant', 'record_count', 'total_earnings', 'unpaid_balance',
+        'working_days', 'current_month', 'current_month_earnings'
+    ]
+    search_fields = ['tenant__name', 'employee__full_name']
+    ordering = ['-total_earnings']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        # Deleting rows would leave the incremental totals wrong; repair
+        # them with the rebuild_employee_earnings command
+        return False
@@ -0,0 +1,279 @@
+"""
+Employee earnings ledger maintenance and queries.
+
+EmployeeEarnings holds running totals per employee. It is updated from
+the same deltas as the production rollups: apply_rollup_deltas() passes
+its changes to apply_earnings_changes() together with the rollup rows
+it locked, so every write path that keeps the rollups in sync (signals,
+set-based UPDATEs, bulk_create) keeps the ledger in sync too.
+
+A working day is a work date with earning rollup rows; whether a change
+adds or removes one follows from the locked rows of that employee and
+day, without extra queries. current_month_earnings follows the latest
+month with earnings; a month only becomes current with its first
+earnings, so the ledger knows the earnings of the current month and of
+every later one (zero).
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import DailyProductionRollup, EmployeeEarnings, WorkRecord
+
+# Statuses whose payment counts as earned
+EARNING_STATUSES = (WorkRecord.Status.COMPLETED, WorkRecord.Status.APPROVED)
+
+# Ledger rows written per statement
+LEDGER_BATCH_SIZE = 1000
+
+LEDGER_FIELDS = [
+    'record_count', 'total_earnings', 'unpaid_balance', 'working_days',
+    'current_month', 'current_month_earnings', 'updated_at',
+]
+
+
+def _month(day):
+    return day.replace(day=1)
+
+
+def _earning_pairs(changes):
+    """(employee_id, work_date) pairs whose number of earning records changes."""
+    return {
+        (dimensions['employee_id'], dimensions['work_date'])
+        for dimensions, (count, _, _) in changes
+        if count and dimensions['status'] in EARNING_STATUSES
+    }
+
+
+def _working_day_changes(changes, rollup_counts):
+    """
+    Change in working days per employee.
+    
+    Args:
+        changes: list of (rollup dimensions dict, [count, quantity, payment])
+        rollup_counts: list of (rollup dimensions dict, record_count) of
+            all rollup rows of the changed employees and days, before the
+            changes
+    """
+    pairs = _earning_pairs(changes)
+    if not pairs:
+        return {}
+    
+    before = defaultdict(int)
+    for dimensions, count in rollup_counts:
+        pair = (dimensions['employee_id'], dimensions['work_date'])
+        if pair in pairs and dimensions['status'] in EARNING_STATUSES:
+            before[pair] += count
+    after = defaultdict(int, before)
+    for dimensions, (count, _, _) in changes:
+        if dimensions['status'] in EARNING_STATUSES:
+            after[(dimensions['employee_id'], dimensions['work_date'])] += count
+    
+    working_days = defaultdict(int)
+    for employee_id, day in pairs:
+        working_days[employee_id] += (after[(employee_id, day)] > 0) - (before[(employee_id, day)] > 0)
+    return working_days
+
+
+def _new_delta(tenant_id):
+    return {
+        'tenant_id': tenant_id,
+        'record_count': 0,
+        'total_earnings': Decimal('0'),
+        'unpaid_balance': Decimal('0'),
+        'working_days': 0,
+        'months': defaultdict(Decimal),
+    }
+
+
+def _apply_months(ledger, months):
+    for month in sorted(months):
+        amount = months[month]
+        if not amount:
+            continue
+        if ledger.current_month is None or month > ledger.current_month:
+            ledger.current_month = month
+            ledger.current_month_earnings = amount
+        elif month == ledger.current_month:
+            ledger.current_month_earnings += amount
+
+
+def _locked_ledgers(employee_ids):
+    return {
+        ledger.employee_id: ledger
+        for ledger in EmployeeEarnings.objects.select_for_update().filter(
+            employee_id__in=employee_ids,
+        ).order_by('employee_id')
+    }
+
+
+def _add_delta(ledger, delta, now):
+    ledger.record_count = max(0, ledger.record_count + delta['record_count'])
+    ledger.total_earnings += delta['total_earnings']
+    ledger.unpaid_balance += delta['unpaid_balance']
+    ledger.working_days = max(0, ledger.working_days + delta['working_days'])
+    _apply_months(ledger, delta['months'])
+    ledger.updated_at = now
+
+
+def _write_ledgers(deltas):
+    """Add deltas to the locked ledger rows, creating missing ones."""
+    now = timezone.now()
+    ledgers = _locked_ledgers(deltas)
+    missing = [employee_id for employee_id in deltas if employee_id not in ledgers]
+    
+    if ledgers:
+        for employee_id, ledger in ledgers.items():
+            _add_delta(ledger, deltas[employee_id], now)
+        EmployeeEarnings.objects.bulk_update(ledgers.values(), LEDGER_FIELDS, batch_size=LEDGER_BATCH_SIZE)
+    
+    if missing:
+        created = []
+        for employee_id in missing:
+            ledger = EmployeeEarnings(tenant_id=deltas[employee_id]['tenant_id'], employee_id=employee_id)
+            _add_delta(ledger, deltas[employee_id], now)
+            created.append(ledger)
+        try:
+            with transaction.atomic():
+                EmployeeEarnings.objects.bulk_create(created, batch_size=LEDGER_BATCH_SIZE)
+        except IntegrityError:
+            # Created concurrently - add to the rows that exist now
+            ledgers = _locked_ledgers(missing)
+            for employee_id, ledger in ledgers.items():
+                _add_delta(ledger, deltas[employee_id], now)
+            EmployeeEarnings.objects.bulk_update(ledgers.values(), LEDGER_FIELDS, batch_size=LEDGER_BATCH_SIZE)
+
+
+def apply_earnings_changes(changes, rollup_counts):
+    """
+    Add rollup changes to the employees' ledgers.
+    
+    Must run in the transaction that applies the changes to the rollup
+    rows.
+    
+    Args:
+        changes: list of (rollup dimensions dict, [count, quantity, payment])
+        rollup_counts: list of (rollup dimensions dict, record_count) of
+            the locked rollup rows, before the changes
+    """
+    deltas = {}
+    for dimensions, (count, _, payment) in changes:
+        delta = deltas.setdefault(dimensions['employee_id'], _new_delta(dimensions['tenant_id']))
+        delta['record_count'] += count
+        if dimensions['status'] in EARNING_STATUSES:
+            delta['total_earnings'] += payment
+            if not dimensions['is_paid']:
+                delta['unpaid_balance'] += payment
+            delta['months'][_month(dimensions['work_date'])] += payment
+    for employee_id, working_days in _working_day_changes(changes, rollup_counts).items():
+        deltas[employee_id]['working_days'] += working_days
+    
+    deltas = {
+        employee_id: delta for employee_id, delta in deltas.items()
+        if delta['record_count'] or delta['total_earnings'] or delta['unpaid_balance']
+        or delta['working_days'] or any(delta['months'].values())
+    }
+    if deltas:
+        _write_ledgers(deltas)
+
+
+def rebuild_earnings(tenant=None):
+    """
+    Recompute employee ledgers from the production rollups.
+    
+    Deletes the ledgers in scope and inserts fresh ones computed with one
+    query grouped by employee and month, in a single transaction. Rollups
+    outlive archived work record partitions, so archived months still
+    count; rebuild the rollups first if they may be stale.
+    
+    Returns:
+        Number of ledger rows written
+    """
+    rollups = DailyProductionRollup.objects.all()
+    ledgers = EmployeeEarnings.objects.all()
+    if tenant is not None:
+        rollups = rollups.filter(tenant=tenant)
+        ledgers = ledgers.filter(tenant=tenant)
+    
+    earning = Q(status__in=EARNING_STATUSES)
+    rows = rollups.order_by().annotate(month=TruncMonth('work_date')).values(
+        'tenant_id', 'employee_id', 'month',
+    ).annotate(
+        count=Sum('record_count'),
+        earnings=Sum('total_payment', filter=earning),
+        unpaid=Sum('total_payment', filter=earning & Q(is_paid=False)),
+        days=Count('work_date', distinct=True, filter=earning),
+    )
+    
+    with transaction.atomic():
+        new_ledgers = {}
+        for row in rows.iterator(chunk_size=LEDGER_BATCH_SIZE):
+            ledger = new_ledgers.get(row['employee_id'])
+            if ledger is None:
+                ledger = new_ledgers[row['employee_id']] = EmployeeEarnings(
+                    tenant_id=row['tenant_id'],
+                    employee_id=row['employee_id'],
+                    total_earnings=Decimal('0'),
+                    unpaid_balance=Decimal('0'),
+                    current_month_earnings=Decimal('0'),
+                )
+            ledger.record_count += row['count']
+            ledger.total_earnings += row['earnings'] or 0
+            ledger.unpaid_balance += row['unpaid'] or 0
+            ledger.working_days += row['days']
+            _apply_months(ledger, {row['month']: row['earnings'] or Decimal('0')})
+        
+        ledgers.delete()
+        EmployeeEarnings.objects.bulk_create(new_ledgers.values(), batch_size=LEDGER_BATCH_SIZE)
+    return len(new_ledgers)
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def employee_statistics(employee, today=None):
+    """
+    Statistics of an employee from the ledger, in one row read.
+    
+    Returns:
+        dict with total_work_records, total_earnings, unpaid_balance,
+        average_daily_earnings, working_days and current_month_earnings
+    """
+    today = today or date.today()
+    try:
+        ledger = EmployeeEarnings.objects.get(employee=employee)
+    except EmployeeEarnings.DoesNotExist:
+        ledger = EmployeeEarnings(employee=employee)
+    
+    month = _month(today)
+    current_month_earnings = ledger.month_earnings(month)
+    if current_month_earnings is None:
+        # Earnings dated after this month - sum this month's rollup rows
+        next_month = _month(month + timedelta(days=31))
+        current_month_earnings = DailyProductionRollup.objects.filter(
+            employee=employee,
+            work_date__gte=month,
+            work_date__lt=next_month,
+            status__in=EARNING_STATUSES,
+        ).aggregate(total=Sum('total_payment'))['total'] or Decimal('0')
+    
+    total_earnings = Decimal(ledger.total_earnings)
+    average = Decimal('0')
+    if ledger.working_days:
+        average = (total_earnings / ledger.working_days).quantize(Decimal('0.01'))
+    
+    return {
+        'total_work_records': ledger.record_count,
+        'total_earnings': total_earnings,
+        'unpaid_balance': Decimal(ledger.unpaid_balance),
+        'average_daily_earnings': average,
+        'working_days': ledger.working_days,
+        'current_month_earnings': current_month_earnings,
+    }
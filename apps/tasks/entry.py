@@ -0,0 +1,324 @@
+"""
+Batch work record entry.
+
+At the end of a shift masters enter dozens of records per worker. A batch
+is validated as a whole: prices for every (product, task) pair are read
+with one query, employees are checked against the tenant with one query,
+and the records are inserted with bulk_create in one transaction. If any
+line is invalid nothing is saved and the errors are returned per line.
+
+The offline entry queue syncs with sync_work_records() instead. Items
+carry client-generated record IDs and are handled one by one: an item
+whose ID already exists is reported as already synced, so retries and
+double submissions never create duplicates.
+"""
+
+import uuid
+from datetime import date
+
+from django.db import IntegrityError, connection, transaction
+
+from apps.employees.models import Employee
+from apps.products.models import ProductTask
+
+from .models import WorkRecord
+from .rollups import apply_created_records
+
+# Maximum number of lines accepted in one batch
+BATCH_MAX_LINES = 500
+
+
+def _parse_uuid(value):
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _parse_line(raw, default_employee_id, any_employee, today):
+    """
+    Parse one raw line. Returns (values, errors).
+    
+    values has employee_id, product_id, task_id, quantity, work_date and
+    notes; errors maps field names to messages.
+    """
+    errors = {}
+    
+    employee_id = default_employee_id
+    if raw.get('employee'):
+        employee_id = _parse_uuid(raw['employee'])
+        if employee_id is None:
+            errors['employee'] = 'Noto\'g\'ri xodim ID'
+        elif not any_employee and employee_id != default_employee_id:
+            errors['employee'] = 'Faqat o\'zingiz uchun ish kiritishingiz mumkin'
+    if employee_id is None and 'employee' not in errors:
+        errors['employee'] = 'Xodim tanlanmagan'
+    
+    product_id = _parse_uuid(raw.get('product') or '')
+    if product_id is None:
+        errors['product'] = 'Mahsulot tanlanmagan'
+    
+    task_id = _parse_uuid(raw.get('task') or '')
+    if task_id is None:
+        errors['task'] = 'Vazifa tanlanmagan'
+    
+    quantity = None
+    try:
+        quantity = int(raw.get('quantity'))
+    except (TypeError, ValueError):
+        errors['quantity'] = 'Miqdor butun son bo\'lishi kerak'
+    else:
+        if quantity <= 0:
+            errors['quantity'] = 'Miqdor 0 dan katta bo\'lishi kerak'
+    
+    work_date = today
+    if raw.get('work_date'):
+        try:
+            work_date = (
+                raw['work_date'] if isinstance(raw['work_date'], date)
+                else date.fromisoformat(str(raw['work_date']))
+            )
+        except ValueError:
+            errors['work_date'] = 'Sana formati noto\'g\'ri (YYYY-MM-DD)'
+        else:
+            if work_date > today:
+                errors['work_date'] = 'Kelajakdagi sana uchun ish kiritib bo\'lmaydi'
+    
+    values = {
+        'employee_id': employee_id,
+        'product_id': product_id,
+        'task_id': task_id,
+        'quantity': quantity,
+        'work_date': work_date,
+        'notes': str(raw.get('notes') or '').strip(),
+    }
+    return values, errors
+
+
+def _product_tasks(tenant, parsed_lines):
+    """Active ProductTask rows for all (product, task) pairs, in one query."""
+    product_ids = {values['product_id'] for values in parsed_lines if values['product_id']}
+    task_ids = {values['task_id'] for values in parsed_lines if values['task_id']}
+    if not product_ids or not task_ids:
+        return {}
+    
+    product_tasks = ProductTask.objects.filter(
+        product__tenant=tenant,
+        product__is_active=True,
+        task__tenant=tenant,
+        task__is_active=True,
+        product_id__in=product_ids,
+        task_id__in=task_ids,
+    ).select_related('product', 'task').order_by('created_at')
+    
+    by_pair = {}
+    for product_task in product_tasks:
+        by_pair.setdefault((product_task.product_id, product_task.task_id), product_task)
+    return by_pair
+
+
+def _build_records(tenant, parsed):
+    """
+    Resolve parsed lines into unsaved WorkRecords.
+    
+    Employees and prices are loaded with one query each. Yields
+    (record, errors) per line; record is None when there are errors.
+    """
+    employee_ids = {values['employee_id'] for values, _ in parsed if values['employee_id']}
+    employees = Employee.objects.filter(tenant=tenant, is_active=True, id__in=employee_ids).in_bulk()
+    product_tasks = _product_tasks(tenant, [values for values, _ in parsed])
+    
+    for values, errors in parsed:
+        employee = employees.get(values['employee_id'])
+        if employee is None and 'employee' not in errors:
+            errors['employee'] = 'Xodim bu sexda topilmadi'
+        
+        product_task = product_tasks.get((values['product_id'], values['task_id']))
+        if product_task is None and 'product' not in errors and 'task' not in errors:
+            errors['task'] = 'Bu mahsulot va operatsiya kombinatsiyasi topilmadi'
+        
+        if errors:
+            yield None, errors
+            continue
+        
+        price = product_task.get_price()
+        yield WorkRecord(
+            tenant=tenant,
+            employee=employee,
+            product=product_task.product,
+            task=product_task.task,
+            product_task=product_task,
+            quantity=values['quantity'],
+            price_per_unit=price,
+            total_payment=values['quantity'] * price,
+            work_date=values['work_date'],
+            notes=values['notes'],
+            status=WorkRecord.Status.PENDING,
+        ), errors
+
+
+def create_work_record_batch(tenant, lines, employee=None, any_employee=False):
+    """
+    Validate and create many work records at once.
+    
+    Args:
+        tenant: Tenant the records belong to
+        lines: list of dicts with product, task, quantity and optional
+            employee, work_date (defaults to today) and notes
+        employee: Employee used for lines without an employee
+        any_employee: allow lines for other employees of the tenant
+            (masters); otherwise every line must be for `employee`
+    
+    Returns:
+        dict with 'created' (list of WorkRecord) and 'errors' (list of
+        {'line': index, 'errors': {field: message}}); nothing is created
+        when there are errors
+    """
+    if not lines:
+        return {'created': [], 'errors': [{'line': None, 'errors': {'lines': 'Hech qanday qator yuborilmadi'}}]}
+    if len(lines) > BATCH_MAX_LINES:
+        return {'created': [], 'errors': [{
+            'line': None,
+            'errors': {'lines': f'Bir martada {BATCH_MAX_LINES} tadan ko\'p qator yuborib bo\'lmaydi'},
+        }]}
+    
+    today = date.today()
+    default_employee_id = employee.id if employee else None
+    parsed = [
+        _parse_line(raw, default_employee_id, any_employee, today)
+        for raw in lines
+    ]
+    
+    records = []
+    errors = []
+    for index, (record, line_errors) in enumerate(_build_records(tenant, parsed)):
+        if line_errors:
+            errors.append({'line': index, 'errors': line_errors})
+        else:
+            records.append(record)
+    
+    if errors:
+        return {'created': [], 'errors': errors}
+    
+    # bulk_create skips save() and signals, so rollups are updated here
+    with transaction.atomic():
+        WorkRecord.objects.bulk_create(records)
+        apply_created_records(records)
+    
+    return {'created': records, 'errors': []}
+
+
+def _lock_record_ids(record_ids):
+    """
+    Serialize syncs of the same record IDs until the transaction ends.
+    
+    On PostgreSQL work_records is partitioned and its primary key is
+    (id, work_date), so a unique id is not enforced: two concurrent syncs
+    of one ID with different dates would both insert. A transaction-level
+    advisory lock per ID (from its first 8 bytes) makes the second sync
+    wait and then see the record as existing. Locks are taken in key
+    order, so overlapping syncs cannot deadlock.
+    """
+    if connection.vendor != 'postgresql' or not record_ids:
+        return
+    keys = sorted({int.from_bytes(record_id.bytes[:8], 'big', signed=True) for record_id in record_ids})
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(key) FROM unnest(%s::bigint[]) AS key', [keys])
+
+
+def _sync_parsed(tenant, parsed):
+    """Create the new, valid items of a sync. Returns per-item results."""
+    record_ids = [values['id'] for values, _ in parsed if values['id']]
+    
+    with transaction.atomic():
+        _lock_record_ids(record_ids)
+        existing = {
+            row['id']: row for row in
+            WorkRecord.objects.filter(id__in=record_ids).values('id', 'tenant_id', 'employee_id')
+        }
+        
+        results = []
+        first_copies = {}
+        duplicates = []
+        pending = []
+        for values, errors in parsed:
+            record_id = values['id']
+            result = {'id': str(record_id) if record_id else None, 'status': 'error', 'errors': dict(errors)}
+            results.append(result)
+            
+            if record_id in existing:
+                row = existing[record_id]
+                if row['tenant_id'] == tenant.id and row['employee_id'] == values['employee_id']:
+                    result.update(status='exists', errors={})
+                else:
+                    result['errors'] = {'id': 'Bu ID boshqa yozuvga tegishli'}
+                continue
+            
+            # Later copies of an ID in this request are resolved once the
+            # first copy is known to be created
+            if record_id in first_copies:
+                duplicates.append((result, values))
+                continue
+            if record_id:
+                first_copies[record_id] = (result, values)
+            if not errors:
+                pending.append((result, values))
+        
+        records = []
+        built = _build_records(tenant, [(values, {}) for _, values in pending])
+        for (result, values), (record, errors) in zip(pending, built, strict=True):
+            if errors:
+                result['errors'] = errors
+                continue
+            record.id = values['id']
+            records.append(record)
+            result['status'] = 'created'
+        
+        for result, values in duplicates:
+            first_result, first_values = first_copies[values['id']]
+            if first_result['status'] != 'created':
+                result['errors'] = {'id': 'Bu ID so\'rovda takrorlangan'}
+            elif first_values['employee_id'] == values['employee_id']:
+                result.update(status='exists', errors={})
+            else:
+                result['errors'] = {'id': 'Bu ID boshqa yozuvga tegishli'}
+        
+        if records:
+            WorkRecord.objects.bulk_create(records)
+            apply_created_records(records)
+    return results
+
+
+def sync_work_records(tenant, items, employee=None, any_employee=False):
+    """
+    Idempotently create queued work records.
+    
+    Each item is a batch line plus 'id', the client-generated record
+    UUID. Items are independent: valid new items are created (in one
+    bulk_create), items whose ID already exists for the same employee are
+    reported as 'exists', and invalid items as 'error'. A later copy of an
+    ID in the same request is 'exists' only when the first copy is
+    created, otherwise 'error'.
+    
+    Returns:
+        list of {'id', 'status': 'created' | 'exists' | 'error', 'errors'}
+        in item order
+    """
+    today = date.today()
+    default_employee_id = employee.id if employee else None
+    parsed = []
+    for item in items:
+        values, errors = _parse_line(item, default_employee_id, any_employee, today)
+        values['id'] = _parse_uuid(item.get('id') or '')
+        if values['id'] is None:
+            errors['id'] = 'Yozuv ID (UUID) noto\'g\'ri'
+        parsed.append((values, errors))
+    
+    # Without advisory locks (other databases) a concurrent sync of the
+    # same items may insert them first; the retry then sees them as existing.
+    for attempt in range(2):
+        try:
+            return _sync_parsed(tenant, parsed)
+        except IntegrityError:
+            if attempt:
+                raise
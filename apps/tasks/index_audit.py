@@ -0,0 +1,172 @@
+"""
+Index audit of the work record hot paths (PostgreSQL only).
+
+hot_queries() is a catalogue of the queries the busiest pages run
+against work records and rollups, built for one tenant. Each is run
+through EXPLAIN; plans that read a large table with a sequential scan
+are reported. unused_indexes() lists the indexes of those tables that
+the statistics collector has never seen scanned since its last reset.
+
+On the partitioned work_records, scans of its month partitions count as
+scans of work_records, and partition indexes are reported as the
+work_records index they belong to (see parent_indexes()).
+
+Small tables are read sequentially whatever their indexes, so audit a
+production-sized database (e.g. one filled by generate_synthetic_data).
+"""
+
+import json
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+
+from apps.employees.models import Employee
+from core.pagination import KEYSET_PAGE_SIZE, WORK_RECORD_ORDERING
+
+from .models import DailyProductionRollup, WorkRecord
+from .partitions import DEFAULT_PARTITION, PARTITION_PATTERN
+
+# Tables whose sequential scans and unused indexes are reported
+AUDITED_TABLES = (WorkRecord._meta.db_table, DailyProductionRollup._meta.db_table)
+
+PARENT_INDEXES_SQL = '''
+    SELECT child.relname, parent.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    WHERE child.relkind = 'i'
+'''
+
+# Partition indexes are grouped under their parent index
+UNUSED_INDEXES_SQL = '''
+    SELECT COALESCE(parent_table.relname, s.relname) AS table_name,
+           COALESCE(parent.relname, s.indexrelname) AS index_name,
+           SUM(pg_relation_size(s.indexrelid)) AS size
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    LEFT JOIN pg_inherits inh ON inh.inhrelid = s.indexrelid
+    LEFT JOIN pg_class parent ON parent.oid = inh.inhparent
+    LEFT JOIN pg_index parent_index ON parent_index.indexrelid = inh.inhparent
+    LEFT JOIN pg_class parent_table ON parent_table.oid = parent_index.indrelid
+    WHERE COALESCE(parent_table.relname, s.relname) = ANY(%s)
+      AND NOT i.indisunique
+    GROUP BY 1, 2
+    HAVING SUM(s.idx_scan) = 0
+    ORDER BY size DESC
+'''
+
+
+def hot_queries(tenant, today=None):
+    """
+    (name, queryset) of the hot queries, for a tenant and one of its workers.
+    """
+    today = today or date.today()
+    week_start = today - timedelta(days=today.weekday())
+    employee = Employee.objects.filter(
+        tenant=tenant, position=Employee.Position.WORKER, is_active=True,
+    ).order_by('id').first()
+    
+    records = WorkRecord.objects.filter(tenant=tenant)
+    unpaid = records.filter(is_paid=False)
+    rollups = DailyProductionRollup.objects.filter(tenant=tenant)
+    
+    queries = [
+        ('admin work records (unpaid)', unpaid.order_by(*WORK_RECORD_ORDERING)[:KEYSET_PAGE_SIZE + 1]),
+        ('admin work records (all)', records.order_by(*WORK_RECORD_ORDERING)[:KEYSET_PAGE_SIZE + 1]),
+        ('admin work records of a day', unpaid.filter(work_date=today).order_by(
+            *WORK_RECORD_ORDERING)[:KEYSET_PAGE_SIZE + 1]),
+        ('unpaid day totals', unpaid.filter(work_date=today).order_by().values('status').annotate(
+            count=Count('*'), quantity=Sum('quantity'), payment=Sum('total_payment'))),
+        ('approval queue', records.pending_unpaid().order_by('-work_date', '-created_at')[:KEYSET_PAGE_SIZE]),
+        ('approval queue this week', records.pending_unpaid().filter(work_date__gte=week_start).order_by(
+            '-work_date', '-created_at')[:KEYSET_PAGE_SIZE]),
+        ('master recent activity', records.filter(
+            status__in=[WorkRecord.Status.APPROVED, WorkRecord.Status.REJECTED],
+        ).order_by('-updated_at')[:10]),
+        ('hourly chart', unpaid.filter(work_date=today).annotate(
+            hour=TruncHour('created_at')).order_by().values('hour').annotate(value=Sum('quantity'))),
+        ('payroll cutoff', unpaid.filter(work_date__lte=today).order_by('id').values_list('id', flat=True)[:1000]),
+        ('admin recent records', records.order_by('-created_at')[:10]),
+        ('TV top performers', rollups.filter(work_date=today, is_paid=False).values(
+            'employee').annotate(quantity=Sum('total_quantity')).order_by('-quantity')[:10]),
+        ('pending count', rollups.filter(status=WorkRecord.Status.PENDING, is_paid=False).order_by().values(
+            'tenant').annotate(count=Sum('record_count'))),
+    ]
+    if employee is not None:
+        mine = WorkRecord.objects.filter(tenant=tenant, employee=employee)
+        queries += [
+            ('worker work records', mine.filter(is_paid=False, work_date=today).order_by(
+                *WORK_RECORD_ORDERING)[:KEYSET_PAGE_SIZE + 1]),
+            ('worker work records (all)', mine.order_by(*WORK_RECORD_ORDERING)[:KEYSET_PAGE_SIZE + 1]),
+            ('worker recent tasks', mine.filter(is_paid=False).order_by('-created_at')[:5]),
+            ('worker payroll cutoff', mine.filter(is_paid=False, work_date__lte=today).order_by(
+                'id').values_list('id', flat=True)[:1000]),
+            ('worker statistics', DailyProductionRollup.objects.filter(
+                employee=employee, work_date__gte=today.replace(day=1), is_paid=False,
+            ).values('work_date').annotate(tasks=Sum('record_count'))),
+        ]
+    return queries
+
+
+def plan_nodes(plan):
+    """Yield a plan node and all nodes below it."""
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+def audited_table(relation):
+    """The audited table a relation is, or is a partition of, or None."""
+    if relation in AUDITED_TABLES:
+        return relation
+    if relation and (PARTITION_PATTERN.match(relation) or relation == DEFAULT_PARTITION):
+        return WorkRecord._meta.db_table
+    return None
+
+
+def parent_indexes():
+    """{partition index name: name of the index it is a partition of}"""
+    with connection.cursor() as cursor:
+        cursor.execute(PARENT_INDEXES_SQL)
+        return dict(cursor.fetchall())
+
+
+def explain(queryset, analyze=False, index_parents=None):
+    """
+    EXPLAIN a queryset.
+    
+    Partition indexes are reported by their name in index_parents
+    (default: parent_indexes()).
+    
+    Returns:
+        dict with total_cost, seq_scans (audited tables read sequentially),
+        indexes (indexes used) and, with analyze, the execution time in ms
+    """
+    options = {'format': 'json'}
+    if analyze:
+        options.update(analyze=True, buffers=True)
+    if index_parents is None:
+        index_parents = parent_indexes()
+    result = json.loads(queryset.explain(**options))[0]
+    plan = result['Plan']
+    nodes = list(plan_nodes(plan))
+    return {
+        'total_cost': plan['Total Cost'],
+        'seq_scans': sorted({
+            audited_table(node.get('Relation Name')) for node in nodes
+            if node['Node Type'] == 'Seq Scan' and audited_table(node.get('Relation Name'))
+        }),
+        'indexes': sorted({
+            index_parents.get(node['Index Name'], node['Index Name']) for node in nodes if 'Index Name' in node
+        }),
+        'execution_ms': result.get('Execution Time'),
+    }
+
+
+def unused_indexes(tables=AUDITED_TABLES):
+    """(table, index, size in bytes) of never scanned non-unique indexes."""
+    with connection.cursor() as cursor:
+        cursor.execute(UNUSED_INDEXES_SQL, [list(tables)])
+        return cursor.fetchall()
@@ -0,0 +1,70 @@
+"""
+Management command to check the work record hot queries against the indexes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from apps.tasks.index_audit import explain, hot_queries, parent_indexes, unused_indexes
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the work record hot queries and report sequential scans and '
+        'unused indexes (PostgreSQL, production-sized data)'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Tenant slug (default: the tenant with the most work records)')
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run the queries (EXPLAIN ANALYZE) and show execution times',
+        )
+    
+    def handle(self, *args, **options):
+        """Audit indexes."""
+        
+        if connection.vendor != 'postgresql':
+            raise CommandError('The index audit needs PostgreSQL')
+        
+        if options['tenant']:
+            try:
+                tenant = Tenant.objects.get(slug=options['tenant'])
+            except Tenant.DoesNotExist:
+                raise CommandError(f'Tenant not found: {options["tenant"]}')
+        else:
+            tenant = Tenant.objects.annotate(
+                records=Count('work_records')
+            ).order_by('-records').first()
+            if tenant is None:
+                raise CommandError('No tenants to audit')
+        
+        self.stdout.write(f'Hot queries of {tenant.name}:')
+        seq_scans = 0
+        index_parents = parent_indexes()
+        for name, queryset in hot_queries(tenant):
+            plan = explain(queryset, analyze=options['analyze'], index_parents=index_parents)
+            timing = f', {plan["execution_ms"]:.2f} ms' if plan['execution_ms'] is not None else ''
+            detail = f'cost {plan["total_cost"]:.0f}{timing}; indexes: {", ".join(plan["indexes"]) or "-"}'
+            if plan['seq_scans']:
+                seq_scans += 1
+                self.stdout.write(self.style.WARNING(
+                    f'⚠️  {name}: Seq Scan on {", ".join(plan["seq_scans"])} ({detail})'
+                ))
+            else:
+                self.stdout.write(f'✅ {name} ({detail})')
+        
+        unused = unused_indexes()
+        if unused:
+            self.stdout.write('\nIndexes never scanned since the last statistics reset:')
+            for table, index, size in unused:
+                self.stdout.write(self.style.WARNING(f'⚠️  {table}.{index} ({size // 1024} KiB)'))
+        
+        summary = f'{seq_scans} sequential scans, {len(unused)} unused indexes'
+        if seq_scans or unused:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {summary}'))
@@ -0,0 +1,73 @@
+"""
+Management command to generate production-scale synthetic data.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.synthetic import generate_tenant
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic tenants with staff, catalog and work record history for benchmarks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=1, help='Number of tenants (default: 1)')
+        parser.add_argument('--employees', type=int, default=100, help='Employees per tenant (default: 100)')
+        parser.add_argument('--products', type=int, default=20, help='Products per tenant (default: 20)')
+        parser.add_argument('--tasks', type=int, default=12, help='Tasks per tenant (default: 12)')
+        parser.add_argument('--days', type=int, default=365, help='Days of history ending today (default: 365)')
+        parser.add_argument('--records-per-day', type=int, default=4,
+                            help='Average records per present worker and day (default: 4)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--prefix', default='load',
+                            help='Prefix of generated tenant slugs, usernames and codes (default: load)')
+        parser.add_argument('--chunk-size', type=int, default=10000,
+                            help='Work records inserted per transaction (default: 10000)')
+    
+    def handle(self, *args, **options):
+        """Generate the tenants one by one."""
+        
+        for name in ('tenants', 'employees', 'products', 'tasks', 'days', 'records_per_day', 'chunk_size'):
+            if options[name] < 1:
+                raise CommandError(f'--{name.replace("_", "-")} must be at least 1')
+        
+        prefix = options['prefix']
+        if Tenant.objects.filter(slug__startswith=f'{prefix}-').exists():
+            raise CommandError(f'Synthetic tenants with prefix "{prefix}" already exist, use another --prefix')
+        
+        started = time.monotonic()
+        total_records = 0
+        
+        def progress(tenant, written):
+            self.stdout.write(f'   {tenant.name}: {written} work records...')
+        
+        for index in range(1, options['tenants'] + 1):
+            result = generate_tenant(
+                index,
+                employees=options['employees'],
+                products=options['products'],
+                tasks=options['tasks'],
+                days=options['days'],
+                records_per_day=options['records_per_day'],
+                seed=options['seed'],
+                prefix=prefix,
+                chunk_size=options['chunk_size'],
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+            total_records += result['work_records']
+            self.stdout.write(
+                f'🏭 {result["tenant"].name} ({result["tenant"].slug}): '
+                f'{result["employees"]} employees, {result["work_records"]} work records, '
+                f'{result["rollup_rows"]} rollup rows'
+            )
+        
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Generated {options["tenants"]} tenants with {total_records} work records '
+                f'in {elapsed:.1f}s ({total_records / max(elapsed, 0.001):.0f} records/s)'
+            )
+        )
@@ -0,0 +1,32 @@
+"""
+Management command to rebuild employee earnings ledgers from the production rollups.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.earnings import rebuild_earnings
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Rebuild EmployeeEarnings ledgers from the production rollups'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Tenant slug (default: all tenants)')
+    
+    def handle(self, *args, **options):
+        """Rebuild ledgers."""
+        
+        tenant = None
+        if options['tenant']:
+            try:
+                tenant = Tenant.objects.get(slug=options['tenant'])
+            except Tenant.DoesNotExist:
+                raise CommandError(f'Tenant not found: {options["tenant"]}')
+        
+        written = rebuild_earnings(tenant=tenant)
+        
+        scope = tenant.name if tenant else 'all tenants'
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Rebuilt {written} employee earnings ledgers for {scope}')
+        )
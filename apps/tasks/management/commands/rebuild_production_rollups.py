@@ -0,0 +1,42 @@
+"""
+Management command to rebuild daily production rollups from work records.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.rollups import rebuild_rollups
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = 'Rebuild DailyProductionRollup rows from work records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenant', help='Tenant slug (default: all tenants)')
+        parser.add_argument('--start-date', help='First work date to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end-date', help='Last work date to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        """Rebuild rollups."""
+        
+        tenant = None
+        if options['tenant']:
+            try:
+                tenant = Tenant.objects.get(slug=options['tenant'])
+            except Tenant.DoesNotExist:
+                raise CommandError(f'Tenant not found: {options["tenant"]}')
+        
+        try:
+            start_date = date.fromisoformat(options['start_date']) if options['start_date'] else None
+            end_date = date.fromisoformat(options['end_date']) if options['end_date'] else None
+        except ValueError as exc:
+            raise CommandError(f'Invalid date: {exc}')
+        
+        written = rebuild_rollups(tenant=tenant, start_date=start_date, end_date=end_date)
+        
+        scope = tenant.name if tenant else 'all tenants'
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ Rebuilt {written} rollup rows for {scope}')
+        )
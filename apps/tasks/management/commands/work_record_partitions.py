@@ -0,0 +1,63 @@
+"""
+Management command to maintain the monthly work_records partitions.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.partitions import (
+    archive_partitions,
+    archived_months,
+    attached_months,
+    drop_archived_partitions,
+    ensure_partitions,
+    is_partitioned,
+)
+
+
+def _month(value):
+    return date.fromisoformat(f'{value}-01')
+
+
+class Command(BaseCommand):
+    help = (
+        'Create the missing work_records month partitions, archive fully paid '
+        'months and drop old archives (PostgreSQL)'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First month to create partitions from (YYYY-MM, default: this month)')
+        parser.add_argument(
+            '--archive-before',
+            help='Detach the fully paid partitions of the months before this one (YYYY-MM)',
+        )
+        parser.add_argument(
+            '--drop-archived-before',
+            help='Drop the archived months before this one (YYYY-MM); their records are deleted',
+        )
+    
+    def handle(self, *args, **options):
+        """Maintain partitions."""
+        
+        if not is_partitioned():
+            raise CommandError('work_records is not partitioned (PostgreSQL, migration 0008)')
+        
+        try:
+            start = _month(options['start']) if options['start'] else None
+            archive_before = _month(options['archive_before']) if options['archive_before'] else None
+            drop_before = _month(options['drop_archived_before']) if options['drop_archived_before'] else None
+        except ValueError as exc:
+            raise CommandError(f'Invalid month: {exc}')
+        
+        created = ensure_partitions(start=start, end=date.today())
+        archived = archive_partitions(archive_before) if archive_before else []
+        dropped = drop_archived_partitions(drop_before) if drop_before else []
+        
+        for label, months in (('Attached', attached_months()), ('Archived', archived_months())):
+            listed = ', '.join(f'{month:%Y-%m}' for month in months) or '-'
+            self.stdout.write(f'{label}: {listed}')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Created {len(created)}, archived {len(archived)} and dropped {len(dropped)} partitions'
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:41
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+        ('tasks', '0002_add_payment_fields'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('cutoff_date', models.DateField(help_text='Unpaid records on or before this date are marked as paid', verbose_name='Cutoff Date')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20, verbose_name='Status')),
+                ('expected_count', models.PositiveIntegerField(default=0, help_text='Number of unpaid records matching the batch when it started', verbose_name='Expected Records')),
+                ('processed_count', models.PositiveIntegerField(default=0, verbose_name='Processed Records')),
+                ('total_quantity', models.PositiveIntegerField(default=0, verbose_name='Total Quantity')),
+                ('total_payment', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Payment')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed At')),
+            ],
+            options={
+                'verbose_name': 'Payout Batch',
+                'verbose_name_plural': 'Payout Batches',
+                'db_table': 'payout_batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='payoutbatch',
+            name='employee',
+            field=models.ForeignKey(blank=True, help_text='Only records of this employee are closed (empty = all employees)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payout_batches', to='employees.employee', verbose_name='Employee'),
+        ),
+        migrations.AddField(
+            model_name='payoutbatch',
+            name='paid_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_payout_batches', to='employees.employee', verbose_name='Paid By'),
+        ),
+        migrations.AddField(
+            model_name='payoutbatch',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payout_batches', to='tenants.tenant', verbose_name='Tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='payoutbatch',
+            index=models.Index(fields=['tenant', 'created_at'], name='payout_batc_tenant__a40e7d_idx'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:44
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_rollups(apps, schema_editor):
+    WorkRecord = apps.get_model('tasks', 'WorkRecord')
+    DailyProductionRollup = apps.get_model('tasks', 'DailyProductionRollup')
+    dimensions = ('tenant_id', 'work_date', 'employee_id', 'product_id', 'task_id', 'status', 'is_paid')
+
+    rows = WorkRecord.objects.order_by().values(*dimensions).annotate(
+        count=Count('id'),
+        quantity=Sum('quantity'),
+        payment=Sum('total_payment'),
+    )
+    DailyProductionRollup.objects.bulk_create(
+        (
+            DailyProductionRollup(
+                record_count=row['count'],
+                total_quantity=row['quantity'] or 0,
+                total_payment=row['payment'] or 0,
+                **{field: row[field] for field in dimensions}
+            )
+            for row in rows.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+        ('products', '0002_initial'),
+        ('tasks', '0003_payoutbatch'),
+        ('tenants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProductionRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('work_date', models.DateField(verbose_name='Work Date')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('rejected', 'Rejected'), ('approved', 'Approved')], max_length=20, verbose_name='Status')),
+                ('is_paid', models.BooleanField(default=False, verbose_name='Is Paid')),
+                ('record_count', models.PositiveIntegerField(default=0, verbose_name='Record Count')),
+                ('total_quantity', models.PositiveIntegerField(default=0, verbose_name='Total Quantity')),
+                ('total_payment', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Payment')),
+            ],
+            options={
+                'verbose_name': 'Daily Production Rollup',
+                'verbose_name_plural': 'Daily Production Rollups',
+                'db_table': 'daily_production_rollups',
+                'ordering': ['-work_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='dailyproductionrollup',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_rollups', to='employees.employee', verbose_name='Employee'),
+        ),
+        migrations.AddField(
+            model_name='dailyproductionrollup',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_rollups', to='products.product', verbose_name='Product'),
+        ),
+        migrations.AddField(
+            model_name='dailyproductionrollup',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_rollups', to='tasks.task', verbose_name='Task'),
+        ),
+        migrations.AddField(
+            model_name='dailyproductionrollup',
+            name='tenant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='production_rollups', to='tenants.tenant', verbose_name='Tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyproductionrollup',
+            index=models.Index(fields=['employee', 'work_date'], name='daily_produ_employe_de4ee8_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyproductionrollup',
+            constraint=models.UniqueConstraint(fields=('tenant', 'work_date', 'employee', 'product', 'task', 'status', 'is_paid'), name='unique_daily_production_rollup'),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
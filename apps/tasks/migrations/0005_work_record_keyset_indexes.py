@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_dailyproductionrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workrecord',
+            index=models.Index(fields=['tenant', 'work_date', 'created_at', 'id'], name='work_record_tenant__c9a399_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workrecord',
+            index=models.Index(fields=['employee', 'work_date', 'created_at', 'id'], name='work_record_employe_10da0b_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:40
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_earnings(apps, schema_editor):
+    WorkRecord = apps.get_model('tasks', 'WorkRecord')
+    EmployeeEarnings = apps.get_model('tasks', 'EmployeeEarnings')
+    earning = Q(status__in=['completed', 'approved'])
+    
+    rows = WorkRecord.objects.order_by().annotate(month=TruncMonth('work_date')).values(
+        'tenant_id', 'employee_id', 'month',
+    ).annotate(
+        count=Count('id'),
+        earnings=Sum('total_payment', filter=earning),
+        unpaid=Sum('total_payment', filter=earning & Q(is_paid=False)),
+        days=Count('work_date', distinct=True, filter=earning),
+    )
+    ledgers = {}
+    for row in rows.iterator(chunk_size=1000):
+        ledger = ledgers.setdefault(row['employee_id'], EmployeeEarnings(
+            tenant_id=row['tenant_id'],
+            employee_id=row['employee_id'],
+            total_earnings=Decimal('0'),
+            unpaid_balance=Decimal('0'),
+            current_month_earnings=Decimal('0'),
+        ))
+        ledger.record_count += row['count']
+        ledger.total_earnings += row['earnings'] or 0
+        ledger.unpaid_balance += row['unpaid'] or 0
+        ledger.working_days += row['days']
+        if row['earnings'] and (ledger.current_month is None or row['month'] > ledger.current_month):
+            ledger.current_month = row['month']
+            ledger.current_month_earnings = row['earnings']
+    EmployeeEarnings.objects.bulk_create(ledgers.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0001_initial'),
+        ('tasks', '0005_work_record_keyset_indexes'),
+        ('tenants', '0001_initial'),
+    ]
+    
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeEarnings',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+                ('record_count', models.PositiveIntegerField(default=0, help_text='Work records of any status', verbose_name='Record Count')),
+                ('total_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Earnings')),
+                ('unpaid_balance', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Unpaid Balance')),
+                ('working_days', models.PositiveIntegerField(default=0, help_text='Work dates with earnings', verbose_name='Working Days')),
+                ('current_month', models.DateField(blank=True, help_text='First day of the latest month with earnings', null=True, verbose_name='Current Month')),
+                ('current_month_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Current Month Earnings')),
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='earnings', to='employees.employee', verbose_name='Employee')),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='employee_earnings', to='tenants.tenant', verbose_name='Tenant')),
+            ],
+            options={
+                'verbose_name': 'Employee Earnings',
+                'verbose_name_plural': 'Employee Earnings',
+                'db_table': 'employee_earnings',
+            },
+        ),
+        migrations.RunPython(populate_earnings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:30
+
+from django.db import migrations, models
+
+from core.db import AddIndexConcurrently, RemoveIndexConcurrently
+
+# Replaced by the indexes below or by the foreign key indexes
+REPLACED_INDEXES = [
+    'work_record_tenant__631c03_idx',
+    'work_record_employe_c8bd98_idx',
+    'work_record_status_767f67_idx',
+    'work_record_work_da_6a216a_idx',
+    'work_record_product_fc83e8_idx',
+    'work_record_tenant__c95c8b_idx',
+    'work_record_tenant__1bbaed_idx',
+    'work_record_is_paid_idx',
+    'work_record_tenant__is_paid_idx',
+    'work_record_employe_is_paid_idx',
+]
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0006_employeeearnings'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='workrecord',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['tenant', 'work_date', 'status'], include=('quantity', 'total_payment', 'created_at'), name='work_record_unpaid_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='workrecord',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['employee', 'work_date', 'status'], include=('quantity', 'total_payment'), name='work_record_emp_unpaid_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='workrecord',
+            index=models.Index(condition=models.Q(('is_paid', False), ('status', 'pending')), fields=['tenant', 'work_date', 'created_at'], name='work_record_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='workrecord',
+            index=models.Index(fields=['tenant', 'updated_at'], name='work_record_tenant_upd_idx'),
+        ),
+    ] + [
+        RemoveIndexConcurrently(model_name='workrecord', name=name)
+        for name in REPLACED_INDEXES
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:10
+
+from datetime import date
+
+from django.db import migrations
+
+# Month partitions created after the current month
+PARTITIONS_AHEAD = 3
+
+TABLE = 'work_records'
+OLD_TABLE = 'work_records_rebuild'
+
+INDEXES_SQL = '''
+    SELECT pg_get_indexdef(indexrelid) FROM pg_index
+    WHERE indrelid = to_regclass(%s) AND NOT indisprimary
+'''
+
+FOREIGN_KEYS_SQL = '''
+    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE conrelid = to_regclass(%s) AND contype = 'f'
+'''
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rebuild_table(schema_editor, partitioned):
+    """
+    Recreate work_records as a partitioned (or plain) table with the same
+    columns, indexes and foreign keys, and copy the rows over.
+    """
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(INDEXES_SQL, [TABLE])
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(FOREIGN_KEYS_SQL, [TABLE])
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT MIN(work_date) FROM {quote(TABLE)}')
+        first_day = cursor.fetchone()[0]
+
+        schema_editor.execute(f'ALTER TABLE {quote(TABLE)} RENAME TO {quote(OLD_TABLE)}')
+        schema_editor.execute(
+            f'CREATE TABLE {quote(TABLE)} (LIKE {quote(OLD_TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            + (' PARTITION BY RANGE (work_date)' if partitioned else '')
+        )
+
+        if partitioned:
+            schema_editor.execute(f'CREATE TABLE {quote(TABLE + "_default")} PARTITION OF {quote(TABLE)} DEFAULT')
+            month = (first_day or date.today()).replace(day=1)
+            last = _add_months(date.today().replace(day=1), PARTITIONS_AHEAD)
+            while month <= last:
+                schema_editor.execute(
+                    f'CREATE TABLE {quote(f"{TABLE}_{month:%Y_%m}")} PARTITION OF {quote(TABLE)} '
+                    f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+                )
+                month = _add_months(month, 1)
+
+        schema_editor.execute(f'INSERT INTO {quote(TABLE)} SELECT * FROM {quote(OLD_TABLE)}')
+        # Also drops the partitions of a partitioned table
+        schema_editor.execute(f'DROP TABLE {quote(OLD_TABLE)}')
+
+        # The old table's index and constraint names are free again
+        primary_key = '(id, work_date)' if partitioned else '(id)'
+        schema_editor.execute(
+            f'ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(TABLE + "_pkey")} PRIMARY KEY {primary_key}'
+        )
+        for definition in indexes:
+            # Read before the rename, so they name work_records
+            schema_editor.execute(definition)
+        for name, definition in foreign_keys:
+            schema_editor.execute(f'ALTER TABLE {quote(TABLE)} ADD CONSTRAINT {quote(name)} {definition}')
+
+
+def partition_work_records(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        _rebuild_table(schema_editor, partitioned=True)
+
+
+def unpartition_work_records(apps, schema_editor):
+    # Archived (detached) partitions are left as they are
+    if schema_editor.connection.vendor == 'postgresql':
+        _rebuild_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_work_record_index_redesign'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_work_records, unpartition_work_records),
+    ]
@@ -4,7 +4,12 @@ Task models for SEW-TRACK.
 Tasks represent operations that can be performed on products.
 """
 
-from django.db import models
+import uuid
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from core.models import TimeStampedModel
 
 
@@ -86,6 +91,99 @@ class Task(TimeStampedModel):
         return self.name_uz if language == 'uz' else self.name_ru
 
 
+class WorkRecordQuerySet(models.QuerySet):
+    """
+    QuerySet for WorkRecord with set-based status transitions and facets.
+    
+    Bulk transitions only touch pending, unpaid records in the current
+    queryset (filter by tenant first) and run as one UPDATE inside a
+    transaction.
+    """
+    
+    def facet_counts(self):
+        """
+        Totals and status / payment breakdown of this queryset, in one query.
+        
+        Returns:
+            dict with total, one count per status (pending, completed,
+            rejected, approved), paid, unpaid, total_quantity and
+            total_payment
+        """
+        status_counts = {
+            status: models.Count('id', filter=models.Q(status=status))
+            for status in self.model.Status.values
+        }
+        # total_payment is named like a field, so it must come last
+        return self.order_by().aggregate(
+            total=models.Count('id'),
+            **status_counts,
+            paid=models.Count('id', filter=models.Q(is_paid=True)),
+            unpaid=models.Count('id', filter=models.Q(is_paid=False)),
+            total_quantity=Coalesce(models.Sum('quantity'), models.Value(0)),
+            total_payment=Coalesce(
+                models.Sum('total_payment'),
+                models.Value(Decimal('0')),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+    
+    def pending_unpaid(self):
+        """Records that can still be approved or rejected."""
+        return self.filter(status=self.model.Status.PENDING, is_paid=False)
+    
+    def _bulk_transition(self, record_ids, **changes):
+        """
+        Apply field changes to all eligible records among record_ids.
+        
+        Returns:
+            dict with 'accepted' and 'rejected' lists of record IDs (str)
+        """
+        requested = []
+        rejected = []
+        for record_id in record_ids:
+            try:
+                requested.append(uuid.UUID(str(record_id)))
+            except ValueError:
+                rejected.append(str(record_id))
+        
+        accepted = []
+        if requested:
+            with transaction.atomic():
+                eligible = self.pending_unpaid().filter(id__in=requested)
+                accepted = list(
+                    eligible.order_by().select_for_update().values_list('id', flat=True)
+                )
+                if accepted:
+                    from .rollups import apply_queryset_change
+                    
+                    records = self.model.objects.filter(id__in=accepted)
+                    apply_queryset_change(records, **changes)
+                    records.update(updated_at=timezone.now(), **changes)
+        
+        accepted_set = set(accepted)
+        rejected += [str(record_id) for record_id in requested if record_id not in accepted_set]
+        return {
+            'accepted': [str(record_id) for record_id in accepted],
+            'rejected': rejected,
+        }
+    
+    def bulk_approve(self, record_ids, approved_by):
+        """Approve all pending, unpaid records among record_ids."""
+        return self._bulk_transition(
+            record_ids,
+            status=self.model.Status.APPROVED,
+            approved_by=approved_by,
+            approved_at=timezone.now(),
+        )
+    
+    def bulk_reject(self, record_ids, reason=''):
+        """Reject all pending, unpaid records among record_ids."""
+        changes = {'status': self.model.Status.REJECTED}
+        if reason:
+            changes['notes'] = f"Rad etildi: {reason}"
+        return self._bulk_transition(record_ids, **changes)
+
+
 class WorkRecord(TimeStampedModel):
     """
     WorkRecord model - daily work records from employees.
@@ -197,22 +295,44 @@ class WorkRecord(TimeStampedModel):
         help_text='Employee (Master/Owner) who marked this as paid'
     )
     
+    objects = WorkRecordQuerySet.as_manager()
+    
     class Meta:
+        # Partitioned by month of work_date on PostgreSQL (see partitions.py)
         db_table = 'work_records'
         verbose_name = 'Work Record'
         verbose_name_plural = 'Work Records'
         ordering = ['-work_date', '-created_at']
+        # Hot queries filter a tenant (or employee) and open work; see
+        # the audit_indexes command. The tenant, employee, product, task
+        # and user foreign keys have their own indexes.
         indexes = [
-            models.Index(fields=['tenant']),
-            models.Index(fields=['employee', 'work_date']),
-            models.Index(fields=['status']),
-            models.Index(fields=['work_date']),
-            models.Index(fields=['product', 'task']),
-            models.Index(fields=['tenant', 'status']),
-            models.Index(fields=['tenant', 'work_date']),
-            models.Index(fields=['is_paid']),
-            models.Index(fields=['tenant', 'is_paid']),
-            models.Index(fields=['employee', 'is_paid']),
+            # Keyset pagination: (work_date, created_at, id) newest first;
+            # also serves tenant / employee filters by date
+            models.Index(fields=['tenant', 'work_date', 'created_at', 'id']),
+            models.Index(fields=['employee', 'work_date', 'created_at', 'id']),
+            # Unpaid work by day: lists, payroll cutoffs and the hourly
+            # chart, with its totals read from the index
+            models.Index(
+                fields=['tenant', 'work_date', 'status'],
+                include=['quantity', 'total_payment', 'created_at'],
+                condition=models.Q(is_paid=False),
+                name='work_record_unpaid_idx',
+            ),
+            models.Index(
+                fields=['employee', 'work_date', 'status'],
+                include=['quantity', 'total_payment'],
+                condition=models.Q(is_paid=False),
+                name='work_record_emp_unpaid_idx',
+            ),
+            # Approval queue
+            models.Index(
+                fields=['tenant', 'work_date', 'created_at'],
+                condition=models.Q(status='pending', is_paid=False),
+                name='work_record_pending_idx',
+            ),
+            # Recently approved / rejected records (master dashboard)
+            models.Index(fields=['tenant', 'updated_at'], name='work_record_tenant_upd_idx'),
         ]
     
     def __str__(self):
@@ -295,4 +415,260 @@ class WorkRecord(TimeStampedModel):
         self.is_paid = False
         self.paid_at = None
         self.paid_by = None
-        self.save(update_fields=['is_paid', 'paid_at', 'paid_by', 'updated_at'])
\ No newline at end of file
+        self.save(update_fields=['is_paid', 'paid_at', 'paid_by', 'updated_at'])
+
+class PayoutBatch(TimeStampedModel):
+    """
+    PayoutBatch model - one payroll close operation.
+    
+    Records who marked work records as paid, up to which date and the
+    totals that were closed. Records are marked paid in chunks, so
+    processed_count shows progress while the batch is running.
+    """
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+    
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='payout_batches',
+        verbose_name='Tenant'
+    )
+    employee = models.ForeignKey(
+        'employees.Employee',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='payout_batches',
+        verbose_name='Employee',
+        help_text='Only records of this employee are closed (empty = all employees)'
+    )
+    cutoff_date = models.DateField(
+        verbose_name='Cutoff Date',
+        help_text='Unpaid records on or before this date are marked as paid'
+    )
+    paid_by = models.ForeignKey(
+        'employees.Employee',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='closed_payout_batches',
+        verbose_name='Paid By'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Status'
+    )
+    expected_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Expected Records',
+        help_text='Number of unpaid records matching the batch when it started'
+    )
+    processed_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Processed Records'
+    )
+    total_quantity = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total Quantity'
+    )
+    total_payment = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Total Payment'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Error'
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Completed At'
+    )
+    
+    class Meta:
+        db_table = 'payout_batches'
+        verbose_name = 'Payout Batch'
+        verbose_name_plural = 'Payout Batches'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f'{self.tenant} - {self.cutoff_date} ({self.get_status_display()})'
+    
+    @property
+    def is_finished(self):
+        return self.status in [self.Status.COMPLETED, self.Status.FAILED]
+    
+    @property
+    def progress_percent(self):
+        if not self.expected_count:
+            return 100 if self.is_finished else 0
+        return min(100, int(self.processed_count * 100 / self.expected_count))
+
+
+class DailyProductionRollup(TimeStampedModel):
+    """
+    DailyProductionRollup model - pre-aggregated work record totals.
+    
+    One row per tenant, work date, employee, product, task, status and
+    payment flag. Rows are kept up to date incrementally when work records
+    are created, changed or deleted (see apps.tasks.rollups), so dashboards
+    can sum a few rows per day instead of scanning raw work records.
+    """
+    
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='production_rollups',
+        verbose_name='Tenant'
+    )
+    work_date = models.DateField(
+        verbose_name='Work Date'
+    )
+    employee = models.ForeignKey(
+        'employees.Employee',
+        on_delete=models.CASCADE,
+        related_name='production_rollups',
+        verbose_name='Employee'
+    )
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.CASCADE,
+        related_name='production_rollups',
+        verbose_name='Product'
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='production_rollups',
+        verbose_name='Task'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=WorkRecord.Status.choices,
+        verbose_name='Status'
+    )
+    is_paid = models.BooleanField(
+        default=False,
+        verbose_name='Is Paid'
+    )
+    record_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Record Count'
+    )
+    total_quantity = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Total Quantity'
+    )
+    total_payment = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Total Payment'
+    )
+    
+    class Meta:
+        db_table = 'daily_production_rollups'
+        verbose_name = 'Daily Production Rollup'
+        verbose_name_plural = 'Daily Production Rollups'
+        ordering = ['-work_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant', 'work_date', 'employee', 'product', 'task', 'status', 'is_paid'],
+                name='unique_daily_production_rollup'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['employee', 'work_date']),
+        ]
+    
+    def __str__(self):
+        return f'{self.work_date} - {self.employee_id} ({self.record_count})'
+
+
+class EmployeeEarnings(TimeStampedModel):
+    """
+    EmployeeEarnings model - running earnings ledger of an employee.
+    
+    One row per employee, updated incrementally together with the
+    production rollups (see apps.tasks.earnings), so an employee's
+    statistics are a single row read. Earnings are the payments of
+    completed and approved work records.
+    """
+    
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        on_delete=models.CASCADE,
+        related_name='employee_earnings',
+        verbose_name='Tenant'
+    )
+    employee = models.OneToOneField(
+        'employees.Employee',
+        on_delete=models.CASCADE,
+        related_name='earnings',
+        verbose_name='Employee'
+    )
+    record_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Record Count',
+        help_text='Work records of any status'
+    )
+    total_earnings = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Total Earnings'
+    )
+    unpaid_balance = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Unpaid Balance'
+    )
+    working_days = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Working Days',
+        help_text='Work dates with earnings'
+    )
+    current_month = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Current Month',
+        help_text='First day of the latest month with earnings'
+    )
+    current_month_earnings = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Current Month Earnings'
+    )
+    
+    class Meta:
+        db_table = 'employee_earnings'
+        verbose_name = 'Employee Earnings'
+        verbose_name_plural = 'Employee Earnings'
+    
+    def __str__(self):
+        return f'{self.employee_id} - {self.total_earnings}'
+    
+    def month_earnings(self, month):
+        """
+        Earnings of the month starting on `month`, or None if the ledger
+        cannot tell (a later month already has earnings).
+        """
+        if self.current_month is None or month > self.current_month:
+            return Decimal('0')
+        if month == self.current_month:
+            return self.current_month_earnings
+        return None
@@ -0,0 +1,245 @@
+"""
+Monthly range partitions of work_records (PostgreSQL).
+
+On PostgreSQL work_records is partitioned by work_date (migration 0008):
+one partition per month, work_records_YYYY_MM, and a default partition
+for dates without one. Its primary key is (id, work_date); Django keeps
+treating id as the primary key, but the database no longer enforces a
+unique id. Server-side IDs are random UUIDs; client-generated ones
+(offline sync) are serialized per ID by sync_work_records().
+
+ensure_partitions() creates the partitions of the coming months (run
+daily by Celery beat) or of any date range, e.g. before loading history.
+Rows already in the default partition are moved into a partition when
+it is created.
+
+Closed periods can be archived: archive_partitions() detaches month
+partitions whose records are all paid, oldest first, and renames them
+to work_records_archive_YYYY_MM (without foreign keys, so employees and
+tenants can still be deleted). Archived records leave every query;
+their totals stay in the production rollups and earnings ledgers, which
+rebuilds leave alone for archived months (archived_until()). Retention
+is then a DROP TABLE (drop_archived_partitions()), not a mass DELETE.
+
+On other databases (SQLite in tests) work_records is a plain table and
+these functions do nothing.
+"""
+
+import re
+from datetime import date
+
+import structlog
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import WorkRecord
+
+logger = structlog.get_logger(__name__)
+
+TABLE = WorkRecord._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_PATTERN = re.compile(rf'^{TABLE}_(\d{{4}})_(\d{{2}})$')
+ARCHIVE_PATTERN = re.compile(rf'^{TABLE}_archive_(\d{{4}})_(\d{{2}})$')
+
+ATTACHED_PARTITIONS_SQL = '''
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = to_regclass(%s)
+'''
+
+ARCHIVED_TABLES_SQL = '''
+    SELECT relname FROM pg_class
+    WHERE relkind = 'r' AND relname LIKE %s AND relnamespace = current_schema()::regnamespace
+'''
+
+FOREIGN_KEYS_SQL = '''
+    SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'
+'''
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_{month:%Y_%m}'
+
+
+def archive_name(month):
+    return f'{TABLE}_archive_{month:%Y_%m}'
+
+
+def _month_of(name, pattern):
+    match = pattern.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def is_partitioned():
+    """Whether work_records is a partitioned table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def attached_months():
+    """First days of the months with an attached partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(ATTACHED_PARTITIONS_SQL, [TABLE])
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(month for month in (_month_of(name, PARTITION_PATTERN) for name in names) if month)
+
+
+def archived_months():
+    """First days of the archived (detached) months, oldest first."""
+    if connection.vendor != 'postgresql':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(ARCHIVED_TABLES_SQL, [f'{TABLE}\\_archive\\_%'])
+        names = [row[0] for row in cursor.fetchall()]
+    return sorted(month for month in (_month_of(name, ARCHIVE_PATTERN) for name in names) if month)
+
+
+def archived_until():
+    """
+    First work date after the archived months, or None.
+    
+    Records before it are archived, so rollups and ledgers must not be
+    recomputed from work records for those dates.
+    """
+    months = archived_months()
+    return add_months(months[-1], 1) if months else None
+
+
+def _create_partition(cursor, month):
+    """Create the partition of a month, moving its rows out of the default partition."""
+    name = partition_name(month)
+    start, end = month, add_months(month, 1)
+    quote = connection.ops.quote_name
+    # DDL takes no query parameters; the bounds are dates we computed
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} WHERE work_date >= %s AND work_date < %s)',
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f'CREATE TABLE {quote(name)} PARTITION OF {quote(TABLE)} {bounds}')
+        return 0
+    
+    # A partition cannot be created over rows in the default partition:
+    # build it as a table, move the rows and attach it
+    cursor.execute(f'CREATE TABLE {quote(name)} (LIKE {quote(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {quote(DEFAULT_PARTITION)} WHERE work_date >= %s AND work_date < %s '
+        f'RETURNING *) INSERT INTO {quote(name)} SELECT * FROM moved',
+        [start, end],
+    )
+    moved = cursor.rowcount
+    cursor.execute(f'ALTER TABLE {quote(TABLE)} ATTACH PARTITION {quote(name)} {bounds}')
+    return moved
+
+
+def ensure_partitions(start=None, end=None, months_ahead=None):
+    """
+    Create the missing month partitions from start to end.
+    
+    Args:
+        start: first date to cover (default: today)
+        end: last date to cover (default: start)
+        months_ahead: months after end to cover as well
+            (default: WORK_RECORD_PARTITIONS_AHEAD)
+    
+    Returns:
+        First days of the months whose partition was created
+    """
+    if not is_partitioned():
+        return []
+    if months_ahead is None:
+        months_ahead = settings.WORK_RECORD_PARTITIONS_AHEAD
+    first = month_start(start or date.today())
+    last = add_months(month_start(end or first), months_ahead)
+    
+    existing = set(attached_months()) | set(archived_months())
+    created = []
+    month = first
+    while month <= last:
+        if month not in existing:
+            with transaction.atomic(), connection.cursor() as cursor:
+                moved = _create_partition(cursor, month)
+            logger.info('work_records.partition_created', partition=partition_name(month), moved=moved)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
+
+
+def archive_partitions(before):
+    """
+    Detach the fully paid month partitions before a month, oldest first.
+    
+    Stops at the first month that still has unpaid records (or records in
+    the default partition), so the archive stays a contiguous range of
+    closed months.
+    
+    Returns:
+        First days of the archived months
+    """
+    if not is_partitioned():
+        return []
+    quote = connection.ops.quote_name
+    archived = []
+    for month in attached_months():
+        if month >= month_start(before):
+            break
+        name = partition_name(month)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {quote(name)} WHERE NOT is_paid)')
+            if cursor.fetchone()[0]:
+                logger.info('work_records.archive_stopped', partition=name, reason='unpaid records')
+                break
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {quote(DEFAULT_PARTITION)} WHERE work_date < %s)',
+                [add_months(month, 1)],
+            )
+            if cursor.fetchone()[0]:
+                logger.warning('work_records.archive_stopped', partition=name, reason='rows in default partition')
+                break
+            cursor.execute(f'ALTER TABLE {quote(TABLE)} DETACH PARTITION {quote(name)}')
+            cursor.execute(f'ALTER TABLE {quote(name)} RENAME TO {quote(archive_name(month))}')
+            # Archives are snapshots: deleting an employee or tenant must not
+            # fail on (or cascade into) archived records
+            cursor.execute(FOREIGN_KEYS_SQL, [archive_name(month)])
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(
+                    f'ALTER TABLE {quote(archive_name(month))} DROP CONSTRAINT {quote(constraint)}'
+                )
+        logger.info('work_records.partition_archived', partition=name, archive=archive_name(month))
+        archived.append(month)
+    return archived
+
+
+def drop_archived_partitions(before):
+    """
+    Drop the archived months before a month (retention).
+    
+    Returns:
+        First days of the dropped months
+    """
+    quote = connection.ops.quote_name
+    dropped = []
+    for month in archived_months():
+        if month >= month_start(before):
+            break
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE {quote(archive_name(month))}')
+        logger.info('work_records.archive_dropped', archive=archive_name(month))
+        dropped.append(month)
+    return dropped
@@ -0,0 +1,110 @@
+"""
+Payroll close service for work records.
+
+start_payout_batch() creates a PayoutBatch for the unpaid records up to a
+cutoff date, close_payout_batch() marks them paid with chunked UPDATEs.
+Small batches are closed inline, large ones by a Celery task.
+"""
+
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import PayoutBatch, WorkRecord
+from .rollups import apply_queryset_change
+
+logger = logging.getLogger(__name__)
+
+# Records marked paid per UPDATE statement (and per transaction)
+PAYROLL_CHUNK_SIZE = 1000
+
+# Batches larger than this are closed by a Celery task instead of inline
+PAYROLL_SYNC_LIMIT = 2000
+
+
+def payout_batch_records(batch):
+    """Unpaid work records covered by a payout batch."""
+    records = WorkRecord.objects.filter(
+        tenant=batch.tenant,
+        work_date__lte=batch.cutoff_date,  # Before or on cutoff date
+        is_paid=False  # Not already paid
+    )
+    if batch.employee_id:
+        records = records.filter(employee_id=batch.employee_id)
+    return records
+
+
+def start_payout_batch(tenant, paid_by, cutoff_date, employee=None):
+    """Create a pending PayoutBatch with the number of records it will close."""
+    batch = PayoutBatch(
+        tenant=tenant,
+        employee=employee,
+        cutoff_date=cutoff_date,
+        paid_by=paid_by,
+    )
+    batch.expected_count = payout_batch_records(batch).count()
+    batch.save()
+    return batch
+
+
+def close_payout_batch(batch, chunk_size=PAYROLL_CHUNK_SIZE, on_progress=None):
+    """
+    Mark all records of a payout batch as paid.
+    
+    Each chunk is locked, updated with one UPDATE and added to the batch
+    totals in its own transaction, so no statement grows with the size of
+    the tenant and progress is visible while the batch runs. A failed batch
+    keeps the totals of the chunks already closed; running a new batch for
+    the same cutoff picks up the remaining records.
+    
+    Args:
+        batch: PayoutBatch to close
+        chunk_size: Records per UPDATE
+        on_progress: Optional callable, called with the batch after each chunk
+    """
+    batch.status = PayoutBatch.Status.RUNNING
+    batch.save(update_fields=['status', 'updated_at'])
+    
+    paid_at = timezone.now()
+    records = payout_batch_records(batch).order_by('id')
+    
+    try:
+        while True:
+            with transaction.atomic():
+                chunk = list(
+                    records.select_for_update()
+                    .values_list('id', 'quantity', 'total_payment')[:chunk_size]
+                )
+                if not chunk:
+                    break
+                
+                record_ids = [record_id for record_id, _, _ in chunk]
+                chunk_records = WorkRecord.objects.filter(id__in=record_ids)
+                apply_queryset_change(chunk_records, is_paid=True)
+                chunk_records.update(
+                    is_paid=True,
+                    paid_at=paid_at,
+                    paid_by=batch.paid_by,
+                    updated_at=timezone.now(),
+                )
+                
+                batch.processed_count += len(chunk)
+                batch.total_quantity += sum(quantity for _, quantity, _ in chunk)
+                batch.total_payment += sum(payment for _, _, payment in chunk)
+                batch.save(update_fields=['processed_count', 'total_quantity', 'total_payment', 'updated_at'])
+            
+            if on_progress:
+                on_progress(batch)
+    except Exception as exc:
+        logger.exception('Payout batch %s failed', batch.id)
+        batch.status = PayoutBatch.Status.FAILED
+        batch.error = str(exc)
+        batch.completed_at = timezone.now()
+        batch.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        return batch
+    
+    batch.status = PayoutBatch.Status.COMPLETED
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=['status', 'completed_at', 'updated_at'])
+    return batch
@@ -0,0 +1,343 @@
+"""
+Daily production rollup maintenance and queries.
+
+DailyProductionRollup holds work record totals grouped by ROLLUP_DIMENSIONS.
+Single record saves and deletes are applied through signals
+(apps.tasks.signals). Set-based UPDATEs bypass signals, so they call
+apply_queryset_change() with the same changes before running the UPDATE;
+bulk_create() callers use apply_created_records().
+
+Every rollup change sends production_changed after the transaction
+commits, so caches built from rollups can be invalidated. The same
+changes are added to the employee earnings ledgers (apps.tasks.earnings).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .earnings import apply_earnings_changes
+from .models import DailyProductionRollup, WorkRecord
+from .partitions import archived_until
+
+# Sent after commit with changed=set of (tenant_id, work_date) pairs
+production_changed = Signal()
+
+# WorkRecord fields a rollup row is grouped by
+ROLLUP_DIMENSIONS = ('tenant_id', 'work_date', 'employee_id', 'product_id', 'task_id', 'status', 'is_paid')
+
+# WorkRecord fields needed to compute a record's contribution
+ROLLUP_FIELDS = ROLLUP_DIMENSIONS + ('quantity', 'total_payment')
+
+# Rollup rows written per INSERT when rebuilding
+REBUILD_BATCH_SIZE = 1000
+
+# Statuses counted as finished work on dashboards
+DONE_STATUSES = [WorkRecord.Status.COMPLETED, WorkRecord.Status.APPROVED]
+
+
+def record_contribution(values):
+    """
+    Rollup key and (count, quantity, payment) of one work record.
+    
+    Args:
+        values: dict (or WorkRecord) with the ROLLUP_FIELDS
+    """
+    if isinstance(values, WorkRecord):
+        values = {field: getattr(values, field) for field in ROLLUP_FIELDS}
+    key = tuple(values[field] for field in ROLLUP_DIMENSIONS)
+    return key, (1, values['quantity'], Decimal(values['total_payment'] or 0))
+
+
+def _add(deltas, key, count, quantity, payment, sign=1):
+    delta = deltas[key]
+    delta[0] += sign * count
+    delta[1] += sign * quantity
+    delta[2] += sign * payment
+
+
+def _apply_rollup_delta(key, count, quantity, payment):
+    """Add one delta with an UPDATE, creating the rollup row if needed."""
+    lookup = dict(zip(ROLLUP_DIMENSIONS, key, strict=True))
+    rows = DailyProductionRollup.objects.filter(**lookup)
+    changes = {
+        'record_count': F('record_count') + count,
+        'total_quantity': F('total_quantity') + quantity,
+        'total_payment': F('total_payment') + payment,
+    }
+    
+    if rows.update(**changes) == 0 and count > 0:
+        try:
+            with transaction.atomic():
+                DailyProductionRollup.objects.create(
+                    record_count=count,
+                    total_quantity=quantity,
+                    total_payment=payment,
+                    **lookup
+                )
+        except IntegrityError:
+            # Created concurrently - add to the existing row instead
+            rows.update(**changes)
+    
+    if count < 0:
+        rows.filter(record_count__lte=0).delete()
+
+
+def _locked_rollup_rows(keys):
+    """
+    Lock and read, in one query, the rollup rows of every employee and
+    work date among the rollup keys (all products, tasks and statuses).
+    """
+    candidates = DailyProductionRollup.objects.select_for_update().filter(
+        tenant_id__in={key[0] for key in keys},
+        work_date__in={key[1] for key in keys},
+        employee_id__in={key[2] for key in keys},
+    ).order_by('id')
+    return {
+        tuple(getattr(row, field) for field in ROLLUP_DIMENSIONS): row
+        for row in candidates
+    }
+
+
+def _apply_rollup_deltas_bulk(deltas, existing):
+    """
+    Add all deltas to the locked rows with a constant number of queries.
+    
+    Rows are updated, created and deleted in bulk. Raises IntegrityError
+    when a missing row was created concurrently.
+    """
+    now = timezone.now()
+    to_update = []
+    to_create = []
+    to_delete = []
+    for key, (count, quantity, payment) in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            if count > 0:
+                to_create.append(DailyProductionRollup(
+                    record_count=count,
+                    total_quantity=quantity,
+                    total_payment=payment,
+                    **dict(zip(ROLLUP_DIMENSIONS, key, strict=True))
+                ))
+            continue
+        
+        row.record_count += count
+        row.total_quantity += quantity
+        row.total_payment += payment
+        row.updated_at = now
+        if row.record_count <= 0:
+            to_delete.append(row.id)
+        else:
+            to_update.append(row)
+    
+    if to_update:
+        DailyProductionRollup.objects.bulk_update(
+            to_update,
+            ['record_count', 'total_quantity', 'total_payment', 'updated_at'],
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+    if to_delete:
+        DailyProductionRollup.objects.filter(id__in=to_delete).delete()
+    if to_create:
+        DailyProductionRollup.objects.bulk_create(to_create, batch_size=REBUILD_BATCH_SIZE)
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add count/quantity/payment deltas to rollup rows.
+    
+    Args:
+        deltas: dict mapping rollup keys (ROLLUP_DIMENSIONS values) to
+            [count, quantity, payment] deltas
+    """
+    deltas = {
+        key: delta for key, delta in deltas.items()
+        if any(delta)
+    }
+    if not deltas:
+        return
+    
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                existing = _locked_rollup_rows(deltas)
+                counts_before = {key: row.record_count for key, row in existing.items()}
+                _apply_rollup_deltas_bulk(deltas, existing)
+        except IntegrityError:
+            # A missing row was created concurrently - apply row by row, in a
+            # fixed order so concurrent writers lock rows in the same order
+            counts_before = {key: row.record_count for key, row in _locked_rollup_rows(deltas).items()}
+            for key, delta in sorted(deltas.items(), key=lambda item: str(item[0])):
+                _apply_rollup_delta(key, *delta)
+        
+        apply_earnings_changes(
+            [(dict(zip(ROLLUP_DIMENSIONS, key, strict=True)), delta) for key, delta in deltas.items()],
+            [(dict(zip(ROLLUP_DIMENSIONS, key, strict=True)), count) for key, count in counts_before.items()],
+        )
+        
+        changed = {(key[0], key[1]) for key in deltas}
+        transaction.on_commit(
+            partial(production_changed.send, sender=DailyProductionRollup, changed=changed)
+        )
+
+
+def apply_record_change(old_values, new_values):
+    """
+    Update rollups for a single record change.
+    
+    Args:
+        old_values: ROLLUP_FIELDS before the change (None for a new record)
+        new_values: ROLLUP_FIELDS after the change (None for a deleted record)
+    """
+    deltas = defaultdict(lambda: [0, 0, Decimal('0')])
+    if old_values is not None:
+        key, contribution = record_contribution(old_values)
+        _add(deltas, key, *contribution, sign=-1)
+    if new_values is not None:
+        key, contribution = record_contribution(new_values)
+        _add(deltas, key, *contribution)
+    apply_rollup_deltas(deltas)
+
+
+def apply_created_records(records):
+    """
+    Update rollups for records inserted with bulk_create.
+    
+    Must be called in the same transaction as the INSERT.
+    """
+    deltas = defaultdict(lambda: [0, 0, Decimal('0')])
+    for record in records:
+        key, contribution = record_contribution(record)
+        _add(deltas, key, *contribution)
+    apply_rollup_deltas(deltas)
+
+
+def grouped_contributions(records):
+    """Rollup keys and totals of a work record queryset, in one grouped query."""
+    return records.order_by().values(*ROLLUP_DIMENSIONS).annotate(
+        count=Count('id'),
+        quantity=Sum('quantity'),
+        payment=Sum('total_payment'),
+    )
+
+
+def apply_queryset_change(records, **changes):
+    """
+    Update rollups for a set-based UPDATE that is about to run.
+    
+    Must be called in the same transaction as the UPDATE, before it.
+    Only changes to rollup dimensions (e.g. status, is_paid) move totals
+    between rollup rows; other changed fields are ignored.
+    
+    Args:
+        records: WorkRecord queryset the UPDATE will touch
+        **changes: field values the UPDATE sets
+    """
+    changed_dimensions = {
+        field: value for field, value in changes.items()
+        if field in ROLLUP_DIMENSIONS
+    }
+    if not changed_dimensions:
+        return
+    
+    deltas = defaultdict(lambda: [0, 0, Decimal('0')])
+    for row in grouped_contributions(records):
+        old_key = tuple(row[field] for field in ROLLUP_DIMENSIONS)
+        new_key = tuple(changed_dimensions.get(field, row[field]) for field in ROLLUP_DIMENSIONS)
+        if old_key == new_key:
+            continue
+        contribution = (row['count'], row['quantity'] or 0, row['payment'] or Decimal('0'))
+        _add(deltas, old_key, *contribution, sign=-1)
+        _add(deltas, new_key, *contribution)
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups(tenant=None, start_date=None, end_date=None):
+    """
+    Recompute rollup rows from work records.
+    
+    Deletes the rollup rows in scope and inserts fresh totals computed
+    with one grouped query, in a single transaction. Archived months have
+    no work records left, so their rollups are kept.
+    
+    Returns:
+        Number of rollup rows written
+    """
+    archived = archived_until()
+    if archived and (start_date is None or start_date < archived):
+        start_date = archived
+    
+    records = WorkRecord.objects.all()
+    rollups = DailyProductionRollup.objects.all()
+    if tenant is not None:
+        records = records.filter(tenant=tenant)
+        rollups = rollups.filter(tenant=tenant)
+    if start_date:
+        records = records.filter(work_date__gte=start_date)
+        rollups = rollups.filter(work_date__gte=start_date)
+    if end_date:
+        records = records.filter(work_date__lte=end_date)
+        rollups = rollups.filter(work_date__lte=end_date)
+    
+    written = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in grouped_contributions(records).iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(DailyProductionRollup(
+                record_count=row['count'],
+                total_quantity=row['quantity'] or 0,
+                total_payment=row['payment'] or 0,
+                **{field: row[field] for field in ROLLUP_DIMENSIONS}
+            ))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                DailyProductionRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            DailyProductionRollup.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _sum_count(condition=None):
+    return Coalesce(Sum('record_count', filter=condition), Value(0), output_field=IntegerField())
+
+
+def rollup_summary(rollups):
+    """
+    Totals of a DailyProductionRollup queryset, in one query.
+    
+    Returns:
+        dict with record_count, total_quantity, total_payment, pending_count,
+        completed_count, approved_count, rejected_count, done_count
+        (completed + approved) and employee_count
+    """
+    # Aggregates named like a field must come last: later aggregates
+    # would otherwise refer to them instead of the field.
+    return rollups.aggregate(
+        pending_count=_sum_count(Q(status=WorkRecord.Status.PENDING)),
+        completed_count=_sum_count(Q(status=WorkRecord.Status.COMPLETED)),
+        approved_count=_sum_count(Q(status=WorkRecord.Status.APPROVED)),
+        rejected_count=_sum_count(Q(status=WorkRecord.Status.REJECTED)),
+        done_count=_sum_count(Q(status__in=DONE_STATUSES)),
+        employee_count=Count('employee', distinct=True),
+        record_count=_sum_count(),
+        total_quantity=Coalesce(Sum('total_quantity'), Value(0), output_field=IntegerField()),
+        total_payment=Coalesce(
+            Sum('total_payment'),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
@@ -3,7 +3,8 @@ Serializers for Tasks app.
 """
 
 from rest_framework import serializers
-from .models import Task
+from .entry import BATCH_MAX_LINES
+from .models import Task, WorkRecord
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -47,3 +48,63 @@ class TaskListSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'code', 'name_uz', 'name_ru', 'category']
 
+
+
+class WorkRecordSerializer(serializers.ModelSerializer):
+    """Serializer for WorkRecord model."""
+    
+    employee_name = serializers.CharField(source='employee.full_name', read_only=True)
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    task_name = serializers.CharField(source='task.name_uz', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = WorkRecord
+        fields = [
+            'id', 'employee', 'employee_name', 'product', 'product_name',
+            'task', 'task_name', 'quantity', 'price_per_unit', 'total_payment',
+            'status', 'status_display', 'work_date', 'notes',
+            'approved_by', 'approved_at', 'is_paid', 'paid_at',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class WorkRecordBulkActionSerializer(serializers.Serializer):
+    """Serializer for bulk approve/reject requests."""
+    
+    record_ids = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False
+    )
+    reason = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class WorkRecordBatchSerializer(serializers.Serializer):
+    """
+    Serializer for batch work record entry requests.
+    
+    Each line has product, task, quantity and optional employee,
+    work_date and notes; lines are validated by create_work_record_batch.
+    """
+    
+    employee = serializers.UUIDField(required=False)
+    lines = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=BATCH_MAX_LINES
+    )
+
+
+class WorkRecordSyncSerializer(serializers.Serializer):
+    """
+    Serializer for offline queue sync requests.
+    
+    Each item is a batch line plus 'id', the client-generated record UUID.
+    """
+    
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=BATCH_MAX_LINES
+    )
@@ -0,0 +1,38 @@
+"""
+Signal handlers for Tasks app.
+
+Keep DailyProductionRollup in sync with single work record saves and
+deletes. Set-based UPDATEs update rollups themselves (see
+apps.tasks.rollups.apply_queryset_change).
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import WorkRecord
+from .rollups import ROLLUP_FIELDS, apply_record_change
+
+
+@receiver(pre_save, sender=WorkRecord)
+def remember_rollup_values(sender, instance, raw=False, **kwargs):
+    """Store the record's current rollup values before it is changed."""
+    instance._rollup_old_values = None
+    if raw or instance._state.adding:
+        return
+    instance._rollup_old_values = (
+        WorkRecord.objects.filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=WorkRecord)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_values = {field: getattr(instance, field) for field in ROLLUP_FIELDS}
+    apply_record_change(getattr(instance, '_rollup_old_values', None), new_values)
+
+
+@receiver(post_delete, sender=WorkRecord)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    old_values = {field: getattr(instance, field) for field in ROLLUP_FIELDS}
+    apply_record_change(old_values, None)
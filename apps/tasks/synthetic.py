@@ -0,0 +1,330 @@
+"""
+Synthetic production-scale data for benchmarks.
+
+Generates tenants with staff, a product catalog and a history of daily
+work records, e.g. 50 tenants x 500 employees x 2 years. Everything is
+written in chunks with bulk_create; work records use COPY on PostgreSQL.
+Output is deterministic for a given seed, including primary keys.
+Production rollups and earnings ledgers are rebuilt per tenant once its
+work records are written.
+
+Work records follow a working week (Monday to Saturday) with realistic
+attendance. Records older than SETTLED_AFTER_DAYS are mostly approved,
+recent ones mostly pending, and approved work is paid out every
+PAYOUT_INTERVAL_DAYS, like a workshop closing payroll twice a month.
+"""
+
+import random
+import uuid
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.employees.models import Employee
+from apps.products.models import Product, ProductTask
+from apps.tenants.models import Tenant
+
+from .earnings import rebuild_earnings
+from .models import Task, WorkRecord
+from .partitions import ensure_partitions
+from .rollups import rebuild_rollups
+
+# Password of every generated user
+SYNTHETIC_PASSWORD = 'Password123!'
+
+# One master per this many workers
+WORKERS_PER_MASTER = 25
+
+# Share of workers present on a working day
+ATTENDANCE_RATE = 0.92
+
+# Records older than this are settled (approved, rejected or completed)
+SETTLED_AFTER_DAYS = 3
+
+# Approved work before the latest payout cutoff is paid
+PAYOUT_INTERVAL_DAYS = 14
+
+# (status, weight) of settled and of recent records
+SETTLED_STATUSES = (
+    (WorkRecord.Status.APPROVED, 93),
+    (WorkRecord.Status.REJECTED, 4),
+    (WorkRecord.Status.COMPLETED, 3),
+)
+RECENT_STATUSES = (
+    (WorkRecord.Status.PENDING, 70),
+    (WorkRecord.Status.APPROVED, 25),
+    (WorkRecord.Status.REJECTED, 5),
+)
+
+FIRST_NAMES = (
+    'Shahnoza', 'Fatima', 'Dilnoza', 'Malika', 'Nodira', 'Zilola', 'Sevara',
+    'Gulnora', 'Dilfuza', 'Munira', 'Madina', 'Kamola', 'Feruza', 'Nigora',
+)
+LAST_NAMES = (
+    'Karimova', 'Alimova', 'Tursunova', 'Saidova', 'Rashidova', 'Azimova',
+    'Mahmudova', 'Yusupova', 'Hamidova', 'Aminova', 'Toshmatova', 'Ergasheva',
+)
+PRODUCT_NAMES = (
+    ('Ayollar yozgi ko\'ylagi', Product.Category.WOMENS),
+    ('Erkaklar ko\'ylagi', Product.Category.MENS),
+    ('Bolalar ko\'ylagi', Product.Category.KIDS),
+    ('Ayollar shim', Product.Category.WOMENS),
+    ('Erkaklar shim', Product.Category.MENS),
+    ('Bolalar sport kiyimi', Product.Category.KIDS),
+    ('Futbolka', Product.Category.OTHER),
+)
+# (name_uz, name_ru, category, price range in UZS)
+TASK_TEMPLATES = (
+    ('Qirqish', 'Резка', Task.Category.CUTTING, (800, 2000)),
+    ('Tikish', 'Шитье', Task.Category.SEWING, (1500, 4000)),
+    ('Yoqa tikish', 'Пошив воротника', Task.Category.SEWING, (1000, 2500)),
+    ('Yeng tikish', 'Пошив рукава', Task.Category.SEWING, (1000, 2500)),
+    ('Tugma tikish', 'Пришивка пуговиц', Task.Category.SEWING, (300, 800)),
+    ('Dazmollash', 'Глажка', Task.Category.IRONING, (400, 1000)),
+    ('Sifat nazorati', 'Контроль качества', Task.Category.QUALITY_CHECK, (300, 700)),
+    ('Qadoqlash', 'Упаковка', Task.Category.PACKAGING, (200, 600)),
+)
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices, strict=True)
+    return rng.choices(values, weights)[0]
+
+
+def _create_staff(tenant, index, employee_count, prefix, rng, start_date):
+    """Create masters and workers of a tenant with their user accounts."""
+    User = get_user_model()
+    password = make_password(SYNTHETIC_PASSWORD)
+    master_count = max(1, employee_count // WORKERS_PER_MASTER)
+    
+    users = []
+    employees = []
+    for number in range(employee_count):
+        is_master = number < master_count
+        username = f'{prefix}{index:03d}-{"m" if is_master else "w"}{number:04d}'
+        user = User(
+            id=_uuid(rng),
+            username=username,
+            email=f'{username}@example.com',
+            password=password,
+            role=User.Role.MASTER if is_master else User.Role.WORKER,
+        )
+        users.append(user)
+        employees.append(Employee(
+            id=_uuid(rng),
+            tenant=tenant,
+            user=user,
+            full_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            phone=f'+99890{rng.randrange(10 ** 7):07d}',
+            position=Employee.Position.MASTER if is_master else Employee.Position.WORKER,
+            hired_at=start_date - timedelta(days=rng.randrange(30, 1500)),
+        ))
+    
+    User.objects.bulk_create(users)
+    Employee.objects.bulk_create(employees)
+    return employees[:master_count], employees[master_count:]
+
+
+def _create_catalog(tenant, index, product_count, task_count, prefix, rng):
+    """Create products and tasks of a tenant and price every pair."""
+    tasks = []
+    for number in range(task_count):
+        name_uz, name_ru, category, _ = TASK_TEMPLATES[number % len(TASK_TEMPLATES)]
+        suffix = f' {number // len(TASK_TEMPLATES) + 1}' if number >= len(TASK_TEMPLATES) else ''
+        tasks.append(Task(
+            id=_uuid(rng),
+            tenant=tenant,
+            code=f'{prefix.upper()}{index:03d}-OP-{number + 1:03d}',
+            name_uz=name_uz + suffix,
+            name_ru=name_ru + suffix,
+            category=category,
+            sequence_order=number + 1,
+        ))
+    
+    products = []
+    for number in range(product_count):
+        name, category = PRODUCT_NAMES[number % len(PRODUCT_NAMES)]
+        products.append(Product(
+            id=_uuid(rng),
+            tenant=tenant,
+            article_code=f'{prefix.upper()}{index:03d}-ART-{number + 1:04d}',
+            name=f'{name} {number + 1}',
+            category=category,
+        ))
+    
+    product_tasks = []
+    for product in products:
+        for number, task in enumerate(tasks):
+            price_min, price_max = TASK_TEMPLATES[number % len(TASK_TEMPLATES)][3]
+            product_tasks.append(ProductTask(
+                id=_uuid(rng),
+                product=product,
+                task=task,
+                base_price=Decimal(rng.randrange(price_min, price_max + 1, 50)),
+            ))
+    
+    Task.objects.bulk_create(tasks)
+    Product.objects.bulk_create(products)
+    ProductTask.objects.bulk_create(product_tasks)
+    return product_tasks
+
+
+def _payday(day, end_date):
+    """
+    Payday that paid the approved work of `day`, or None if unpaid.
+    
+    Paydays are every PAYOUT_INTERVAL_DAYS before end_date; each pays
+    the work done before it.
+    """
+    periods = ((end_date - day).days - 1) // PAYOUT_INTERVAL_DAYS
+    if periods < 1:
+        return None
+    return end_date - timedelta(days=periods * PAYOUT_INTERVAL_DAYS)
+
+
+def _work_records(tenant, masters, workers, product_tasks, start_date, end_date, records_per_day, rng):
+    """Yield unsaved WorkRecords of a tenant, oldest day first."""
+    tz = timezone.get_current_timezone()
+    day = start_date
+    while day <= end_date:
+        if day.weekday() == 6:  # Sunday
+            day += timedelta(days=1)
+            continue
+        
+        age = (end_date - day).days
+        statuses = SETTLED_STATUSES if age > SETTLED_AFTER_DAYS else RECENT_STATUSES
+        payday = _payday(day, end_date)
+        shift_start = datetime.combine(day, time(8, 0), tzinfo=tz)
+        
+        for employee in workers:
+            if rng.random() > ATTENDANCE_RATE:
+                continue
+            for _ in range(rng.randint(1, 2 * records_per_day - 1)):
+                product_task = rng.choice(product_tasks)
+                quantity = rng.randint(5, 120)
+                created_at = shift_start + timedelta(minutes=rng.randrange(600))
+                status = _weighted(rng, statuses)
+                record = WorkRecord(
+                    id=_uuid(rng),
+                    created_at=created_at,
+                    updated_at=created_at,
+                    tenant=tenant,
+                    employee=employee,
+                    product_id=product_task.product_id,
+                    task_id=product_task.task_id,
+                    product_task=product_task,
+                    quantity=quantity,
+                    price_per_unit=product_task.base_price,
+                    total_payment=quantity * product_task.base_price,
+                    status=status,
+                    work_date=day,
+                )
+                if status == WorkRecord.Status.APPROVED:
+                    record.approved_by = rng.choice(masters)
+                    record.approved_at = created_at + timedelta(hours=rng.randint(1, 48))
+                    record.updated_at = record.approved_at
+                    if payday is not None:
+                        record.is_paid = True
+                        record.paid_by = record.approved_by
+                        record.paid_at = datetime.combine(payday, time(18, 0), tzinfo=tz)
+                        record.approved_at = min(record.approved_at, record.paid_at - timedelta(hours=1))
+                        record.updated_at = record.paid_at
+                yield record
+        day += timedelta(days=1)
+
+
+def _copy_records(records):
+    """Insert WorkRecords with PostgreSQL COPY."""
+    fields = WorkRecord._meta.concrete_fields
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    copy_sql = f'COPY {WorkRecord._meta.db_table} ({columns}) FROM STDIN'
+    with connection.cursor() as cursor, cursor.cursor.copy(copy_sql) as copy:
+        for record in records:
+            copy.write_row([getattr(record, field.attname) for field in fields])
+
+
+def _insert_records(records):
+    if connection.vendor == 'postgresql':
+        _copy_records(records)
+    else:
+        # bulk_create resets created_at/updated_at (auto_now) to now
+        WorkRecord.objects.bulk_create(records)
+
+
+def generate_tenant(index, employees, products, tasks, days, records_per_day,
+                    seed=0, prefix='load', chunk_size=10000, progress=None):
+    """
+    Generate one synthetic tenant with its full work history.
+    
+    Args:
+        index: tenant number, part of every generated name
+        employees: employees per tenant (masters included)
+        products / tasks: catalog size; every product has every task
+        days: days of history ending today
+        records_per_day: average records per present worker and day
+        seed: random seed; the same seed and prefix give the same data
+        prefix: name prefix of tenants, users, tasks and products
+        chunk_size: work records inserted per transaction
+        progress: optional callable(tenant, records_written)
+    
+    Returns:
+        dict with the tenant and the number of employees, work records
+        and rollup rows written
+    """
+    rng = random.Random(f'{seed}-{prefix}-{index}')
+    User = get_user_model()
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=days - 1)
+    # History older than the existing partitions would land in the default one
+    ensure_partitions(start_date, end_date)
+    
+    with transaction.atomic():
+        owner = User.objects.create_user(
+            id=_uuid(rng),
+            username=f'{prefix}{index:03d}-owner',
+            email=f'{prefix}{index:03d}-owner@example.com',
+            password=SYNTHETIC_PASSWORD,
+            role=User.Role.TENANT_ADMIN,
+        )
+        tenant = Tenant.objects.create(
+            id=_uuid(rng),
+            name=f'{prefix.capitalize()} Sex {index:03d}',
+            slug=f'{prefix}-{index:03d}',
+            owner=owner,
+        )
+        masters, workers = _create_staff(tenant, index, employees, prefix, rng, start_date)
+        product_tasks = _create_catalog(tenant, index, products, tasks, prefix, rng)
+    
+    written = 0
+    chunk = []
+    for record in _work_records(tenant, masters, workers, product_tasks,
+                                start_date, end_date, records_per_day, rng):
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            with transaction.atomic():
+                _insert_records(chunk)
+            written += len(chunk)
+            chunk = []
+            if progress:
+                progress(tenant, written)
+    if chunk:
+        with transaction.atomic():
+            _insert_records(chunk)
+        written += len(chunk)
+    
+    rollup_rows = rebuild_rollups(tenant=tenant)
+    rebuild_earnings(tenant=tenant)
+    return {
+        'tenant': tenant,
+        'employees': employees,
+        'work_records': written,
+        'rollup_rows': rollup_rows,
+    }
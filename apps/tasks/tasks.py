@@ -0,0 +1,78 @@
+"""
+Celery tasks for Tasks app.
+"""
+
+from datetime import date
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+
+from .models import PayoutBatch
+from .partitions import add_months, archive_partitions, ensure_partitions, is_partitioned, month_start
+from .payroll import close_payout_batch
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(bind=True, name='apps.tasks.tasks.close_payout_batch')
+def close_payout_batch_task(self, batch_id: str) -> dict:
+    """
+    Mark all records of a payout batch as paid.
+    
+    Progress is stored on the batch (processed_count) and reported as
+    PROGRESS task state.
+    
+    Args:
+        batch_id: PayoutBatch ID
+    
+    Returns:
+        Dictionary with task results
+    """
+    try:
+        batch = PayoutBatch.objects.select_related('tenant', 'paid_by').get(id=batch_id)
+    except PayoutBatch.DoesNotExist:
+        logger.warning(f'Payout batch {batch_id} not found')
+        return {'status': 'missing', 'batch_id': batch_id}
+    
+    if batch.is_finished:
+        return {'status': batch.status, 'batch_id': batch_id}
+    
+    def report_progress(batch):
+        self.update_state(state='PROGRESS', meta={
+            'processed': batch.processed_count,
+            'total': batch.expected_count,
+        })
+    
+    logger.info(f'Closing payout batch {batch_id} ({batch.expected_count} records)')
+    batch = close_payout_batch(batch, on_progress=report_progress)
+    return {
+        'status': batch.status,
+        'batch_id': batch_id,
+        'processed_count': batch.processed_count,
+        'total_payment': str(batch.total_payment),
+    }
+
+
+@shared_task(bind=True, name='apps.tasks.tasks.maintain_work_record_partitions')
+def maintain_work_record_partitions(self) -> dict:
+    """
+    Periodic task (Celery beat, daily) creating the work_records partitions
+    of the coming months and, if WORK_RECORD_ARCHIVE_AFTER_MONTHS is set,
+    archiving fully paid months older than that.
+    """
+    if not is_partitioned():
+        return {'status': 'skipped'}
+    
+    created = ensure_partitions()
+    archived = []
+    if settings.WORK_RECORD_ARCHIVE_AFTER_MONTHS:
+        before = add_months(month_start(date.today()), -settings.WORK_RECORD_ARCHIVE_AFTER_MONTHS)
+        archived = archive_partitions(before)
+    
+    logger.info(f'Created {len(created)} and archived {len(archived)} work record partitions')
+    return {
+        'status': 'success',
+        'created': [month.isoformat() for month in created],
+        'archived': [month.isoformat() for month in archived],
+    }
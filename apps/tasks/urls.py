@@ -2,18 +2,29 @@
 URL patterns for Tasks app.
 """
 
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
 from . import views
 
 app_name = 'tasks'
 
+router = DefaultRouter()
+router.register(r'records', views.WorkRecordViewSet, basename='work-record')
+
 urlpatterns = [
     # Work Records
     path('work-records/', views.work_records_list, name='work_records_list'),
     path('work-records/create/', views.work_record_create, name='work_record_create'),
+    path('work-records/batch/', views.work_record_batch_create, name='work_record_batch_create'),
+    path('work-records/sync/', views.work_record_sync, name='work_record_sync'),
+    path('work-records/prices/', views.work_record_prices, name='work_record_prices'),
+    path('work-records/sw.js', views.work_record_service_worker, name='work_record_service_worker'),
     path('work-records/<uuid:record_id>/', views.work_record_detail, name='work_record_detail'),
     
     # API endpoints
     path('product/<uuid:product_id>/tasks/', views.get_product_tasks, name='get_product_tasks'),
     path('calculate-price/', views.calculate_price, name='calculate_price'),
+    
+    # REST API
+    path('', include(router.urls)),
 ]
@@ -3,15 +3,32 @@ Views for Tasks app - Work Records management.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponse
-from django.db.models import Q, Sum
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.db.models import Q
 from django.utils import timezone
 from datetime import date, timedelta
+import json
+from itertools import zip_longest
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from .entry import BATCH_MAX_LINES, create_work_record_batch, sync_work_records
 from .models import Task, WorkRecord
+from .serializers import (
+    WorkRecordSerializer, WorkRecordBulkActionSerializer, WorkRecordBatchSerializer, WorkRecordSyncSerializer
+)
+from apps.products.catalog import get_catalog_task, get_price_table, get_product_catalog, price_table_etag
 from apps.products.models import Product, ProductTask
 from apps.employees.models import Employee
+from core.mixins import TenantScopedViewSetMixin
+from core.pagination import KeysetCursorPagination, keyset_paginate, next_page_query
+from core.permissions import IsMasterOrAbove
 
 
 @login_required
@@ -99,52 +116,175 @@ def work_record_create(request):
         is_active=True
     ).order_by('article_code')
     
+    tenant_id = request.tenant.id if request.tenant else None
     return render(request, 'work_records/create.html', {
         'products': products,
+        'price_table': get_price_table(tenant_id),
     })
 
 
 @login_required
-def get_product_tasks(request, product_id):
+def work_record_batch_create(request):
     """
-    API endpoint: Get tasks for a specific product.
-    Returns JSON data for API calls or HTML for HTMX.
+    Enter many work records at once (shift-end entry).
+    
+    Workers enter records for themselves; masters choose the worker.
+    Lines are posted as parallel product/task/quantity/notes lists and
+    saved together, or not at all when any line has an error.
     """
-    try:
-        product = Product.objects.get(
-            id=product_id,
-            tenant=request.tenant,
-            is_active=True
+    tenant = request.tenant
+    employee = getattr(request.user, 'employee', None)
+    any_employee = request.user.is_master_or_above
+    
+    if not tenant or (employee is None and not any_employee):
+        return render(request, 'work_records/error.html', {
+            'message': 'Siz employee sifatida ro\'yxatdan o\'tmagansiz. Admin bilan bog\'laning.'
+        })
+    
+    context = {
+        'products': Product.objects.filter(tenant=tenant, is_active=True).order_by('article_code'),
+        'employees': (
+            Employee.objects.filter(tenant=tenant, is_active=True).order_by('full_name')
+            if any_employee else []
+        ),
+        'any_employee': any_employee,
+        'selected_employee': str(employee.id) if employee else '',
+        'lines': [],
+        'batch_errors': [],
+    }
+    
+    if request.method == 'POST':
+        selected_employee = request.POST.get('employee', '') if any_employee else ''
+        columns = zip_longest(
+            request.POST.getlist('product'),
+            request.POST.getlist('task'),
+            request.POST.getlist('quantity'),
+            request.POST.getlist('notes'),
+            fillvalue=''
         )
-        product_tasks = ProductTask.objects.filter(
-            product=product
-        ).select_related('task').filter(
-            task__tenant=request.tenant
-        ).order_by('task__sequence_order')
+        lines = [
+            {'employee': selected_employee, 'product': product, 'task': task, 'quantity': quantity, 'notes': notes}
+            for product, task, quantity, notes in columns
+            # Skip rows left completely empty
+            if product or task or quantity
+        ]
         
-        # Check if this is an API request (JSON expected)
-        if request.headers.get('Accept') == 'application/json' or 'api' in request.path:
-            tasks_data = []
-            for pt in product_tasks:
-                tasks_data.append({
-                    'id': str(pt.task.id),
-                    'code': pt.task.code,
-                    'name_uz': pt.task.name_uz,
-                    'name_ru': pt.task.name_ru,
-                    'category': pt.task.category,
-                    'price': float(pt.get_price()),
-                    'sequence_order': pt.task.sequence_order,
-                })
-            return JsonResponse({'tasks': tasks_data})
+        result = create_work_record_batch(tenant, lines, employee=employee, any_employee=any_employee)
+        if not result['errors']:
+            messages.success(request, f"{len(result['created'])} ta ish saqlandi!")
+            return redirect('master:work_records_list' if any_employee else 'tasks:work_records_list')
         
-        # HTMX request - return HTML
-        return render(request, 'work_records/_task_options.html', {
-            'product_tasks': product_tasks,
+        line_errors = {error['line']: error['errors'] for error in result['errors']}
+        context.update({
+            'selected_employee': selected_employee or context['selected_employee'],
+            'lines': [
+                dict(line, errors=line_errors.get(index, {}))
+                for index, line in enumerate(lines)
+            ],
+            'batch_errors': [
+                message for error in result['errors'] if error['line'] is None
+                for message in error['errors'].values()
+            ],
         })
-    except Product.DoesNotExist:
-        if request.headers.get('Accept') == 'application/json' or 'api' in request.path:
+    
+    return render(request, 'work_records/batch_create.html', context)
+
+
+@login_required
+@require_POST
+def work_record_sync(request):
+    """
+    Sync endpoint for the offline entry queue (JSON, session auth).
+    
+    Body: {"items": [{"id": <client UUID>, "product", "task", "quantity",
+    "work_date", "notes"}, ...]}. Safe to retry: items already synced
+    are reported as "exists". Returns per-item results.
+    """
+    try:
+        employee = request.user.employee
+    except Employee.DoesNotExist:
+        return JsonResponse({'error': 'Employee not found'}, status=403)
+    
+    tenant = request.tenant
+    if not tenant:
+        return JsonResponse({'error': 'No tenant selected'}, status=400)
+    
+    try:
+        items = json.loads(request.body).get('items')
+    except (ValueError, AttributeError):
+        items = None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return JsonResponse({'error': 'items must be a list of objects'}, status=400)
+    if len(items) > BATCH_MAX_LINES:
+        return JsonResponse({'error': f'At most {BATCH_MAX_LINES} items per sync'}, status=400)
+    
+    results = sync_work_records(tenant, items, employee=employee)
+    return JsonResponse({'results': results})
+
+
+def work_record_service_worker(request):
+    """
+    Service worker for the work record pages.
+    
+    Served from /tasks/work-records/ so its scope covers the entry form.
+    It keeps the form usable offline and syncs queued entries.
+    """
+    response = render(request, 'work_records/sw.js', content_type='application/javascript')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@login_required
+@condition(etag_func=price_table_etag)
+@cache_control(private=True, no_cache=True)
+def work_record_prices(request):
+    """
+    Price table of the entry form (see get_price_table).
+    
+    The form embeds the table and revalidates it with If-None-Match;
+    an unchanged table returns 304 without loading the catalog.
+    """
+    tenant_id = request.tenant.id if request.tenant else None
+    return JsonResponse(get_price_table(tenant_id))
+
+
+@login_required
+def get_product_tasks(request, product_id):
+    """
+    API endpoint: Get tasks for a specific product.
+    Returns JSON data for API calls or HTML for HTMX.
+    
+    Served from the tenant's price catalog (no database queries).
+    """
+    tenant_id = request.tenant.id if request.tenant else None
+    product = get_product_catalog(tenant_id, product_id)
+    wants_json = request.headers.get('Accept') == 'application/json' or 'api' in request.path
+    
+    if product is None:
+        if wants_json:
             return JsonResponse({'error': 'Product not found'}, status=404)
         return HttpResponse('<option value="">Mahsulot topilmadi</option>')
+    
+    # Check if this is an API request (JSON expected)
+    if wants_json:
+        tasks_data = [
+            {
+                'id': task['id'],
+                'code': task['code'],
+                'name_uz': task['name_uz'],
+                'name_ru': task['name_ru'],
+                'category': task['category'],
+                'price': float(task['price']),
+                'sequence_order': task['sequence_order'],
+            }
+            for task in product['tasks']
+        ]
+        return JsonResponse({'tasks': tasks_data})
+    
+    # HTMX request - return HTML
+    return render(request, 'work_records/_task_options.html', {
+        'product_tasks': product['tasks'],
+    })
 
 
 @login_required
@@ -152,6 +292,8 @@ def calculate_price(request):
     """
     HTMX endpoint: Calculate total price based on product, task, and quantity.
     Returns JSON with price info.
+    
+    Prices come from the tenant's price catalog (no database queries).
     """
     product_id = request.GET.get('product')
     task_id = request.GET.get('task')
@@ -159,24 +301,24 @@ def calculate_price(request):
     
     try:
         quantity = int(quantity)
-        if quantity <= 0:
-            return JsonResponse({'total': 0, 'per_unit': 0})
-        
-        product_task = ProductTask.objects.get(
-            product_id=product_id,
-            task_id=task_id
-        )
-        
-        price_per_unit = float(product_task.get_price())
-        total = price_per_unit * quantity
-        
-        return JsonResponse({
-            'per_unit': f'{price_per_unit:,.0f}',
-            'total': f'{total:,.0f}',
-            'total_raw': total
-        })
-    except (ProductTask.DoesNotExist, ValueError):
+    except ValueError:
+        return JsonResponse({'total': 0, 'per_unit': 0})
+    if quantity <= 0:
         return JsonResponse({'total': 0, 'per_unit': 0})
+    
+    tenant_id = request.tenant.id if request.tenant else None
+    task = get_catalog_task(tenant_id, product_id, task_id)
+    if task is None:
+        return JsonResponse({'total': 0, 'per_unit': 0})
+    
+    price_per_unit = float(task['price'])
+    total = price_per_unit * quantity
+    
+    return JsonResponse({
+        'per_unit': f'{price_per_unit:,.0f}',
+        'total': f'{total:,.0f}',
+        'total_raw': total
+    })
 
 
 @login_required
@@ -226,17 +368,24 @@ def work_records_list(request):
     if status_filter != 'all':
         records = records.filter(status=status_filter)
     
-    # Statistics
-    stats = records.aggregate(
-        total_quantity=Sum('quantity'),
-        total_payment=Sum('total_payment')
-    )
+    # Newest first, one keyset page; "load more" requests only render the next cards
+    try:
+        page = keyset_paginate(records, request.GET.get('cursor'))
+    except ValueError:
+        page = keyset_paginate(records)
     
-    # Order by date (newest first)
-    records = records.order_by('-work_date', '-created_at')
+    if request.headers.get('HX-Request') and request.GET.get('fragment') == 'cards':
+        return render(request, 'work_records/_record_cards.html', {
+            'records': page,
+            'next_query': next_page_query(request, page),
+        })
+    
+    # Statistics
+    stats = records.facet_counts()
     
     return render(request, 'work_records/list.html', {
-        'records': records,
+        'records': page,
+        'next_query': next_page_query(request, page),
         'stats': stats,
         'date_filter': date_filter,
         'status_filter': status_filter,
@@ -284,3 +433,108 @@ def work_record_detail(request, record_id):
     return render(request, 'work_records/detail.html', {
         'record': record,
     })
+
+
+# ============================================================================
+# REST API
+# ============================================================================
+
+class WorkRecordViewSet(TenantScopedViewSetMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet for work records of the current tenant."""
+    
+    queryset = WorkRecord.objects.select_related('employee', 'product', 'task').all()
+    serializer_class = WorkRecordSerializer
+    permission_classes = [IsMasterOrAbove]
+    pagination_class = KeysetCursorPagination
+    
+    def get_queryset(self):
+        """Filter queryset based on query parameters."""
+        queryset = super().get_queryset()
+        
+        record_status = self.request.query_params.get('status')
+        if record_status:
+            queryset = queryset.filter(status=record_status)
+        
+        employee = self.request.query_params.get('employee')
+        if employee:
+            queryset = queryset.filter(employee_id=employee)
+        
+        return queryset
+    
+    def _bulk_action_data(self, request):
+        serializer = WorkRecordBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def batch(self, request):
+        """
+        Create many work records in one transaction.
+        
+        Workers create records for themselves; masters may give an
+        employee per line or a default employee for the batch. Returns
+        per-line errors (and creates nothing) if any line is invalid.
+        """
+        serializer = WorkRecordBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        tenant = self.get_tenant()
+        if not tenant:
+            return Response({'detail': 'No tenant selected'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        lines = data['lines']
+        if data.get('employee'):
+            lines = [{'employee': data['employee'], **line} for line in lines]
+        
+        result = create_work_record_batch(
+            tenant,
+            lines,
+            employee=getattr(request.user, 'employee', None),
+            any_employee=request.user.is_master_or_above,
+        )
+        if result['errors']:
+            return Response({'errors': result['errors']}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'count': len(result['created']),
+            'results': WorkRecordSerializer(result['created'], many=True).data,
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def sync(self, request):
+        """
+        Idempotently create queued records with client-generated IDs.
+        
+        Safe to retry: items already synced are reported as "exists".
+        Returns per-item results.
+        """
+        serializer = WorkRecordSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        tenant = self.get_tenant()
+        if not tenant:
+            return Response({'detail': 'No tenant selected'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        results = sync_work_records(
+            tenant,
+            serializer.validated_data['items'],
+            employee=getattr(request.user, 'employee', None),
+            any_employee=request.user.is_master_or_above,
+        )
+        return Response({'results': results})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        """Approve pending, unpaid records. Returns accepted and rejected IDs."""
+        data = self._bulk_action_data(request)
+        approver = getattr(request.user, 'employee', None)
+        records = WorkRecord.objects.filter(tenant=self.get_tenant())
+        return Response(records.bulk_approve(data['record_ids'], approver))
+    
+    @action(detail=False, methods=['post'])
+    def bulk_reject(self, request):
+        """Reject pending, unpaid records. Returns accepted and rejected IDs."""
+        data = self._bulk_action_data(request)
+        records = WorkRecord.objects.filter(tenant=self.get_tenant())
+        return Response(records.bulk_reject(data['record_ids'], data['reason']))
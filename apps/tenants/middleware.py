@@ -7,7 +7,107 @@ This middleware automatically detects the current tenant based on:
 3. First available tenant (for tenant admins)
 """
 
+import structlog
+from django.conf import settings
+from django.core.cache import cache
+
 from apps.tenants.models import Tenant
+from core.cache import bump_version, get_versions
+
+logger = structlog.get_logger(__name__)
+
+# Cache keys for resolved tenants. Bumping a version key makes all
+# resolutions that were cached under the old version unreachable.
+TENANT_CACHE_VERSION_KEY = 'tenant-resolution:version'
+USER_TENANT_CACHE_VERSION_KEY = 'tenant-resolution:version:user:{user_id}'
+
+
+def _resolution_cache_key(user_id, selected_tenant_id, versions):
+    return 'tenant-resolution:{global_version}:{user_version}:{user_id}:{selected}'.format(
+        global_version=versions[TENANT_CACHE_VERSION_KEY],
+        user_version=versions[USER_TENANT_CACHE_VERSION_KEY.format(user_id=user_id)],
+        user_id=user_id,
+        selected=selected_tenant_id or '-',
+    )
+
+
+def invalidate_tenant_cache(user_id=None):
+    """
+    Invalidate cached tenant resolutions.
+    
+    With a user_id only that user's resolutions are dropped, otherwise
+    the resolutions of all users.
+    """
+    if user_id:
+        bump_version(USER_TENANT_CACHE_VERSION_KEY.format(user_id=user_id))
+    else:
+        bump_version(TENANT_CACHE_VERSION_KEY)
+
+
+def resolve_tenant(user, selected_tenant_id=None):
+    """
+    Resolve the current tenant of a user (uncached).
+    
+    Returns:
+        (tenant, session_tenant_id) - session_tenant_id is the value
+        'selected_tenant_id' should have in the session afterwards
+        (None means it should be removed).
+    """
+    tenant = None
+    session_tenant_id = selected_tenant_id
+    
+    # Strategy 1: Get tenant from employee profile (most common case)
+    if hasattr(user, 'employee') and user.employee:
+        tenant = user.employee.tenant
+    
+    # Strategy 2: Get tenant from session (for owners switching between tenants)
+    elif selected_tenant_id:
+        try:
+            selected = Tenant.objects.get(id=selected_tenant_id, is_active=True)
+            
+            # Verify user has access to this tenant
+            if user.owned_tenants.filter(id=selected_tenant_id).exists() or \
+               user.tenant_memberships.filter(tenant_id=selected_tenant_id, is_active=True).exists():
+                tenant = selected
+        except Tenant.DoesNotExist:
+            # Invalid tenant in session, clear it
+            session_tenant_id = None
+    
+    # Strategy 3: Auto-select first available tenant for owners
+    if not tenant:
+        # Owner's first tenant
+        if user.owned_tenants.exists():
+            tenant = user.owned_tenants.filter(is_active=True).first()
+            if tenant:
+                # Save to session for future requests
+                session_tenant_id = str(tenant.id)
+        
+        # Or first membership tenant
+        elif user.tenant_memberships.filter(is_active=True).exists():
+            membership = user.tenant_memberships.filter(is_active=True).select_related('tenant').first()
+            if membership:
+                tenant = membership.tenant
+                session_tenant_id = str(membership.tenant_id)
+    
+    return tenant, session_tenant_id
+
+
+def resolve_tenant_cached(user, selected_tenant_id=None):
+    """
+    Resolve the current tenant of a user through Django's cache.
+    
+    Cached resolutions are invalidated by the Tenant, TenantMembership
+    and Employee signals in apps.tenants.signals.
+    """
+    user_version_key = USER_TENANT_CACHE_VERSION_KEY.format(user_id=user.pk)
+    versions = get_versions([TENANT_CACHE_VERSION_KEY, user_version_key])
+    key = _resolution_cache_key(user.pk, selected_tenant_id, versions)
+    
+    resolution = cache.get(key)
+    if resolution is None:
+        resolution = resolve_tenant(user, selected_tenant_id)
+        cache.set(key, resolution, timeout=settings.TENANT_CACHE_TIMEOUT)
+    return resolution
 
 
 class TenantMiddleware:
@@ -15,6 +115,8 @@ class TenantMiddleware:
     Middleware to set current tenant on request.
     
     Sets request.tenant and request.tenant_id for all views.
+    The resolved tenant is cached per user and session selection,
+    so warm requests do not query the database.
     """
     
     def __init__(self, get_response):
@@ -30,51 +132,29 @@ class TenantMiddleware:
             return self.get_response(request)
         
         user = request.user
+        selected_tenant_id = request.session.get('selected_tenant_id')
         
-        # Strategy 1: Get tenant from employee profile (most common case)
-        if hasattr(user, 'employee') and user.employee:
-            request.tenant = user.employee.tenant
-            request.tenant_id = user.employee.tenant_id
+        tenant, session_tenant_id = resolve_tenant_cached(user, selected_tenant_id)
+        if tenant:
+            request.tenant = tenant
+            request.tenant_id = tenant.id
         
-        # Strategy 2: Get tenant from session (for owners switching between tenants)
-        elif 'selected_tenant_id' in request.session:
-            try:
-                tenant_id = request.session['selected_tenant_id']
-                tenant = Tenant.objects.get(id=tenant_id, is_active=True)
-                
-                # Verify user has access to this tenant
-                if user.owned_tenants.filter(id=tenant_id).exists() or \
-                   user.tenant_memberships.filter(tenant_id=tenant_id, is_active=True).exists():
-                    request.tenant = tenant
-                    request.tenant_id = tenant.id
-            except Tenant.DoesNotExist:
-                # Invalid tenant in session, clear it
+        # Keep the session selection in sync with the resolution
+        if session_tenant_id != selected_tenant_id:
+            if session_tenant_id:
+                request.session['selected_tenant_id'] = session_tenant_id
+            else:
                 del request.session['selected_tenant_id']
         
-        # Strategy 3: Auto-select first available tenant for owners
-        if not request.tenant:
-            # Owner's first tenant
-            if user.owned_tenants.exists():
-                tenant = user.owned_tenants.filter(is_active=True).first()
-                if tenant:
-                    request.tenant = tenant
-                    request.tenant_id = tenant.id
-                    # Save to session for future requests
-                    request.session['selected_tenant_id'] = str(tenant.id)
-            
-            # Or first membership tenant
-            elif user.tenant_memberships.filter(is_active=True).exists():
-                membership = user.tenant_memberships.filter(is_active=True).first()
-                if membership:
-                    request.tenant = membership.tenant
-                    request.tenant_id = membership.tenant_id
-                    request.session['selected_tenant_id'] = str(membership.tenant_id)
-        
-        # Log tenant selection for debugging
+        # Every later log record of the request names its user and tenant
+        structlog.contextvars.bind_contextvars(
+            user_id=str(user.pk),
+            tenant_id=str(request.tenant_id) if request.tenant_id else None,
+        )
         if request.tenant:
-            print(f"🏭 [TENANT] User: {user.username}, Tenant: {request.tenant.name}")
+            logger.debug('tenant.resolved', tenant=request.tenant.slug)
         else:
-            print(f"⚠️ [TENANT] User: {user.username}, No tenant found!")
+            logger.info('tenant.not_found', username=user.username)
         
         response = self.get_response(request)
         return response
@@ -5,6 +5,9 @@ Each tenant represents a separate workshop/factory.
 Data isolation is enforced at the database level.
 """
 
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings as django_settings
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
@@ -118,6 +121,13 @@ class Tenant(TimeStampedModel):
         """Deactivate tenant."""
         self.is_active = False
         self.save(update_fields=['is_active', 'updated_at'])
+    
+    def get_timezone(self):
+        """Timezone from settings['timezone'], defaults to TIME_ZONE."""
+        try:
+            return ZoneInfo(self.settings.get('timezone') or django_settings.TIME_ZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            return ZoneInfo(django_settings.TIME_ZONE)
 
 
 class TenantMembership(TimeStampedModel):
@@ -0,0 +1,31 @@
+"""
+Signal handlers for Tenants app.
+
+Invalidate cached tenant resolutions (see TenantMiddleware) whenever
+the data they were resolved from changes.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.employees.models import Employee
+
+from .middleware import invalidate_tenant_cache
+from .models import Tenant, TenantMembership
+
+
+@receiver([post_save, post_delete], sender=Tenant)
+def tenant_changed(sender, instance, **kwargs):
+    """A tenant changed - cached tenant objects of all users are stale."""
+    invalidate_tenant_cache()
+
+
+@receiver([post_save, post_delete], sender=TenantMembership)
+def membership_changed(sender, instance, **kwargs):
+    invalidate_tenant_cache(user_id=instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def employee_changed(sender, instance, **kwargs):
+    if instance.user_id:
+        invalidate_tenant_cache(user_id=instance.user_id)
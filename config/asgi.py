@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The regular pages are served by gunicorn (WSGI); this entry point serves the
+long-lived Server-Sent Events streams (dashboard:tv-events) under uvicorn.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -5,6 +5,7 @@ This file contains settings common to all environments.
 """
 
 import environ
+from celery.schedules import crontab
 from pathlib import Path
 
 # Build paths
@@ -63,6 +64,10 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Request ID for log correlation - before anything that logs
+    'core.logs.RequestIdMiddleware',
+    # Request profiling - opt-in with REQUEST_PROFILING_ENABLED
+    'core.profiling.RequestProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -172,6 +177,11 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Background report exports (admin_panel.ReportExport)
+REPORT_EXPORT_RETENTION_DAYS = env.int('REPORT_EXPORT_RETENTION_DAYS', default=7)
+# Exports pending or running longer than this are failed and regenerated
+REPORT_EXPORT_STALE_MINUTES = env.int('REPORT_EXPORT_STALE_MINUTES', default=30)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -237,6 +247,45 @@ CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[
 CORS_ALLOW_CREDENTIALS = True
 
 
+# Cache Configuration
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.RedisCache',
+        'LOCATION': env('CACHE_URL', default='redis://localhost:6379/1'),
+        'KEY_PREFIX': 'sewtrack',
+    }
+}
+
+# Tenant resolution cache (TenantMiddleware)
+TENANT_CACHE_TIMEOUT = env.int('TENANT_CACHE_TIMEOUT', default=300)
+
+# TV dashboard KPI snapshot, shared by all screens of a tenant (seconds)
+TV_SNAPSHOT_TIMEOUT = env.int('TV_SNAPSHOT_TIMEOUT', default=30)
+
+# Admin and reports dashboard counts; versioned, so this only bounds drift
+# from writes that bypass signals (seconds)
+TENANT_SNAPSHOT_TIMEOUT = env.int('TENANT_SNAPSHOT_TIMEOUT', default=600)
+
+# Per-tenant price catalog; versioned, so it only expires to free memory (seconds)
+PRICE_CATALOG_TIMEOUT = env.int('PRICE_CATALOG_TIMEOUT', default=3600)
+
+# Live dashboard events (memory:// for a single process, redis://... otherwise)
+LIVE_EVENTS_BROKER_URL = env('LIVE_EVENTS_BROKER_URL', default='memory://')
+
+
+# Request profiling (core.profiling)
+# https://github.com/korfuri/django-prometheus
+
+REQUEST_PROFILING_ENABLED = env.bool('REQUEST_PROFILING_ENABLED', default=False)
+# Requests slower than this are logged as warnings (seconds)
+REQUEST_PROFILING_SLOW_SECONDS = env.float('REQUEST_PROFILING_SLOW_SECONDS', default=1.0)
+# Share of requests whose SQL is recorded; logged if the request is slow
+REQUEST_PROFILING_TRACE_RATE = env.float('REQUEST_PROFILING_TRACE_RATE', default=0.1)
+REQUEST_PROFILING_TRACE_MAX_QUERIES = env.int('REQUEST_PROFILING_TRACE_MAX_QUERIES', default=200)
+
+
 # Celery Configuration
 # https://docs.celeryq.dev/en/stable/django/
 
@@ -247,10 +296,38 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_SCHEDULE = {
+    'cleanup-report-exports': {
+        'task': 'apps.admin_panel.tasks.cleanup_report_exports',
+        'schedule': crontab(minute=15),
+    },
+    'maintain-work-record-partitions': {
+        'task': 'apps.tasks.tasks.maintain_work_record_partitions',
+        'schedule': crontab(hour=2, minute=30),
+    },
+}
+
+# Monthly work_records partitions created ahead of time (PostgreSQL)
+WORK_RECORD_PARTITIONS_AHEAD = env.int('WORK_RECORD_PARTITIONS_AHEAD', default=3)
+# Fully paid months older than this are detached daily (0 = never)
+WORK_RECORD_ARCHIVE_AFTER_MONTHS = env.int('WORK_RECORD_ARCHIVE_AFTER_MONTHS', default=0)
 
 
 # Logging Configuration
 # https://docs.djangoproject.com/en/5.2/topics/logging/
+# Application events are logged with structlog (see core.logs)
+
+# One JSON object per line (False: readable console output)
+LOG_JSON = env.bool('LOG_JSON', default=True)
+
+# Level of the application loggers (apps.*, core.*)
+APP_LOG_LEVEL = env('APP_LOG_LEVEL', default='INFO')
+
+# Share of these debug/info events that is logged (warnings always are)
+LOG_SAMPLING_RATES = {
+    'tenant.resolved': 0.01,
+    'request.profiled': 0.1,
+}
 
 LOGGING = {
     'version': 1,
@@ -264,11 +341,16 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'structured': {
+            '()': 'core.logs.StructuredFormatter',
+            'json': LOG_JSON,
+        },
     },
     'handlers': {
+        # Formats and writes from a background thread
         'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
+            '()': 'core.logs.QueuedStreamHandler',
+            'formatter': 'structured',
         },
         'file': {
             'class': 'logging.FileHandler',
@@ -286,6 +368,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'apps': {
+            'level': APP_LOG_LEVEL,
+        },
+        'core': {
+            'level': APP_LOG_LEVEL,
+        },
     },
 }
 
@@ -42,6 +42,13 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # CORS - Allow all origins in development
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Cache - Local memory (single process)
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.LocMemCache',
+    }
+}
+
 # Celery - Eager execution for development
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
@@ -49,4 +56,7 @@ CELERY_TASK_EAGER_PROPAGATES = True
 # Logging - More verbose in development
 LOGGING['loggers']['django']['level'] = 'DEBUG'  # noqa: F405
 LOGGING['root']['level'] = 'DEBUG'  # noqa: F405
+LOGGING['loggers']['apps']['level'] = 'DEBUG'  # noqa: F405
+LOGGING['loggers']['core']['level'] = 'DEBUG'  # noqa: F405
+LOGGING['formatters']['structured']['json'] = False  # noqa: F405
 
@@ -62,6 +62,10 @@ if SENTRY_DSN:
         environment='production',
     )
 
+# Prometheus metrics on /metrics (see core.profiling); with several
+# gunicorn workers set PROMETHEUS_MULTIPROC_DIR to a shared directory
+INSTALLED_APPS += ['django_prometheus']  # noqa: F405
+
 # Logging - Production level
 LOGGING['loggers']['django']['level'] = 'WARNING'  # noqa: F405
 LOGGING['root']['level'] = 'WARNING'  # noqa: F405
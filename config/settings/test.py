@@ -9,13 +9,22 @@ from .base import *  # noqa: F401, F403
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
-# Use in-memory SQLite for faster tests
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': ':memory:',
+# Use in-memory SQLite for faster tests, or the database in
+# TEST_DATABASE_URL (e.g. to run the performance suite on PostgreSQL)
+if env('TEST_DATABASE_URL', default=''):  # noqa: F405
+    DATABASES = {
+        'default': env.db('TEST_DATABASE_URL'),  # noqa: F405
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+
+# SQLite ignores INCLUDE columns of covering indexes (PostgreSQL only)
+SILENCED_SYSTEM_CHECKS = ['models.W040']
 
 # Password hashers - Use fast hasher for tests
 PASSWORD_HASHERS = [
@@ -28,6 +37,13 @@ CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_BROKER_URL = 'memory://'
 CELERY_RESULT_BACKEND = 'cache+memory://'
 
+# Cache - Local memory (single process)
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.LocMemCache',
+    }
+}
+
 # Email Backend (Memory for tests)
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
@@ -88,6 +88,12 @@ if settings.DEBUG:
         path('__debug__/', include(debug_toolbar.urls)),
     ]
 
+# Prometheus metrics (django-prometheus, production)
+if 'django_prometheus' in settings.INSTALLED_APPS:
+    urlpatterns += [
+        path('', include('django_prometheus.urls')),
+    ]
+
 # Static and Media files
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -9,4 +9,7 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core'
-
+    
+    def ready(self):
+        from .logs import configure_structlog
+        configure_structlog()
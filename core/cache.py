@@ -0,0 +1,75 @@
+"""
+Cache helpers.
+
+Version keys: cached entries whose key includes the current value of a
+version key (get_version()) become unreachable when the version is
+bumped (bump_version()), without deleting them. A missing version key
+(never set, or evicted) starts at a fresh value, so entries cached under
+an earlier version never match again.
+
+Cache backends that count hits and misses for request profiling:
+drop-in replacements for Django's Redis and local memory backends; the
+counts go to the profile of the current request (core.profiling) and
+are ignored outside profiled requests.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache as DjangoLocMemCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+
+from .profiling import record_cache_lookups
+
+_MISSING = object()
+
+
+def get_version(key):
+    """Current value of a version key."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(keys):
+    """Current values of several version keys, in one cache round trip when all are set."""
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = get_version(key)
+    return versions
+
+
+def bump_version(key):
+    """Make the entries cached under the current value of a version key stale."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+class ProfiledCacheMixin:
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache_lookups(misses=1)
+            return default
+        record_cache_lookups(hits=1)
+        return value
+
+
+class RedisCache(ProfiledCacheMixin, DjangoRedisCache):
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version)
+        record_cache_lookups(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+
+class LocMemCache(ProfiledCacheMixin, DjangoLocMemCache):
+    # get_many() of the local memory backend goes through get()
+    pass
@@ -0,0 +1,47 @@
+"""
+Database helpers for migrations.
+
+AddIndexConcurrently and RemoveIndexConcurrently build and drop indexes
+with CREATE/DROP INDEX CONCURRENTLY on PostgreSQL, so large tables such
+as work_records stay writable while a migration runs. Other databases
+(SQLite in tests) get a plain CREATE/DROP INDEX. Migrations using them
+must set atomic = False.
+
+Since migration 0008 work_records is partitioned on PostgreSQL, and
+PostgreSQL cannot build an index on a partitioned table concurrently:
+new work_records indexes need a plain AddIndex (which locks writes for
+the build), or CREATE INDEX CONCURRENTLY on each partition first.
+"""
+
+from django.contrib.postgres import operations as postgres_operations
+from django.db.migrations.operations import AddIndex, RemoveIndex
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+    
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class RemoveIndexConcurrently(postgres_operations.RemoveIndexConcurrently):
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+    
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            RemoveIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
@@ -0,0 +1,188 @@
+"""
+Structured logging.
+
+Application events are logged with structlog as an event name plus
+key/value pairs:
+
+    logger = structlog.get_logger(__name__)
+    logger.info('work_records.bulk_approved', approved=12)
+
+structlog hands events to the logging module, so they share handlers
+and formatting (StructuredFormatter) with Django's own log records.
+The console handler (QueuedStreamHandler) only puts records on a queue;
+a background thread formats and writes them, so request threads never
+wait on stdout.
+
+Records logged during a request carry its request_id (RequestIdMiddleware)
+and, once TenantMiddleware has run, the tenant and user. Chatty debug and
+info events can be sampled with LOG_SAMPLING_RATES.
+"""
+
+import logging
+import os
+import queue
+import random
+import re
+import uuid
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+import structlog
+from django.conf import settings
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Accepted request IDs from a proxy (nginx $request_id is 32 hex digits)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def add_record_context(logger, method_name, event_dict):
+    """
+    Add the context variables captured by QueuedStreamHandler and the
+    time the record was created (not the time it was formatted).
+    """
+    record = event_dict.get('_record')
+    context = getattr(record, 'contextvars', None)
+    if context:
+        event_dict = {**context, **event_dict}
+    if record is not None:
+        created = datetime.fromtimestamp(record.created, tz=UTC)
+        event_dict['timestamp'] = created.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    return event_dict
+
+
+class EventSampler:
+    """
+    Processor keeping only a share of some events.
+    
+    rates maps event names to the share (0..1) that is kept; the
+    sample_rate is added to kept events so counts can be scaled back.
+    Warnings and errors are never dropped.
+    """
+    
+    def __init__(self, rates):
+        self.rates = rates
+    
+    def __call__(self, logger, method_name, event_dict):
+        rate = self.rates.get(event_dict.get('event'))
+        if rate is None or rate >= 1 or method_name in ('warning', 'error', 'exception', 'critical'):
+            return event_dict
+        if random.random() >= rate:
+            raise structlog.DropEvent
+        event_dict['sample_rate'] = rate
+        return event_dict
+
+
+def configure_structlog():
+    """Route structlog through the logging module (called by CoreConfig)."""
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            EventSampler(settings.LOG_SAMPLING_RATES),
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt='iso', utc=True),
+            structlog.processors.StackInfoRenderer(),
+            # Tracebacks must be taken in this thread, not the log writer's
+            structlog.processors.format_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+class StructuredFormatter(structlog.stdlib.ProcessorFormatter):
+    """
+    Render structlog events and plain log records alike, as one JSON
+    object per line or (json=False) readable for development.
+    """
+    
+    def __init__(self, json=True, **kwargs):
+        if json:
+            renderers = [structlog.processors.format_exc_info, structlog.processors.JSONRenderer()]
+        else:
+            renderers = [structlog.dev.ConsoleRenderer(colors=False)]
+        super().__init__(
+            processors=[structlog.stdlib.ProcessorFormatter.remove_processors_meta, *renderers],
+            foreign_pre_chain=[
+                add_record_context,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+            ],
+            **kwargs,
+        )
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    Stream handler that writes from a background thread.
+    
+    Records are formatted and written by a QueueListener; the formatter
+    set on this handler is used by the listener's stream handler.
+    """
+    
+    def __init__(self, stream=None):
+        self.target = logging.StreamHandler(stream)
+        super().__init__(queue.SimpleQueue())
+        self.listener = None
+        self.stopped = False
+        self._start_listener()
+        # Threads do not survive fork (celery prefork, gunicorn --preload)
+        os.register_at_fork(after_in_child=self._restart_listener)
+    
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+    
+    def _restart_listener(self):
+        if self.stopped:
+            return
+        self.queue = queue.SimpleQueue()
+        self._start_listener()
+    
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+    
+    def prepare(self, record):
+        # Same-process queue: keep the record as is and let the listener
+        # format it, but capture the context variables of this thread
+        record.contextvars = structlog.contextvars.get_contextvars()
+        return record
+    
+    def close(self):
+        if not self.stopped:
+            self.stopped = True
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+class RequestIdMiddleware:
+    """
+    Bind a request ID to every log record of a request.
+    
+    The ID comes from the X-Request-ID header set by nginx, or is
+    generated, and is returned in the same response header.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            structlog.contextvars.clear_contextvars()
+        
+        response[REQUEST_ID_HEADER] = request_id
+        return response
@@ -68,3 +68,28 @@ class StandardizedResponseMixin:
                 }
         return super().finalize_response(request, response, *args, **kwargs)
 
+
+class TenantScopedViewSetMixin:
+    """
+    Mixin to limit a ViewSet's queryset to the current tenant.
+    
+    TenantMiddleware runs before DRF authentication, so JWT requests
+    arrive with request.tenant = None. In that case the tenant is
+    resolved from the authenticated user with the middleware's resolver.
+    """
+    
+    def get_tenant(self):
+        from apps.tenants.middleware import resolve_tenant_cached
+        
+        request = self.request
+        tenant = getattr(request, 'tenant', None)
+        if tenant:
+            return tenant
+        
+        if not request.user.is_authenticated:
+            return None
+        tenant, _ = resolve_tenant_cached(request.user)
+        return tenant
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(tenant=self.get_tenant())
@@ -0,0 +1,182 @@
+"""
+Keyset (cursor) pagination for SEW-TRACK.
+
+Offset pagination gets slower the deeper the page, because the database
+still has to walk every skipped row. Keyset pagination remembers the sort
+key of the last row shown and asks for the rows after it, so every page
+costs the same index range scan regardless of how much history there is.
+
+The cursor is an opaque, URL-safe encoding of the last row's sort values.
+The ordering must end in a unique field (id) so rows are never skipped or
+repeated.
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Newest first, matching WorkRecord.Meta.ordering with id as tie-breaker
+WORK_RECORD_ORDERING = ('-work_date', '-created_at', '-id')
+
+KEYSET_PAGE_SIZE = 50
+
+
+class KeysetPage:
+    """One page of rows plus the cursor for the page after it."""
+    
+    def __init__(self, object_list, has_next, next_cursor):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+    
+    def __iter__(self):
+        return iter(self.object_list)
+    
+    def __len__(self):
+        return len(self.object_list)
+    
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def encode_cursor(values):
+    payload = json.dumps([str(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Decode a cursor into field values. Raises ValueError if it is invalid."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw_values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError) as exc:
+        raise ValueError('Invalid cursor') from exc
+    
+    if not isinstance(raw_values, list) or len(raw_values) != len(ordering):
+        raise ValueError('Invalid cursor')
+    
+    values = []
+    for field_name, raw_value in zip(ordering, raw_values, strict=True):
+        field = model._meta.get_field(field_name.lstrip('-'))
+        try:
+            values.append(field.to_python(raw_value))
+        except Exception as exc:
+            raise ValueError('Invalid cursor') from exc
+    return values
+
+
+def _after_filter(ordering, values):
+    """
+    Build the "rows after this position" condition.
+    
+    (a, b, c) after (x, y, z) expands to
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+    with > replaced by < for descending fields. The leading field also
+    gets a plain range condition so the planner can use its index.
+    """
+    condition = Q()
+    equal = {}
+    for field_name, value in zip(ordering, values, strict=True):
+        name = field_name.lstrip('-')
+        lookup = 'lt' if field_name.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    
+    first = ordering[0]
+    leading = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+    return leading & condition
+
+
+def keyset_paginate(queryset, cursor=None, page_size=KEYSET_PAGE_SIZE, ordering=WORK_RECORD_ORDERING):
+    """
+    Return one KeysetPage of queryset in the given ordering.
+    
+    Args:
+        queryset: Filtered queryset (its own ordering is replaced)
+        cursor: Cursor from a previous page's next_cursor, or None
+        page_size: Rows per page
+        ordering: Field names; must end with a unique field
+    
+    Raises:
+        ValueError: If the cursor cannot be decoded
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_after_filter(ordering, values))
+    
+    rows = list(queryset[:page_size + 1])
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, field_name.lstrip('-')) for field_name in ordering
+        )
+    return KeysetPage(rows, has_next, next_cursor)
+
+
+def next_page_query(request, page):
+    """
+    Query string for the page after `page`, keeping the current filters.
+    
+    The HTMX "load more" partials add their own fragment parameter.
+    """
+    params = request.GET.copy()
+    params.pop('fragment', None)
+    params['cursor'] = page.next_cursor
+    return params.urlencode()
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    DRF paginator using the same keyset cursors as the HTML lists.
+    
+    Responses look like {"next": <url or null>, "results": [...]}.
+    """
+    page_size = api_settings.PAGE_SIZE or KEYSET_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = WORK_RECORD_ORDERING
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = request.query_params.get(self.cursor_query_param)
+        try:
+            self.page = keyset_paginate(queryset, cursor, self.page_size, self.ordering)
+        except ValueError:
+            raise NotFound('Invalid cursor')
+        return list(self.page)
+    
+    def get_next_link(self):
+        if not self.page.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.page.next_cursor)
+    
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
@@ -39,3 +39,13 @@ class IsStaffUser(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_staff
 
+
+
+class IsMasterOrAbove(permissions.BasePermission):
+    """
+    Permission to only allow masters, tenant admins and staff users.
+    """
+    
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and (user.is_staff or user.is_master_or_above))
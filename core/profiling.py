@@ -0,0 +1,170 @@
+"""
+Opt-in request profiling.
+
+RequestProfilingMiddleware measures every request: wall time, number and
+duration of database queries, cache hits and misses (counted by the
+backends in core.cache) and the tenant. Aggregates are exported as
+Prometheus histograms per URL name when prometheus_client is installed
+(it comes with django-prometheus, which serves them on /metrics), e.g.
+the p95 latency of each view:
+
+    histogram_quantile(0.95, sum by (le, view)
+        (rate(sewtrack_request_duration_seconds_bucket[5m])))
+
+Slow requests are logged as warnings (request.slow), other requests
+at debug level (request.profiled, sampled). A sample of requests
+(REQUEST_PROFILING_TRACE_RATE) also records its SQL, which is logged
+with the warning if the request turns out to be slow.
+"""
+
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from types import SimpleNamespace
+
+import structlog
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = structlog.get_logger(__name__)
+
+# Profile of the request being handled in this thread/task
+_current_profile = ContextVar('request_profile', default=None)
+
+# Prometheus metrics, created once per process (False if unavailable)
+_metrics = None
+
+DURATION_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class RequestProfile:
+    """Counters of one request; also a database execute wrapper."""
+    
+    def __init__(self, trace=False):
+        self.query_count = 0
+        self.query_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # (seconds, sql) of traced requests
+        self.queries = [] if trace else None
+    
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.query_count += 1
+            self.query_seconds += elapsed
+            if self.queries is not None and len(self.queries) < settings.REQUEST_PROFILING_TRACE_MAX_QUERIES:
+                self.queries.append((elapsed, sql))
+
+
+def record_cache_lookups(hits=0, misses=0):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+def get_metrics():
+    """Prometheus metrics of this process, or None without prometheus_client."""
+    global _metrics
+    if _metrics is None:
+        try:
+            from prometheus_client import Counter, Histogram
+        except ImportError:
+            _metrics = False
+        else:
+            _metrics = SimpleNamespace(
+                duration=Histogram(
+                    'sewtrack_request_duration_seconds', 'Request wall time',
+                    ['view', 'method'], buckets=DURATION_BUCKETS,
+                ),
+                queries=Histogram(
+                    'sewtrack_request_queries', 'Database queries per request',
+                    ['view'], buckets=QUERY_COUNT_BUCKETS,
+                ),
+                query_duration=Histogram(
+                    'sewtrack_request_query_duration_seconds', 'Database time per request',
+                    ['view'], buckets=DURATION_BUCKETS,
+                ),
+                cache_lookups=Counter(
+                    'sewtrack_request_cache_lookups', 'Cache lookups by result',
+                    ['view', 'result'],
+                ),
+                slow=Counter(
+                    'sewtrack_slow_requests', 'Requests slower than REQUEST_PROFILING_SLOW_SECONDS',
+                    ['view'],
+                ),
+            )
+    return _metrics or None
+
+
+class RequestProfilingMiddleware:
+    """
+    Measure requests, see the module docstring.
+    
+    Enabled with REQUEST_PROFILING_ENABLED; place it near the top of
+    MIDDLEWARE so the other middleware is measured too.
+    """
+    
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.metrics = get_metrics()
+    
+    def __call__(self, request):
+        profile = RequestProfile(trace=random.random() < settings.REQUEST_PROFILING_TRACE_RATE)
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        
+        self.record(request, response, profile, time.perf_counter() - start)
+        return response
+    
+    def record(self, request, response, profile, elapsed):
+        match = request.resolver_match
+        view = match.view_name if match else '<unresolved>'
+        slow = elapsed >= settings.REQUEST_PROFILING_SLOW_SECONDS
+        
+        if self.metrics:
+            self.metrics.duration.labels(view, request.method).observe(elapsed)
+            self.metrics.queries.labels(view).observe(profile.query_count)
+            self.metrics.query_duration.labels(view).observe(profile.query_seconds)
+            if profile.cache_hits:
+                self.metrics.cache_lookups.labels(view, 'hit').inc(profile.cache_hits)
+            if profile.cache_misses:
+                self.metrics.cache_lookups.labels(view, 'miss').inc(profile.cache_misses)
+            if slow:
+                self.metrics.slow.labels(view).inc()
+        
+        log = logger.warning if slow else logger.debug
+        log(
+            'request.slow' if slow else 'request.profiled',
+            method=request.method,
+            path=request.path,
+            view=view,
+            status=response.status_code,
+            duration=round(elapsed, 4),
+            queries=profile.query_count,
+            query_time=round(profile.query_seconds, 4),
+            cache_hits=profile.cache_hits,
+            cache_misses=profile.cache_misses,
+        )
+        if slow and profile.queries:
+            logger.warning(
+                'request.query_trace',
+                path=request.path,
+                queries=[{'ms': round(seconds * 1000, 2), 'sql': sql} for seconds, sql in profile.queries],
+            )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Benchmark the streaming Excel export engine.
+
+Writes a detailed-report-shaped workbook (9 columns, styled rows) with
+synthetic data and reports wall time, peak RSS and output size for each row
+count. Every size runs in a fresh child process so peak RSS is not inflated
+by previous runs.
+
+Usage:
+    python scripts/benchmark_excel_export.py
+    python scripts/benchmark_excel_export.py --rows 10000 100000 1000000
+    python scripts/benchmark_excel_export.py --rows 10000 100000 --legacy
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADERS = ['#', 'Sana', 'Xodim', 'Mahsulot', 'Operatsiya', 'Miqdor', 'Narx', 'Jami', 'Status']
+COLUMN_WIDTHS = [5, 12, 25, 20, 20, 10, 12, 15, 15]
+STATUSES = ['Kutilmoqda', 'Tasdiqlangan', 'Rad etilgan', 'Bajarilgan']
+
+
+def synthetic_rows(count):
+    """Yield detailed-report rows without touching the database."""
+    start = date(2025, 1, 1)
+    for idx in range(1, count + 1):
+        quantity = 10 + idx % 90
+        price = Decimal(500 + (idx % 7) * 250)
+        yield [
+            idx,
+            (start + timedelta(days=idx % 365)).strftime('%d.%m.%Y'),
+            f'Xodim {idx % 500:03d}',
+            f'Mahsulot {idx % 40:02d}',
+            f'Operatsiya {idx % 25:02d}',
+            quantity,
+            price,
+            price * quantity,
+            STATUSES[idx % 4],
+        ]
+
+
+def run_streaming(count, output):
+    from apps.admin_panel.excel import StreamingReportWriter
+
+    writer = StreamingReportWriter('Batafsil davriy hisobot', COLUMN_WIDTHS)
+    writer.add_title('Benchmark - Batafsil davriy hisobot')
+    writer.add_blank_row()
+    writer.add_header(HEADERS)
+    writer.add_rows(synthetic_rows(count), number_columns={6, 7, 8})
+    writer.save(output)
+
+
+def run_legacy(count, output):
+    """Previous approach: in-memory workbook with per-cell styling."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Side
+
+    wb = Workbook()
+    ws = wb.active
+    border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                    top=Side(style='thin'), bottom=Side(style='thin'))
+    ws.append(HEADERS)
+    for row_num, row in enumerate(synthetic_rows(count), 2):
+        ws.append(row)
+        for col in range(1, 10):
+            cell = ws.cell(row=row_num, column=col)
+            cell.border = border
+            if col in [6, 7, 8]:
+                cell.alignment = Alignment(horizontal='right')
+    wb.save(output)
+
+
+def measure(engine, count):
+    """Run one benchmark in the current (child) process."""
+    runner = run_streaming if engine == 'streaming' else run_legacy
+    with tempfile.TemporaryFile() as output:
+        started = time.perf_counter()
+        runner(count, output)
+        elapsed = time.perf_counter() - started
+        size = output.tell()
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+    return elapsed, max_rss / 1024, size / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy', action='store_true', help='Also run the old in-memory workbook for comparison')
+    args = parser.parse_args()
+
+    engines = ['streaming', 'legacy'] if args.legacy else ['streaming']
+
+    print(f"{'engine':<10} {'rows':>10} {'time (s)':>10} {'peak RSS (MB)':>14} {'file (MB)':>10}")
+    print('-' * 58)
+    for engine in engines:
+        for count in args.rows:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, rss, size = pool.submit(measure, engine, count).result()
+            print(f'{engine:<10} {count:>10,} {elapsed:>10.2f} {rss:>14.1f} {size:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+// Offline work record queue (IndexedDB).
+// Shared by the entry form and the service worker (work_records/sw.js).
+// Every entry gets a client-generated UUID, so sending it again is safe:
+// the sync endpoint reports already-synced entries as "exists".
+const RECORD_QUEUE_DB = 'sewtrack-record-queue';
+const RECORD_QUEUE_SYNC_TAG = 'work-record-sync';
+const RECORD_QUEUE_SYNC_URL = '{% url "tasks:work_record_sync" %}';
+const RECORD_QUEUE_BATCH_SIZE = 100;
+
+function openRecordQueue() {
+    return new Promise((resolve, reject) => {
+        const request = indexedDB.open(RECORD_QUEUE_DB, 1);
+        request.onupgradeneeded = () => {
+            request.result.createObjectStore('items', {keyPath: 'id'});
+            request.result.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+async function recordQueueTransaction(storeName, mode, action) {
+    const db = await openRecordQueue();
+    return new Promise((resolve, reject) => {
+        const tx = db.transaction(storeName, mode);
+        const result = action(tx.objectStore(storeName));
+        tx.oncomplete = () => resolve(result && 'result' in result ? result.result : undefined);
+        tx.onerror = () => reject(tx.error);
+    });
+}
+
+function newRecordId() {
+    if (self.crypto && crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    // Fallback for insecure (plain http) origins
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    bytes[6] = (bytes[6] & 0x0f) | 0x40;
+    bytes[8] = (bytes[8] & 0x3f) | 0x80;
+    const hex = Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+    return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+function enqueueRecord(item) {
+    return recordQueueTransaction('items', 'readwrite', store => store.put(item));
+}
+
+function queuedRecords() {
+    return recordQueueTransaction('items', 'readonly', store => store.getAll());
+}
+
+function removeQueuedRecord(id) {
+    return recordQueueTransaction('items', 'readwrite', store => store.delete(id));
+}
+
+function setRecordQueueToken(token) {
+    return recordQueueTransaction('meta', 'readwrite', store => store.put(token, 'csrf'));
+}
+
+function recordQueueToken() {
+    return recordQueueTransaction('meta', 'readonly', store => store.get('csrf'));
+}
+
+// Send pending entries in batches. Synced entries are removed; entries
+// the server rejects stay in the queue marked as failed (with errors).
+// Throws when the server cannot be reached, so callers can retry later.
+async function flushRecordQueue() {
+    const pending = (await queuedRecords()).filter(item => !item.failed);
+    const summary = {synced: 0, failed: 0};
+
+    for (let start = 0; start < pending.length; start += RECORD_QUEUE_BATCH_SIZE) {
+        const batch = pending.slice(start, start + RECORD_QUEUE_BATCH_SIZE);
+        const response = await fetch(RECORD_QUEUE_SYNC_URL, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': await recordQueueToken() || '',
+            },
+            body: JSON.stringify({items: batch}),
+        });
+        if (!response.ok) {
+            throw new Error(`Sync failed: ${response.status}`);
+        }
+
+        const data = await response.json();
+        const byId = new Map(batch.map(item => [item.id, item]));
+        for (const result of data.results) {
+            const item = byId.get(result.id);
+            if (!item) {
+                continue;
+            }
+            if (result.status === 'error') {
+                await enqueueRecord({...item, failed: true, errors: result.errors});
+                summary.failed += 1;
+            } else {
+                await removeQueuedRecord(item.id);
+                summary.synced += 1;
+            }
+        }
+    }
+    return summary;
+}
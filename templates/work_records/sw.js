@@ -0,0 +1,64 @@
+// SEW-TRACK service worker for the work record pages.
+// Keeps the entry form usable offline (network first, cache fallback)
+// and syncs queued entries when the connection comes back.
+// Only the entry pages and static assets are cached; the login page
+// deletes the cache, so a signed-out user's pages are not kept.
+{% load static %}{% include 'work_records/_record_queue.js' %}
+
+const ENTRY_CACHE = 'sewtrack-entry-v2';
+const ENTRY_PAGES = ['{% url "tasks:work_record_create" %}'];
+const STATIC_PREFIX = '{% get_static_prefix %}';
+const LIBRARY_DESTINATIONS = ['script', 'style', 'font'];
+
+function isCacheable(request) {
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) {
+        return LIBRARY_DESTINATIONS.includes(request.destination);
+    }
+    return ENTRY_PAGES.includes(url.pathname) || url.pathname.startsWith(STATIC_PREFIX);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(ENTRY_CACHE)
+            .then(cache => cache.addAll(ENTRY_PAGES))
+            .catch(() => null)
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key !== ENTRY_CACHE).map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || !isCacheable(request)) {
+        return;
+    }
+
+    // Network first; keep a copy of the form and its libraries
+    event.respondWith(
+        fetch(request)
+            .then(response => {
+                if ((response.ok && !response.redirected) || response.type === 'opaque') {
+                    const copy = response.clone();
+                    caches.open(ENTRY_CACHE).then(cache => cache.put(request, copy));
+                }
+                return response;
+            })
+            .catch(() => caches.match(request))
+    );
+});
+
+self.addEventListener('sync', event => {
+    if (event.tag === RECORD_QUEUE_SYNC_TAG) {
+        event.waitUntil(flushRecordQueue());
+    }
+});
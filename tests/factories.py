@@ -0,0 +1,94 @@
+"""
+factory-boy factories for SEW-TRACK models.
+
+WorkRecordFactory derives product, task and prices from its product_task,
+so building a record only needs a ProductTask and an Employee of the
+same tenant.
+"""
+
+import random
+from datetime import date
+from decimal import Decimal
+
+import factory
+from django.contrib.auth import get_user_model
+
+from apps.employees.models import Employee
+from apps.products.models import Product, ProductTask
+from apps.tasks.models import Task, WorkRecord
+from apps.tenants.models import Tenant
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+        django_get_or_create = ('username',)
+    
+    username = factory.Sequence(lambda n: f'user{n}')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    password = factory.django.Password('password')
+    role = get_user_model().Role.WORKER
+
+
+class TenantFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Tenant
+    
+    name = factory.Sequence(lambda n: f'Sex {n}')
+    owner = factory.SubFactory(UserFactory, role=get_user_model().Role.TENANT_ADMIN)
+
+
+class EmployeeFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Employee
+    
+    tenant = factory.SubFactory(TenantFactory)
+    user = factory.SubFactory(UserFactory)
+    full_name = factory.Faker('name')
+    phone = factory.Sequence(lambda n: f'+99890{n:07d}')
+    hired_at = factory.LazyFunction(date.today)
+
+
+class ProductFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Product
+    
+    tenant = factory.SubFactory(TenantFactory)
+    article_code = factory.Sequence(lambda n: f'ART-{n:05d}')
+    name = factory.Faker('word')
+
+
+class TaskFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Task
+    
+    tenant = factory.SubFactory(TenantFactory)
+    code = factory.Sequence(lambda n: f'TASK-{n:05d}')
+    name_uz = factory.Faker('sentence', nb_words=3)
+    name_ru = factory.Faker('sentence', nb_words=3)
+    sequence_order = factory.Sequence(lambda n: n)
+
+
+class ProductTaskFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = ProductTask
+    
+    product = factory.SubFactory(ProductFactory)
+    task = factory.SubFactory(TaskFactory, tenant=factory.SelfAttribute('..product.tenant'))
+    base_price = factory.LazyFunction(lambda: Decimal(random.randrange(100, 5000, 50)))
+
+
+class WorkRecordFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = WorkRecord
+    
+    product_task = factory.SubFactory(ProductTaskFactory)
+    tenant = factory.SelfAttribute('product_task.product.tenant')
+    employee = factory.SubFactory(EmployeeFactory, tenant=factory.SelfAttribute('..tenant'))
+    product = factory.SelfAttribute('product_task.product')
+    task = factory.SelfAttribute('product_task.task')
+    quantity = factory.LazyFunction(lambda: random.randint(1, 50))
+    price_per_unit = factory.SelfAttribute('product_task.base_price')
+    total_payment = factory.LazyAttribute(lambda record: record.quantity * record.price_per_unit)
+    work_date = factory.LazyFunction(date.today)
+    status = WorkRecord.Status.PENDING
@@ -0,0 +1,168 @@
+"""
+Fixtures for the performance regression suite.
+
+A realistic tenant is seeded once per session inside a transaction that
+is rolled back at the end, so the suite also runs against a reused
+PostgreSQL test database. Each test runs in its own savepoint.
+
+Seed size and time budgets can be tuned with environment variables:
+PERF_EMPLOYEES, PERF_PRODUCTS, PERF_TASKS_PER_PRODUCT, PERF_WORK_RECORDS,
+PERF_DAYS and PERF_TIME_SCALE (multiplies every time budget, e.g. 2 on a
+slow CI runner).
+"""
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.employees.models import Employee
+from apps.tasks.earnings import rebuild_earnings
+from apps.tasks.models import WorkRecord
+from apps.tasks.rollups import rebuild_rollups
+from tests.factories import (
+    EmployeeFactory,
+    ProductFactory,
+    ProductTaskFactory,
+    TaskFactory,
+    TenantFactory,
+    UserFactory,
+    WorkRecordFactory,
+)
+
+PERF_EMPLOYEES = int(os.environ.get('PERF_EMPLOYEES', 300))
+PERF_PRODUCTS = int(os.environ.get('PERF_PRODUCTS', 40))
+PERF_TASKS_PER_PRODUCT = int(os.environ.get('PERF_TASKS_PER_PRODUCT', 8))
+PERF_WORK_RECORDS = int(os.environ.get('PERF_WORK_RECORDS', 20000))
+PERF_DAYS = int(os.environ.get('PERF_DAYS', 90))
+PERF_TIME_SCALE = float(os.environ.get('PERF_TIME_SCALE', 1))
+
+SEED_BATCH_SIZE = 1000
+
+# Status mix of seeded records, roughly what a working tenant has
+STATUS_WEIGHTS = {
+    WorkRecord.Status.PENDING: 3,
+    WorkRecord.Status.APPROVED: 5,
+    WorkRecord.Status.COMPLETED: 1,
+    WorkRecord.Status.REJECTED: 1,
+}
+
+
+def seed_tenant():
+    """Create a tenant with staff, a product catalog and work history."""
+    rng = random.Random(42)
+    User = get_user_model()
+    today = date.today()
+    
+    owner = UserFactory(username='perf-owner', role=User.Role.TENANT_ADMIN)
+    tenant = TenantFactory(name='Perf Sex', owner=owner)
+    master = EmployeeFactory(
+        tenant=tenant,
+        user=UserFactory(username='perf-master', role=User.Role.MASTER),
+        position=Employee.Position.MASTER,
+    )
+    workers = EmployeeFactory.create_batch(PERF_EMPLOYEES, tenant=tenant)
+    
+    tasks = TaskFactory.create_batch(PERF_TASKS_PER_PRODUCT * 2, tenant=tenant)
+    products = ProductFactory.create_batch(PERF_PRODUCTS, tenant=tenant)
+    product_tasks = [
+        ProductTaskFactory(product=product, task=task)
+        for product in products
+        for task in rng.sample(tasks, PERF_TASKS_PER_PRODUCT)
+    ]
+    
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    records = []
+    for _ in range(PERF_WORK_RECORDS):
+        days_ago = rng.randrange(PERF_DAYS)
+        status = rng.choices(statuses, weights)[0]
+        records.append(WorkRecordFactory.build(
+            tenant=tenant,
+            employee=rng.choice(workers),
+            product_task=rng.choice(product_tasks),
+            work_date=today - timedelta(days=days_ago),
+            status=status,
+            # Older approved work is usually paid out already
+            is_paid=status == WorkRecord.Status.APPROVED and days_ago > 30,
+        ))
+    WorkRecord.objects.bulk_create(records, batch_size=SEED_BATCH_SIZE)
+    rebuild_rollups(tenant)
+    rebuild_earnings(tenant)
+    
+    return SimpleNamespace(
+        tenant=tenant,
+        owner=owner,
+        master=master,
+        worker=workers[0],
+        products=products,
+        tasks=tasks,
+        product_tasks=product_tasks,
+        today=today,
+    )
+
+
+@pytest.fixture(scope='session')
+def perf_data(django_db_setup, django_db_blocker):
+    """The seeded tenant, shared by every test of the session."""
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        data = seed_tenant()
+    
+    yield data
+    
+    with django_db_blocker.unblock():
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Measure cold caches: budgets must hold on the first request."""
+    cache.clear()
+
+
+@pytest.fixture
+def owner_client(client, perf_data):
+    client.force_login(perf_data.owner)
+    return client
+
+
+@pytest.fixture
+def master_client(client, perf_data):
+    client.force_login(perf_data.master.user)
+    return client
+
+
+@pytest.fixture
+def worker_client(client, perf_data):
+    client.force_login(perf_data.worker.user)
+    return client
+
+
+@pytest.fixture
+def assert_budget(django_assert_max_num_queries):
+    """
+    Context manager asserting a block stays within a query and time budget.
+    
+    Query budgets must not depend on the amount of data: a budget that
+    has to grow with the seed size is an N+1 query.
+    """
+    @contextmanager
+    def check(max_queries, max_seconds):
+        start = time.perf_counter()
+        with django_assert_max_num_queries(max_queries):
+            yield
+        elapsed = time.perf_counter() - start
+        limit = max_seconds * PERF_TIME_SCALE
+        assert elapsed <= limit, f'Took {elapsed:.3f}s, budget is {limit:.3f}s'
+    
+    return check
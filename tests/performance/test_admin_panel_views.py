@@ -0,0 +1,95 @@
+"""
+Query and time budgets for the admin panel views.
+"""
+
+import pytest
+from django.urls import reverse
+
+from apps.admin_panel.exports import request_report_export
+from apps.admin_panel.models import ReportExport
+from apps.tasks.models import WorkRecord
+from core.pagination import keyset_paginate
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('url_name, params, max_queries, max_seconds', [
+    pytest.param('admin_panel:dashboard', {}, 14, 1, id='dashboard'),
+    pytest.param('admin_panel:tenant_list', {}, 10, 0.5, id='tenant-list'),
+    pytest.param('admin_panel:employee_list', {}, 13, 1, id='employee-list'),
+    pytest.param('admin_panel:employee_create', {}, 8, 0.5, id='employee-create'),
+    pytest.param('admin_panel:product_list', {}, 11, 0.5, id='product-list'),
+    pytest.param('admin_panel:product_create', {}, 8, 0.5, id='product-create'),
+    pytest.param('admin_panel:task_list', {}, 11, 0.5, id='task-list'),
+    pytest.param('admin_panel:task_create', {}, 8, 0.5, id='task-create'),
+    pytest.param('admin_panel:reports', {}, 11, 1, id='reports'),
+    pytest.param('admin_panel:report_exports', {}, 9, 0.5, id='report-exports'),
+    pytest.param('admin_panel:work_records_list', {}, 11, 1, id='work-records'),
+    pytest.param('admin_panel:work_records_list', {'paid': 'all'}, 11, 1, id='work-records-all'),
+])
+def test_admin_view_budget(owner_client, assert_budget, url_name, params, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = owner_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('url_name, max_queries', [
+    pytest.param('admin_panel:dashboard', 9, id='dashboard'),
+    pytest.param('admin_panel:reports', 6, id='reports'),
+])
+def test_admin_dashboard_refresh_budget(owner_client, assert_budget, url_name, max_queries):
+    """A refresh is served from the cached tenant snapshot."""
+    owner_client.get(reverse(url_name))
+    
+    with assert_budget(max_queries, 0.5):
+        response = owner_client.get(reverse(url_name))
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('url_name, target, max_queries, max_seconds', [
+    pytest.param('admin_panel:tenant_edit', lambda data: data.tenant.id, 10, 0.5, id='tenant-edit'),
+    pytest.param('admin_panel:employee_edit', lambda data: data.worker.id, 10, 0.5, id='employee-edit'),
+    pytest.param('admin_panel:product_edit', lambda data: data.products[0].id, 9, 0.5, id='product-edit'),
+    pytest.param('admin_panel:task_edit', lambda data: data.tasks[0].id, 9, 0.5, id='task-edit'),
+    pytest.param('admin_panel:product_tasks', lambda data: data.products[0].id, 12, 0.5, id='product-tasks'),
+])
+def test_admin_detail_budget(owner_client, perf_data, assert_budget, url_name, target, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = owner_client.get(reverse(url_name, args=[target(perf_data)]))
+    assert response.status_code == 200
+
+
+def test_work_records_next_page_budget(owner_client, perf_data, assert_budget):
+    records = WorkRecord.objects.filter(tenant=perf_data.tenant, is_paid=False)
+    cursor = keyset_paginate(records).next_cursor
+    
+    with assert_budget(9, 0.5):
+        response = owner_client.get(
+            reverse('admin_panel:work_records_list'),
+            {'cursor': cursor, 'fragment': 'rows'},
+            HTTP_HX_REQUEST='true',
+        )
+    assert response.status_code == 200
+
+
+def test_export_request_budget(owner_client, perf_data, assert_budget):
+    """Requesting an export only computes its watermark and queues it."""
+    start_date = perf_data.today.replace(day=1)
+    
+    with assert_budget(12, 0.5):
+        response = owner_client.get(reverse('admin_panel:export_detailed_date_range'), {
+            'start_date': start_date.isoformat(),
+            'end_date': perf_data.today.isoformat(),
+        })
+    assert response.status_code == 302
+
+
+def test_export_status_budget(owner_client, perf_data, assert_budget):
+    export = request_report_export(
+        perf_data.tenant, perf_data.owner, ReportExport.ReportType.DAILY,
+        {'date': perf_data.today.isoformat()},
+    )
+    
+    with assert_budget(9, 0.5):
+        response = owner_client.get(reverse('admin_panel:report_export_status', args=[export.id]))
+    assert response.status_code == 200
@@ -0,0 +1,43 @@
+"""
+Query and time budgets for the dashboard views.
+"""
+
+import pytest
+from django.urls import reverse
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('url_name, params, max_queries, max_seconds', [
+    pytest.param('dashboard:dashboard', {}, 6, 0.5, id='dashboard'),
+    pytest.param('statistics', {}, 6, 0.5, id='statistics'),
+    pytest.param('profile', {}, 5, 0.5, id='profile'),
+])
+def test_worker_dashboard_budget(worker_client, assert_budget, url_name, params, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = worker_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('url_name, params, max_queries, max_seconds', [
+    pytest.param('dashboard:recent-tasks', {}, 8, 0.5, id='recent-tasks'),
+    pytest.param('dashboard:tv', {}, 11, 1, id='tv'),
+    pytest.param('dashboard:tv-kpi-stats', {}, 10, 0.5, id='tv-kpi-stats'),
+    pytest.param('dashboard:tv-top-performers', {}, 10, 0.5, id='tv-top-performers'),
+    pytest.param('dashboard:tv-production-series', {}, 9, 0.5, id='tv-production-series'),
+    pytest.param('dashboard:tv-production-series', {'metric': 'payment'}, 9, 0.5, id='tv-production-series-payment'),
+])
+def test_tv_dashboard_budget(owner_client, assert_budget, url_name, params, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = owner_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+
+def test_tv_kpi_stats_revalidation_budget(owner_client, assert_budget):
+    """Unchanged TV data is answered from the shared snapshot with a 304."""
+    url = reverse('dashboard:tv-kpi-stats')
+    etag = owner_client.get(url)['ETag']
+    
+    with assert_budget(5, 0.2):
+        response = owner_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
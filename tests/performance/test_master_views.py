@@ -0,0 +1,91 @@
+"""
+Query and time budgets for the master panel views.
+"""
+
+import pytest
+from django.urls import reverse
+
+from apps.tasks.models import WorkRecord
+from core.pagination import keyset_paginate
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+def _pending_ids(data, count):
+    records = WorkRecord.objects.filter(tenant=data.tenant, status=WorkRecord.Status.PENDING, is_paid=False)
+    return [str(record_id) for record_id in records.values_list('id', flat=True)[:count]]
+
+
+@pytest.mark.parametrize('url_name, params, max_queries, max_seconds', [
+    pytest.param('master:dashboard', {}, 8, 1, id='dashboard'),
+    # The approval list renders every pending record (no pagination)
+    pytest.param('master:pending_approvals', {}, 9, 10, id='pending-approvals'),
+    pytest.param('master:pending_approvals', {'date': 'today'}, 9, 1, id='pending-approvals-today'),
+    pytest.param('master:work_records_list', {}, 8, 1, id='work-records'),
+    pytest.param('master:work_records_list', {'paid': 'all', 'status': 'approved'}, 8, 1, id='work-records-filtered'),
+    pytest.param('master:mark_paid_by_date', {}, 7, 0.5, id='mark-paid-by-date'),
+])
+def test_master_view_budget(master_client, assert_budget, url_name, params, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = master_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+
+def test_work_records_next_page_budget(master_client, perf_data, assert_budget):
+    records = WorkRecord.objects.filter(tenant=perf_data.tenant, is_paid=False)
+    cursor = keyset_paginate(records).next_cursor
+    
+    with assert_budget(6, 0.5):
+        response = master_client.get(
+            reverse('master:work_records_list'),
+            {'cursor': cursor, 'fragment': 'rows'},
+            HTTP_HX_REQUEST='true',
+        )
+    assert response.status_code == 200
+
+
+def test_record_detail_budget(master_client, perf_data, assert_budget):
+    record_id = _pending_ids(perf_data, 1)[0]
+    
+    with assert_budget(8, 0.5):
+        response = master_client.get(reverse('master:record_detail', args=[record_id]))
+    assert response.status_code == 200
+
+
+def test_approve_record_budget(master_client, perf_data, assert_budget):
+    record_id = _pending_ids(perf_data, 1)[0]
+    
+    with assert_budget(16, 0.5):
+        response = master_client.post(reverse('master:approve_record', args=[record_id]))
+    assert response.status_code == 302
+    assert WorkRecord.objects.get(id=record_id).status == WorkRecord.Status.APPROVED
+
+
+@pytest.mark.parametrize('url_name, status', [
+    pytest.param('master:bulk_approve', WorkRecord.Status.APPROVED, id='approve'),
+    pytest.param('master:bulk_reject', WorkRecord.Status.REJECTED, id='reject'),
+])
+def test_bulk_action_budget(master_client, perf_data, assert_budget, url_name, status):
+    """Bulk actions must not issue queries per record."""
+    record_ids = _pending_ids(perf_data, 200)
+    
+    # Includes one UPDATE, INSERT and DELETE each for the rollup rows and
+    # one locking SELECT and UPDATE for the earnings ledgers
+    with assert_budget(21, 1):
+        response = master_client.post(reverse(url_name), {'record_ids': record_ids, 'reason': 'perf'})
+    assert response.status_code == 302
+    assert WorkRecord.objects.filter(id__in=record_ids, status=status).count() == len(record_ids)
+
+
+def test_mark_paid_by_date_budget(master_client, perf_data, assert_budget):
+    cutoff = perf_data.today.replace(day=1)
+    
+    with assert_budget(30, 5):
+        response = master_client.post(reverse('master:mark_paid_by_date'), {
+            'cutoff_date': cutoff.isoformat(),
+            'employee': str(perf_data.worker.id),
+        })
+    assert response.status_code == 302
+    assert not WorkRecord.objects.filter(
+        employee=perf_data.worker, work_date__lt=cutoff, is_paid=False
+    ).exists()
@@ -0,0 +1,53 @@
+"""
+Query and time budgets for the Excel reports in apps.admin_panel.reports.
+
+Reports stream rows in chunks, so their query count must not grow with
+the number of records (only with the number of chunks).
+"""
+
+import io
+from datetime import timedelta
+
+import pytest
+
+from apps.admin_panel import reports
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+def _month_start(data):
+    return data.today.replace(day=1)
+
+
+@pytest.mark.parametrize('build, args, max_queries, max_seconds', [
+    pytest.param(
+        reports.build_daily_report,
+        lambda data: (data.tenant, data.today),
+        4, 1, id='daily',
+    ),
+    pytest.param(
+        reports.build_employee_report,
+        lambda data: (data.worker, data.today - timedelta(days=89), data.today),
+        4, 1, id='employee',
+    ),
+    pytest.param(
+        reports.build_monthly_summary,
+        lambda data: (data.tenant, data.today.year, data.today.month),
+        4, 2, id='monthly',
+    ),
+    pytest.param(
+        reports.build_date_range_summary,
+        lambda data: (data.tenant, data.today - timedelta(days=89), data.today),
+        4, 2, id='date-range',
+    ),
+    pytest.param(
+        reports.build_detailed_date_range,
+        lambda data: (data.tenant, _month_start(data), data.today),
+        6, 5, id='detailed-date-range',
+    ),
+])
+def test_report_budget(perf_data, assert_budget, build, args, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        writer, filename = build(*args(perf_data))
+        writer.save(io.BytesIO())
+    assert filename.endswith('.xlsx')
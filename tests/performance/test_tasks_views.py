@@ -0,0 +1,128 @@
+"""
+Query and time budgets for the worker work record views and API.
+"""
+
+import json
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.tasks.models import WorkRecord
+from core.pagination import keyset_paginate
+
+pytestmark = [pytest.mark.slow, pytest.mark.django_db]
+
+
+def _entry_lines(data, count):
+    product_tasks = data.product_tasks
+    return [
+        {
+            'product': str(product_tasks[index % len(product_tasks)].product_id),
+            'task': str(product_tasks[index % len(product_tasks)].task_id),
+            'quantity': index % 20 + 1,
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def api_client(perf_data):
+    client = APIClient()
+    token = RefreshToken.for_user(perf_data.master.user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.parametrize('url_name, params, max_queries, max_seconds', [
+    pytest.param('tasks:work_records_list', {}, 7, 0.5, id='work-records'),
+    pytest.param('tasks:work_records_list', {'date': 'month', 'paid': 'all'}, 7, 0.5, id='work-records-month'),
+    pytest.param('tasks:work_record_create', {}, 7, 0.5, id='create'),
+    pytest.param('tasks:work_record_batch_create', {}, 6, 0.5, id='batch-create'),
+    pytest.param('tasks:work_record_prices', {}, 6, 0.5, id='prices'),
+])
+def test_worker_view_budget(worker_client, assert_budget, url_name, params, max_queries, max_seconds):
+    with assert_budget(max_queries, max_seconds):
+        response = worker_client.get(reverse(url_name), params)
+    assert response.status_code == 200
+
+
+def test_work_records_next_page_budget(worker_client, perf_data, assert_budget):
+    records = WorkRecord.objects.filter(employee=perf_data.worker, is_paid=False)
+    cursor = keyset_paginate(records, page_size=5).next_cursor
+    
+    with assert_budget(6, 0.5):
+        response = worker_client.get(
+            reverse('tasks:work_records_list'),
+            {'cursor': cursor, 'fragment': 'cards'},
+            HTTP_HX_REQUEST='true',
+        )
+    assert response.status_code == 200
+
+
+def test_record_detail_budget(worker_client, perf_data, assert_budget):
+    record = WorkRecord.objects.filter(employee=perf_data.worker).first()
+    
+    with assert_budget(7, 0.5):
+        response = worker_client.get(reverse('tasks:work_record_detail', args=[record.id]))
+    assert response.status_code == 200
+
+
+def test_price_lookups_use_catalog(worker_client, perf_data, assert_budget):
+    """After the first request, task lists and prices need no catalog queries."""
+    product_task = perf_data.product_tasks[0]
+    tasks_url = reverse('tasks:get_product_tasks', args=[product_task.product_id])
+    price_params = {'product': product_task.product_id, 'task': product_task.task_id, 'quantity': 3}
+    worker_client.get(tasks_url, HTTP_ACCEPT='application/json')
+    
+    with assert_budget(4, 0.2):
+        response = worker_client.get(tasks_url, HTTP_ACCEPT='application/json')
+    assert response.status_code == 200
+    
+    with assert_budget(4, 0.2):
+        response = worker_client.get(reverse('tasks:calculate_price'), price_params)
+    assert response.json()['total_raw'] == float(product_task.base_price * 3)
+
+
+def test_batch_create_budget(worker_client, perf_data, assert_budget):
+    """A batch costs the same number of queries whatever its size."""
+    lines = _entry_lines(perf_data, 200)
+    
+    with assert_budget(22, 1):
+        response = worker_client.post(reverse('tasks:work_record_batch_create'), {
+            'product': [line['product'] for line in lines],
+            'task': [line['task'] for line in lines],
+            'quantity': [line['quantity'] for line in lines],
+            'notes': [''] * len(lines),
+        })
+    assert response.status_code == 302
+
+
+def test_sync_budget(worker_client, perf_data, assert_budget):
+    items = [dict(line, id=str(uuid.uuid4())) for line in _entry_lines(perf_data, 200)]
+    
+    with assert_budget(23, 1):
+        response = worker_client.post(
+            reverse('tasks:work_record_sync'), json.dumps({'items': items}), content_type='application/json'
+        )
+    assert {result['status'] for result in response.json()['results']} == {'created'}
+
+
+def test_api_list_budget(api_client, assert_budget):
+    with assert_budget(6, 0.5):
+        response = api_client.get('/api/v1/tasks/records/')
+    assert response.status_code == 200
+    
+    with assert_budget(6, 0.5):
+        response = api_client.get(response.data['next'])
+    assert response.status_code == 200
+
+
+def test_api_employee_statistics_budget(api_client, perf_data, assert_budget):
+    """Statistics are read from the earnings ledger, whatever the history."""
+    with assert_budget(5, 0.5):
+        response = api_client.get(f'/api/v1/employees/{perf_data.worker.id}/statistics/')
+    assert response.status_code == 200
+    assert response.data['total_work_records'] > 0
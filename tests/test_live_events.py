@@ -0,0 +1,74 @@
+"""
+Recovery of TV dashboard event streams from a broken broker subscription.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import redis
+from django.test import AsyncRequestFactory
+
+from apps.dashboard import views
+from apps.dashboard.events import SUBSCRIPTION_LOST, RedisBroker
+
+
+class BrokenPubSub:
+    """Redis pub/sub whose connection drops right after subscribing."""
+    
+    async def subscribe(self, channel):
+        pass
+    
+    async def listen(self):
+        raise redis.ConnectionError('Connection closed by server.')
+        yield
+    
+    async def aclose(self):
+        raise redis.ConnectionError('Connection closed by server.')
+
+
+class BrokenRedis:
+
+    def pubsub(self, **kwargs):
+        return BrokenPubSub()
+    
+    async def aclose(self):
+        pass
+
+
+class LostSubscriptionBroker:
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        queue = asyncio.Queue()
+        queue.put_nowait(SUBSCRIPTION_LOST)
+        yield queue
+
+
+@pytest.mark.asyncio
+async def test_redis_subscription_reports_lost_connection(monkeypatch):
+    monkeypatch.setattr('redis.asyncio.Redis.from_url', lambda url: BrokenRedis())
+    broker = RedisBroker('redis://localhost:6379/2')
+    
+    async with broker.subscribe('tv:1') as queue:
+        message = await asyncio.wait_for(queue.get(), timeout=1)
+    
+    assert message is SUBSCRIPTION_LOST
+
+
+@pytest.mark.asyncio
+async def test_tv_events_stream_ends_when_subscription_is_lost(monkeypatch):
+    monkeypatch.setattr(views, 'get_broker', LostSubscriptionBroker)
+    monkeypatch.setattr(views, 'get_tv_snapshot', lambda tenant: {'stats': {}, 'performers': []})
+    request = AsyncRequestFactory().get('/dashboard/tv/events/')
+    request.tenant = None
+    
+    response = await views.tv_events(request)
+    chunks = await asyncio.wait_for(_read(response), timeout=5)
+    
+    assert chunks[0].startswith(b'retry:')
+    assert [chunk.split(b'\n', 1)[0] for chunk in chunks[1:]] == [b'event: kpi', b'event: performers']
+
+
+async def _read(response):
+    return [chunk async for chunk in response.streaming_content]
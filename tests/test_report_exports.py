@@ -0,0 +1,50 @@
+"""
+Reuse rules of background report exports.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.admin_panel.exports import compute_watermark, request_report_export
+from apps.admin_panel.models import ReportExport
+from tests.factories import WorkRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def record():
+    return WorkRecordFactory()
+
+
+@pytest.mark.parametrize('relation, name_field', [
+    ('employee', 'full_name'),
+    ('product', 'name'),
+    ('task', 'name_uz'),
+])
+def test_watermark_changes_when_printed_names_change(record, relation, name_field):
+    parameters = {'date': date.today().isoformat()}
+    before = compute_watermark(record.tenant, ReportExport.ReportType.DAILY, parameters)
+    
+    renamed = getattr(record, relation)
+    setattr(renamed, name_field, 'Yangi nom')
+    renamed.save()
+    
+    assert compute_watermark(record.tenant, ReportExport.ReportType.DAILY, parameters) != before
+
+
+def test_stopped_export_is_failed_and_replaced(record):
+    parameters = {'date': date.today().isoformat()}
+    request = (record.tenant, record.tenant.owner, ReportExport.ReportType.DAILY, parameters)
+    export = request_report_export(*request)
+    assert request_report_export(*request) == export
+    
+    ReportExport.objects.filter(id=export.id).update(updated_at=timezone.now() - timedelta(hours=1))
+    replacement = request_report_export(*request)
+    
+    export.refresh_from_db()
+    assert export.status == ReportExport.Status.FAILED
+    assert replacement != export
+    assert replacement.status == ReportExport.Status.PENDING
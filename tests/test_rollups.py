@@ -0,0 +1,168 @@
+"""
+The incrementally maintained rollups and earnings ledgers must always
+equal a rebuild from the work records, whatever path changed them.
+
+A ledger's current_month may differ from a rebuilt one (it stays on a
+month whose earnings went back to zero), so months are compared through
+employee_statistics() rather than those two columns.
+"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from apps.employees.models import Employee
+from apps.tasks.earnings import employee_statistics, rebuild_earnings
+from apps.tasks.entry import create_work_record_batch, sync_work_records
+from apps.tasks.models import DailyProductionRollup, EmployeeEarnings, WorkRecord
+from apps.tasks.payroll import close_payout_batch, start_payout_batch
+from apps.tasks.rollups import rebuild_rollups
+from tests.factories import EmployeeFactory, ProductTaskFactory, WorkRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+ROLLUP_VALUES = (
+    'work_date', 'employee_id', 'product_id', 'task_id', 'status', 'is_paid',
+    'record_count', 'total_quantity', 'total_payment',
+)
+LEDGER_VALUES = ('employee_id', 'record_count', 'total_earnings', 'unpaid_balance', 'working_days')
+
+
+def rollup_state(tenant):
+    today = date.today()
+    statistics = {
+        (employee.id, day): employee_statistics(employee, today=day)
+        for employee in Employee.objects.filter(tenant=tenant)
+        for day in (today, today - timedelta(days=35), today - timedelta(days=70))
+    }
+    return (
+        sorted(DailyProductionRollup.objects.filter(tenant=tenant).values_list(*ROLLUP_VALUES)),
+        sorted(EmployeeEarnings.objects.filter(tenant=tenant).values_list(*LEDGER_VALUES)),
+        statistics,
+    )
+
+
+def assert_matches_rebuild(tenant):
+    maintained = rollup_state(tenant)
+    rebuild_rollups(tenant=tenant)
+    rebuild_earnings(tenant=tenant)
+    assert maintained == rollup_state(tenant)
+
+
+@pytest.fixture
+def world():
+    """A tenant with two workers, a master and records over two months."""
+    today = date.today()
+    product_task = ProductTaskFactory()
+    tenant = product_task.product.tenant
+    workers = EmployeeFactory.create_batch(2, tenant=tenant)
+    master = EmployeeFactory(tenant=tenant, position=Employee.Position.MASTER)
+    records = [
+        WorkRecordFactory(product_task=product_task, employee=workers[index % 2], status=status,
+                          work_date=today - timedelta(days=days))
+        for index, (days, status) in enumerate([
+            (0, WorkRecord.Status.PENDING),
+            (0, WorkRecord.Status.PENDING),
+            (0, WorkRecord.Status.APPROVED),
+            (1, WorkRecord.Status.PENDING),
+            (1, WorkRecord.Status.COMPLETED),
+            (35, WorkRecord.Status.APPROVED),
+            (35, WorkRecord.Status.PENDING),
+        ])
+    ]
+    return SimpleNamespace(
+        today=today, tenant=tenant, product_task=product_task,
+        workers=workers, master=master, records=records,
+    )
+
+
+def _line(world, **values):
+    return {
+        'product': str(world.product_task.product_id),
+        'task': str(world.product_task.task_id),
+        'quantity': 4,
+        **values,
+    }
+
+
+def edit_quantity(world):
+    record = world.records[2]
+    record.quantity += 10
+    record.total_payment = record.quantity * record.price_per_unit
+    record.save()
+
+
+def move_work_date(world):
+    record = world.records[4]
+    record.work_date = world.today - timedelta(days=40)
+    record.save()
+
+
+def change_status(world):
+    world.records[0].approve(world.master)
+    world.records[5].reset_to_pending('xato')
+
+
+def mark_paid(world):
+    world.records[2].mark_as_paid(world.master)
+    world.records[5].mark_as_paid(world.master)
+    world.records[5].unmark_as_paid()
+
+
+def delete(world):
+    world.records[2].delete()
+    world.records[6].delete()
+
+
+def bulk_approve(world):
+    WorkRecord.objects.bulk_approve([record.id for record in world.records], world.master)
+
+
+def bulk_reject(world):
+    WorkRecord.objects.bulk_reject([record.id for record in world.records[:4]], 'sifatsiz')
+
+
+def batch_entry(world):
+    result = create_work_record_batch(world.tenant, [
+        _line(world),
+        _line(world, employee=str(world.workers[1].id), work_date=(world.today - timedelta(days=35)).isoformat()),
+    ], employee=world.master, any_employee=True)
+    assert result['errors'] == []
+
+
+def offline_sync(world):
+    items = [_line(world, id=str(uuid4())), _line(world, id=str(uuid4()), quantity=9)]
+    results = sync_work_records(world.tenant, items + items[:1], employee=world.workers[0])
+    assert [result['status'] for result in results] == ['created', 'created', 'exists']
+
+
+def payroll_close(world):
+    batch = start_payout_batch(world.tenant, world.master, world.today - timedelta(days=1))
+    close_payout_batch(batch, chunk_size=2)
+
+
+OPERATIONS = [
+    edit_quantity, move_work_date, change_status, mark_paid, delete,
+    bulk_approve, bulk_reject, batch_entry, offline_sync, payroll_close,
+]
+
+
+def test_seeded_records_match_rebuild(world):
+    assert_matches_rebuild(world.tenant)
+
+
+@pytest.mark.parametrize('operation', OPERATIONS, ids=lambda operation: operation.__name__)
+def test_operation_keeps_rollups_equal_to_rebuild(world, operation):
+    operation(world)
+    assert_matches_rebuild(world.tenant)
+
+
+def test_all_operations_in_sequence_keep_rollups_equal_to_rebuild(world):
+    for operation in OPERATIONS:
+        operation(world)
+        for record in world.records:
+            if WorkRecord.objects.filter(id=record.id).exists():
+                record.refresh_from_db()
+    assert_matches_rebuild(world.tenant)
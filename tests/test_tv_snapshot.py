@@ -0,0 +1,29 @@
+"""
+Single-flight computation of cached TV dashboard snapshots.
+"""
+
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+
+from apps.dashboard import snapshots
+from tests.factories import TenantFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_waiter_that_gives_up_keeps_the_computing_process_lock(monkeypatch):
+    tenant = TenantFactory()
+    lock_key = f'{snapshots.snapshot_cache_key(tenant.id, date.today())}:lock'
+    cache.add(lock_key, 1, timeout=snapshots.SNAPSHOT_LOCK_TIMEOUT)
+    monkeypatch.setattr(snapshots, 'SNAPSHOT_WAIT_STEPS', 1)
+    monkeypatch.setattr(snapshots, 'SNAPSHOT_WAIT_STEP', 0)
+    
+    try:
+        snapshot = snapshots.get_tv_snapshot(tenant)
+        
+        assert 'etag' in snapshot
+        assert cache.get(lock_key) == 1
+    finally:
+        cache.delete(lock_key)
@@ -0,0 +1,106 @@
+"""
+Idempotency and per-item validation of offline work record sync.
+"""
+
+import json
+from uuid import uuid4
+
+import pytest
+from django.test import RequestFactory
+
+from apps.tasks.entry import sync_work_records
+from apps.tasks.models import WorkRecord
+from apps.tasks.views import work_record_sync
+from tests.factories import EmployeeFactory, ProductTaskFactory, WorkRecordFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product_task():
+    return ProductTaskFactory()
+
+
+@pytest.fixture
+def worker(product_task):
+    return EmployeeFactory(tenant=product_task.product.tenant)
+
+
+def _item(product_task, **values):
+    return {
+        'id': str(uuid4()),
+        'product': str(product_task.product_id),
+        'task': str(product_task.task_id),
+        'quantity': 5,
+        **values,
+    }
+
+
+def test_same_id_synced_twice_is_created_once(product_task, worker):
+    item = _item(product_task)
+    
+    first = sync_work_records(worker.tenant, [item], employee=worker)
+    second = sync_work_records(worker.tenant, [item], employee=worker)
+    
+    assert [result['status'] for result in first + second] == ['created', 'exists']
+    assert WorkRecord.objects.filter(id=item['id']).count() == 1
+
+
+def test_repeated_id_is_not_reported_as_synced_when_first_copy_fails(product_task, worker):
+    failed = _item(ProductTaskFactory())
+    created = _item(product_task)
+    retried = {**failed, 'product': str(product_task.product_id), 'task': str(product_task.task_id)}
+    items = [failed, retried, created, created]
+    
+    results = sync_work_records(worker.tenant, items, employee=worker)
+    
+    assert [result['status'] for result in results] == ['error', 'error', 'created', 'exists']
+    assert results[1]['errors'] == {'id': 'Bu ID so\'rovda takrorlangan'}
+    assert not WorkRecord.objects.filter(id=failed['id']).exists()
+
+
+def test_id_of_another_tenants_record_is_rejected(product_task, worker):
+    foreign = WorkRecordFactory()
+    item = _item(product_task, id=str(foreign.id))
+    
+    [result] = sync_work_records(worker.tenant, [item], employee=worker)
+    
+    assert result['status'] == 'error'
+    assert result['errors'] == {'id': 'Bu ID boshqa yozuvga tegishli'}
+    assert list(WorkRecord.objects.filter(id=foreign.id).values_list('tenant_id', 'employee_id')) == [
+        (foreign.tenant_id, foreign.employee_id),
+    ]
+
+
+def test_invalid_items_do_not_block_valid_ones(product_task, worker):
+    other_product_task = ProductTaskFactory()
+    items = [
+        _item(product_task, quantity=0),
+        _item(product_task, id='not-a-uuid'),
+        _item(other_product_task),
+        _item(product_task),
+    ]
+    
+    results = sync_work_records(worker.tenant, items, employee=worker)
+    
+    assert [result['status'] for result in results] == ['error', 'error', 'error', 'created']
+    assert set(results[0]['errors']) == {'quantity'}
+    assert set(results[1]['errors']) == {'id'}
+    assert set(results[2]['errors']) == {'task'}
+    created = WorkRecord.objects.filter(tenant=worker.tenant).values_list('id', flat=True)
+    assert [str(record_id) for record_id in created] == [items[3]['id']]
+
+
+def test_sync_view_without_tenant_is_rejected(product_task, worker):
+    record = WorkRecordFactory(product_task=product_task, employee=worker)
+    item = _item(product_task, id=str(record.id))
+    request = RequestFactory().post(
+        '/tasks/work-records/sync/', json.dumps({'items': [item]}), content_type='application/json',
+    )
+    request.user = worker.user
+    request.tenant = None
+    request._dont_enforce_csrf_checks = True
+    
+    response = work_record_sync(request)
+    
+    assert response.status_code == 400